@@ -1,9 +1,40 @@
-from typing import Dict, Tuple
+import asyncio
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+# Pseudo context key for the message passed from agent to agent
+MESSAGE = "message"
 
 
 class Agent:
-    """Abstract agent interface for all agents."""
+    """Abstract agent interface for all agents.
+
+    ``reads`` and ``writes`` optionally declare which context keys the agent
+    uses; :data:`MESSAGE` in ``writes`` means the returned message replaces
+    the current one.  ``Workflow`` runs agents with non-conflicting
+    declarations concurrently.  Agents leaving them as ``None`` run on their
+    own, strictly after every agent before them.
+    """
+
+    reads: Optional[FrozenSet[str]] = None
+    writes: Optional[FrozenSet[str]] = None
 
     def act(self, message: str, context: Dict) -> Tuple[str, Dict]:
         """Process a message and update the shared context."""
         raise NotImplementedError("Agents must implement the act method")
+
+    async def act_async(self, message: str, context: Dict) -> Tuple[str, Dict]:
+        """Async variant of :meth:`act`.
+
+        The default runs :meth:`act` in a worker thread so synchronous agents
+        work unchanged; agents doing network I/O override it.
+        """
+        return await asyncio.to_thread(self.act, message, context)
+
+    def act_batch(self, messages: List[str], contexts: List[Dict]) -> Tuple[List[str], List[Dict]]:
+        """Process several messages at once, each with its own context.
+
+        Used by ``run_many``.  The default calls :meth:`act` for each message;
+        agents with a vectorised implementation override it.
+        """
+        results = [self.act(message, context) for message, context in zip(messages, contexts)]
+        return [message for message, _ in results], [context for _, context in results]
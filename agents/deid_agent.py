@@ -1,9 +1,12 @@
-from .base import Agent
+from .base import MESSAGE, Agent
 
 
 class DeidAgent(Agent):
     """Agent that deidentifies PHI from the message."""
 
+    reads = frozenset({MESSAGE})
+    writes = frozenset({MESSAGE, "deidentified"})
+
     def act(self, message: str, context: dict) -> tuple[str, dict]:
         # Import lazily to avoid heavy startup cost
         from storage.deidentifier import deidentify_text
@@ -11,3 +14,12 @@ class DeidAgent(Agent):
         cleaned = deidentify_text(message)
         context["deidentified"] = cleaned
         return cleaned, context
+
+    def act_batch(self, messages: list[str], contexts: list[dict]) -> tuple[list[str], list[dict]]:
+        """De-identify all messages in one ``nlp.pipe`` pass."""
+        from storage.deidentifier import deidentify_texts
+
+        cleaned = list(deidentify_texts(messages))
+        for text, context in zip(cleaned, contexts):
+            context["deidentified"] = text
+        return cleaned, contexts
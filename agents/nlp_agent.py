@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-from sklearn.feature_extraction.text import TfidfVectorizer
-from gensim.models import Word2Vec
-import numpy as np
-
-from .base import Agent
+from .base import MESSAGE, Agent
 
 
 class NLPAgent(Agent):
     """Agent that extracts simple NLP features from the message."""
 
+    reads = frozenset({MESSAGE})
+    writes = frozenset({MESSAGE, "keywords"})
+
     def __init__(self, corpus: list[str] | None = None):
+        # Import lazily so discovering agents does not load scikit-learn and gensim
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from gensim.models import Word2Vec
+
         # Small default corpus for vectorizer and Word2Vec
         self.corpus = corpus or [
             "Simplilearn offers courses in AI and is also located in the US",
@@ -24,8 +27,22 @@ class NLPAgent(Agent):
         self.w2v = Word2Vec(sentences=tokenized, vector_size=50, window=5, min_count=1, sg=0)
 
     def act(self, message: str, context: dict) -> tuple[str, dict]:
-        # Compute top keywords with TF-IDF
         tfidf = self.vectorizer.transform([message]).toarray()[0]
+        return self._respond(message, tfidf, context), context
+
+    def act_batch(self, messages: list[str], contexts: list[dict]) -> tuple[list[str], list[dict]]:
+        """Vectorise all messages with one TF-IDF transform."""
+        matrix = self.vectorizer.transform(messages)
+        responses = [
+            self._respond(message, matrix.getrow(i).toarray()[0], context)
+            for i, (message, context) in enumerate(zip(messages, contexts))
+        ]
+        return responses, contexts
+
+    def _respond(self, message: str, tfidf, context: dict) -> str:
+        import numpy as np
+
+        # Compute top keywords with TF-IDF
         feats = self.vectorizer.get_feature_names_out()
         if tfidf.size:
             top_idx = np.argsort(tfidf)[::-1][:3]
@@ -41,5 +58,4 @@ class NLPAgent(Agent):
             preview = np.array2string(vec[:5], precision=3, separator=", ")
         else:
             preview = "no known words"
-        response = f"Keywords: {', '.join(keywords)} | w2v[:5]: {preview}"
-        return response, context
+        return f"Keywords: {', '.join(keywords)} | w2v[:5]: {preview}"
@@ -1,25 +1,50 @@
-from chat_engine.chat_engine import ChatEngine
-from chat_engine.modules.retriever import default_retriever
-from chat_engine.modules.prompt_assembler import default_prompt_assembler
-from embedding.embedder import embed_text
-from language_model.language_model import generate_answer
-
-from .base import Agent
+from .base import MESSAGE, Agent
 
 
 class RAGAgent(Agent):
-    """Agent that answers questions using the RAG ChatEngine."""
+    """Agent that answers questions using the RAG ChatEngine.
+
+    The conversation is kept in a :class:`ChatSession` stored under
+    ``context["chat_session"]``, so concurrent runs sharing one agent keep
+    separate histories.
+    """
+
+    reads = frozenset({MESSAGE, "chat_session"})
+    writes = frozenset({MESSAGE, "messages", "chat_session"})
 
     def __init__(self):
+        # Import lazily so discovering agents does not load the embedder and vector store
+        from chat_engine.chat_engine import ChatEngine
+        from chat_engine.modules.retriever import get_retriever
+        from chat_engine.modules.prompt_assembler import default_prompt_assembler
+        from embedding.embedder import embed_text
+        from language_model.language_model import agenerate_answer, generate_answer
+
         self.engine = ChatEngine(
-            retriever=default_retriever,
+            retriever=get_retriever(),
             embedder=embed_text,
             llm=generate_answer,
+            llm_async=agenerate_answer,
             prompt_assembler=default_prompt_assembler,
         )
 
+    @staticmethod
+    def _session(context: dict):
+        session = context.get("chat_session")
+        if session is None:
+            from chat_engine.modules.session import ChatSession
+
+            session = context["chat_session"] = ChatSession()
+        return session
+
     def act(self, message: str, context: dict) -> tuple[str, dict]:
         """Answer a question and append the response to context messages."""
-        response = self.engine.answer_query(message)
+        response = self.engine.answer_query(message, session=self._session(context))
+        context.setdefault("messages", []).append({"role": "assistant", "content": response})
+        return response, context
+
+    async def act_async(self, message: str, context: dict) -> tuple[str, dict]:
+        """Async variant of :meth:`act` awaiting the language model."""
+        response = await self.engine.answer_query_async(message, session=self._session(context))
         context.setdefault("messages", []).append({"role": "assistant", "content": response})
         return response, context
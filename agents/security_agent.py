@@ -1,14 +1,37 @@
 from __future__ import annotations
 
-from .base import Agent
+from .base import MESSAGE, Agent
 from cybersecurity import encryption, integrity, monitor
 
 
 class SecurityAgent(Agent):
     """Agent that validates message integrity and service health."""
 
+    reads = frozenset({MESSAGE, "hash"})
+    writes = frozenset({MESSAGE, "decrypted", "hash_valid", "services_checked", "encrypted"})
+
     def act(self, message: str, context: dict) -> tuple[str, dict]:
         """Decrypt the message, verify its hash and re-encrypt the result."""
+        plaintext = self._open(message, context)
+
+        # Confirm services are healthy
+        monitor.check_services()
+        context["services_checked"] = True
+
+        return self._seal(plaintext, context), context
+
+    async def act_async(self, message: str, context: dict) -> tuple[str, dict]:
+        """Async variant of :meth:`act` running the service checks without blocking."""
+        plaintext = self._open(message, context)
+
+        await monitor.check_services_async()
+        context["services_checked"] = True
+
+        return self._seal(plaintext, context), context
+
+    @staticmethod
+    def _open(message: str, context: dict) -> str:
+        """Decrypt ``message`` if possible and verify its hash when provided."""
         # Attempt to decrypt the incoming message
         try:
             plaintext = encryption.decrypt_data(message)
@@ -21,17 +44,15 @@ class SecurityAgent(Agent):
         expected = context.get("hash")
         if expected is not None:
             context["hash_valid"] = integrity.verify_hash(plaintext.encode(), expected)
+        return plaintext
 
-        # Confirm services are healthy
-        monitor.check_services()
-        context["services_checked"] = True
-
-        # Re-encrypt outgoing message
+    @staticmethod
+    def _seal(plaintext: str, context: dict) -> str:
+        """Re-encrypt the outgoing message."""
         try:
             encrypted = encryption.encrypt_data(plaintext)
             context["encrypted"] = True
         except Exception:
             encrypted = plaintext
             context["encrypted"] = False
-
-        return encrypted, context
+        return encrypted
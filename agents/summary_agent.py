@@ -1,9 +1,12 @@
-from .base import Agent
+from .base import MESSAGE, Agent
 
 
 class SummaryAgent(Agent):
     """Agent that returns a short summary of the message."""
 
+    reads = frozenset({MESSAGE})
+    writes = frozenset({MESSAGE, "summary"})
+
     def act(self, message: str, context: dict) -> tuple[str, dict]:
         summary = message[:100]
         context["summary"] = summary
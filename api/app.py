@@ -1,19 +1,25 @@
+import json
 import os
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from utils.single_flight import SingleFlight
 from utils.text_to_speech import text_to_speech_base64
 
 from chat_engine.chat_engine import ChatEngine
 from chat_engine.modules.prompt_assembler import default_prompt_assembler
-from chat_engine.modules.retriever import default_retriever
+from chat_engine.modules.retriever import get_retriever
+from chat_engine.modules.session import ChatSession
+from chat_engine.modules.session_store import default_session_store
 from embedding.embedder import embed_text
-from language_model.language_model import generate_answer
+from language_model.language_model import generate_answer, generate_answer_stream, set_corpus_version
 from vector_store.base import init_collection
+from vector_store.bm25 import corpus_version, load_default_lexical_index
 
 import strawberry
 from strawberry.fastapi import GraphQLRouter
@@ -25,12 +31,19 @@ if not API_TOKEN:
     raise RuntimeError("API_TOKEN environment variable must be set")
 
 engine = ChatEngine(
-    retriever=default_retriever,
+    retriever=get_retriever(),
     embedder=embed_text,
     llm=generate_answer,
+    llm_stream=generate_answer_stream,
     prompt_assembler=default_prompt_assembler,
 )
 
+# Conversation history per session ID, evicted by LRU and idle time
+sessions = default_session_store()
+
+# Identical answers arriving together are converted to speech once
+tts_flight = SingleFlight("tts")
+
 app = FastAPI(title="RAG_HEITAA API", version="1.0")
 
 app.add_middleware(
@@ -44,8 +57,16 @@ app.add_middleware(
 
 @app.on_event("startup")
 def _startup() -> None:
-    """Ensure the Qdrant collection exists before handling requests."""
+    """Ensure the Qdrant collection exists and load the persisted BM25 index."""
     init_collection()
+    load_default_lexical_index()
+    set_corpus_version(corpus_version)
+
+
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    """Spill live sessions to the session backend, if one is configured."""
+    sessions.flush()
 
 
 def authenticate(creds: HTTPAuthorizationCredentials = Depends(security)):
@@ -55,14 +76,39 @@ def authenticate(creds: HTTPAuthorizationCredentials = Depends(security)):
 
 class ChatRequest(BaseModel):
     question: str
+    # Omit to start a new conversation; the response returns its ID
+    session_id: str | None = None
 
 
 @app.post("/v1/chat", dependencies=[Depends(authenticate)])
 async def chat_endpoint(req: ChatRequest):
     """Answer the user's question and return audio in a thread pool."""
-    answer = await run_in_threadpool(engine.answer_query, req.question)
-    audio = await run_in_threadpool(text_to_speech_base64, answer)
-    return {"answer": answer, "audio": audio}
+    session = await run_in_threadpool(sessions.get, req.session_id)
+    answer = await run_in_threadpool(engine.answer_query, req.question, session)
+    audio = await run_in_threadpool(tts_flight.do, answer, text_to_speech_base64, answer)
+    return {"answer": answer, "audio": audio, "session_id": session.session_id}
+
+
+def _sse_events(question: str, session):
+    """Format answer chunks as Server-Sent Events, ending with a ``done`` event."""
+    chunks = []
+    for chunk in engine.answer_query_stream(question, session):
+        chunks.append(chunk)
+        yield f"data: {json.dumps({'token': chunk})}\n\n"
+    done = {"answer": "".join(chunks).strip(), "session_id": session.session_id}
+    yield f"event: done\ndata: {json.dumps(done)}\n\n"
+
+
+@app.post("/v1/chat/stream", dependencies=[Depends(authenticate)])
+async def chat_stream_endpoint(req: ChatRequest):
+    """Stream the answer token by token as Server-Sent Events (no audio)."""
+    session = await run_in_threadpool(sessions.get, req.session_id)
+    # Starlette iterates the synchronous generator in its thread pool
+    return StreamingResponse(
+        _sse_events(req.question, session),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 
@@ -71,8 +117,11 @@ async def chat_endpoint(req: ChatRequest):
 @strawberry.type
 class Query:
     @strawberry.field
-    def chat(self, info, question: str) -> str:
-        return engine.answer_query(question)
+    def chat(self, info, question: str, session_id: str | None = None) -> str:
+        # The reply carries no session ID, so without one the session is
+        # throwaway and must not take up a slot in the store
+        session = sessions.get(session_id) if session_id is not None else ChatSession()
+        return engine.answer_query(question, session)
 
 schema = strawberry.Schema(query=Query)
 graphql_app = GraphQLRouter(schema)
@@ -2,9 +2,10 @@ from celery import Celery
 import os
 from uuid import uuid4
 
-from embedding.embedder import embed_text
+from embedding.embedder import embed_texts
 from parsers.text_parser import parse_txt_folder
-from vector_store.base import index_document, init_collection
+from vector_store.base import index_documents, init_collection
+from vector_store.bm25 import index_texts
 from utils.event_bus import event_bus
 from utils.metrics import DOCUMENTS_INGESTED
 from storage.audit_log import log_audit_event
@@ -17,15 +18,14 @@ def ingest_folder(folder_path: str):
     """Parse text files and index them asynchronously."""
     init_collection()
     docs = parse_txt_folder(folder_path)
+    ids = [str(uuid4()) for _ in docs]
+    payloads = [{"text": doc["text"], "source": doc["source"]} for doc in docs]
+    vectors = embed_texts([doc["text"] for doc in docs])
+    index_documents(zip(ids, vectors, payloads))
+    index_texts(zip(ids, (doc["text"] for doc in docs), payloads))
+    if DOCUMENTS_INGESTED:
+        DOCUMENTS_INGESTED.inc(len(docs))
     for doc in docs:
-        vector = embed_text(doc["text"])
-        index_document(
-            doc_id=str(uuid4()),
-            vector=vector,
-            payload={"text": doc["text"], "source": doc["source"]},
-        )
-        if DOCUMENTS_INGESTED:
-            DOCUMENTS_INGESTED.inc()
         log_audit_event("document_ingested", {"source": doc["source"]})
         event_bus.emit("document_ingested", source=doc["source"])
     return len(docs)
@@ -7,11 +7,29 @@ we now load the default components lazily when no custom implementations are
 provided.
 """
 
+from __future__ import annotations
+
+import asyncio
+import os
+
 from chat_engine.modules.session import ChatSession
 from utils.event_bus import event_bus
-from utils.metrics import AGENT_RUNS
+from utils.metrics import AGENT_RUNS, PROMPT_TOKENS
+from utils.single_flight import SingleFlight
 from storage.audit_log import log_audit_event
 
+NO_CONTEXT_ANSWER = "\u26a0\ufe0f I'm unable to locate relevant information."
+# Seconds a duplicate question waits for the in-flight answer before computing its own
+CHAT_COALESCE_TIMEOUT = float(os.getenv("CHAT_COALESCE_TIMEOUT", "30"))
+
+
+def _coalesce_key(user_query: str) -> str:
+    return " ".join(user_query.lower().split())
+
+
+def _history_key(history: list) -> tuple:
+    return tuple((m["role"], m["content"]) for m in history)
+
 
 class ChatEngine:
     def __init__(
@@ -20,12 +38,31 @@ class ChatEngine:
         embedder=None,
         llm=None,
         prompt_assembler=None,
+        llm_stream=None,
+        coalesce: bool = True,
+        llm_async=None,
     ):
         """Create a new ``ChatEngine`` instance.
 
         Parameters are optional.  When omitted we lazily import lightweight
         defaults, avoiding heavy dependencies when the engine is used in unit
-        tests or simple scripts.
+        tests or simple scripts.  ``llm_stream`` yields answer chunks for
+        :meth:`answer_query_stream`; with a custom ``llm`` and no
+        ``llm_stream`` the full answer is streamed as a single chunk.
+        ``llm_async`` is awaited by :meth:`answer_query_async`; without it the
+        blocking ``llm`` runs in a worker thread.
+
+        With ``coalesce`` enabled, concurrent calls to :meth:`answer_query`
+        with the same question (ignoring case and whitespace) share work at
+        two levels.  Within one session the duplicates share the whole call
+        and only the first one is recorded in the history.  Across sessions
+        whose recent history is identical (for example new users asking the
+        same question) retrieval and the language model call are shared,
+        while every session still records its own question and answer.
+
+        Every ``answer_query*`` method takes an optional ``session``; without
+        one the engine's own :attr:`session` is used.  Give each concurrent
+        user their own :class:`ChatSession` to keep histories apart.
         """
 
         if retriever is None:
@@ -37,9 +74,15 @@ class ChatEngine:
 
             embedder = embed_text
         if llm is None:
-            from language_model.language_model import generate_answer
+            from language_model.language_model import (
+                agenerate_answer,
+                generate_answer,
+                generate_answer_stream,
+            )
 
             llm = generate_answer
+            llm_stream = llm_stream or generate_answer_stream
+            llm_async = llm_async or agenerate_answer
         if prompt_assembler is None:
             from .modules.prompt_assembler import default_prompt_assembler
 
@@ -48,39 +91,151 @@ class ChatEngine:
         self.retriever = retriever
         self.embedder = embedder
         self.llm = llm
+        self.llm_stream = llm_stream
+        self.llm_async = llm_async
         self.prompt_assembler = prompt_assembler
         self.session = ChatSession()
+        self.single_flight = SingleFlight("chat", timeout=CHAT_COALESCE_TIMEOUT) if coalesce else None
 
-    def answer_query(self, user_query: str) -> str:
-        self.session.add_user_message(user_query)
+    @staticmethod
+    def _record_question(user_query: str, session: ChatSession) -> list:
+        """Record the question and return the history that preceded it.
+
+        The history is read first, so the prompt (and the response cache key)
+        only carries the question once.
+        """
+        history = session.get_recent_history()
+        session.add_user_message(user_query)
         event_bus.emit("chat_message_received", message=user_query)
+        return history
+
+    def _build_prompt(self, user_query: str, session: ChatSession):
+        """Record the question, retrieve context and assemble the prompt.
+
+        Returns ``None`` when nothing relevant was retrieved.
+        """
+        return self._assemble_prompt(user_query, self._record_question(user_query, session))
+
+    def _assemble_prompt(self, user_query: str, history: list):
+        """Retrieve context for ``user_query`` and assemble the prompt, or return ``None``."""
         # Step 1: Embed user query
         query_vec = self.embedder(user_query)
 
-        # Step 2: Retrieve top documents
-        results = self.retriever(query_vec, top_k=3)
-        history = self.session.get_recent_history()
+        # Step 2: Retrieve top documents (hybrid retrievers also want the raw text)
+        if getattr(self.retriever, "uses_query_text", False):
+            results = self.retriever(query_vec, top_k=3, query_text=user_query)
+        else:
+            results = self.retriever(query_vec, top_k=3)
 
         if not results:
-            warning = "\u26a0\ufe0f I'm unable to locate relevant information."
-            self.session.add_assistant_message(warning)
-            log_audit_event("chat", {"question": user_query, "answer": warning})
-            event_bus.emit("chat_response_generated", response=warning)
-            return warning
+            return None
 
         # Step 3: Assemble context from retrieved documents
         context_snippets = []
         for res in results:
             if res.payload and "text" in res.payload:
                 context_snippets.append(res.payload["text"])
-        context_text = "\n\n".join(context_snippets)
 
-        # Step 4: Build final prompt and generate answer
-        prompt = self.prompt_assembler(user_query, context_text, history)
+        # Step 4: Build final prompt (budget-aware assemblers trim ranked snippets)
+        if getattr(self.prompt_assembler, "accepts_snippets", False):
+            return self.prompt_assembler(user_query, context_snippets, history)
+        return self.prompt_assembler(user_query, "\n\n".join(context_snippets), history)
+
+    @staticmethod
+    def _token_usage(prompt) -> dict | None:
+        """Return the prompt's token accounting, if the assembler reported one."""
+        usage = prompt.usage() if hasattr(prompt, "usage") else None
+        if usage and PROMPT_TOKENS:
+            PROMPT_TOKENS.labels(kind="used").inc(usage["tokens_used"])
+            PROMPT_TOKENS.labels(kind="dropped").inc(usage["tokens_dropped"])
+        return usage
+
+    def _finish(self, session: ChatSession, user_query: str, response: str, details: dict | None = None) -> None:
+        """Store the answer in the session, audit it and announce it."""
+        session.add_assistant_message(response)
+        log_audit_event("chat", {"question": user_query, "answer": response, **(details or {})})
+        event_bus.emit("chat_response_generated", response=response)
+
+    def answer_query(self, user_query: str, session: ChatSession | None = None) -> str:
+        session = self.session if session is None else session
+        if self.single_flight is None:
+            return self._answer_query(user_query, session)
+        session_key = session.session_id if session.session_id is not None else id(session)
+        key = ("session", session_key, _coalesce_key(user_query))
+        return self.single_flight.do(key, self._answer_query, user_query, session)
+
+    def _answer_query(self, user_query: str, session: ChatSession) -> str:
+        history = self._record_question(user_query, session)
+        if self.single_flight is None:
+            response, details = self._generate(user_query, history)
+        else:
+            # Session-agnostic, so users with the same history share the answer
+            key = ("answer", _coalesce_key(user_query), _history_key(history))
+            response, details = self.single_flight.do(key, self._generate, user_query, history)
+        self._finish(session, user_query, response, details)
+        return response
+
+    def _generate(self, user_query: str, history: list):
+        """Return ``(answer, audit details)`` for a question asked after ``history``."""
+        prompt = self._assemble_prompt(user_query, history)
+        if prompt is None:
+            return NO_CONTEXT_ANSWER, None
+
+        usage = self._token_usage(prompt)
         response = self.llm(prompt)
-        self.session.add_assistant_message(response)
         if AGENT_RUNS:
             AGENT_RUNS.labels(agent="ChatEngine").inc()
-        log_audit_event("chat", {"question": user_query, "answer": response})
-        event_bus.emit("chat_response_generated", response=response)
+        return response, {"tokens": usage} if usage else None
+
+    async def answer_query_async(self, user_query: str, session: ChatSession | None = None) -> str:
+        """Async variant of :meth:`answer_query` (not coalesced).
+
+        Retrieval runs in a worker thread; the language model call is awaited
+        so many questions can be answered concurrently on one event loop.
+        """
+        session = self.session if session is None else session
+        prompt = await asyncio.to_thread(self._build_prompt, user_query, session)
+        if prompt is None:
+            self._finish(session, user_query, NO_CONTEXT_ANSWER)
+            return NO_CONTEXT_ANSWER
+
+        usage = self._token_usage(prompt)
+        if self.llm_async is not None:
+            response = await self.llm_async(prompt)
+        else:
+            response = await asyncio.to_thread(self.llm, prompt)
+        if AGENT_RUNS:
+            AGENT_RUNS.labels(agent="ChatEngine").inc()
+        self._finish(session, user_query, response, {"tokens": usage} if usage else None)
         return response
+
+    def answer_query_stream(self, user_query: str, session: ChatSession | None = None):
+        """Yield the answer in chunks as the language model produces them.
+
+        The session history, audit log and ``chat_response_generated`` event
+        are written once the stream ends.  If the consumer stops early, the
+        partial answer is recorded and audited as incomplete.
+        """
+        session = self.session if session is None else session
+        prompt = self._build_prompt(user_query, session)
+        if prompt is None:
+            self._finish(session, user_query, NO_CONTEXT_ANSWER)
+            yield NO_CONTEXT_ANSWER
+            return
+
+        usage = self._token_usage(prompt)
+        stream = self.llm_stream(prompt) if self.llm_stream else iter([self.llm(prompt)])
+        chunks = []
+        complete = False
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            if AGENT_RUNS:
+                AGENT_RUNS.labels(agent="ChatEngine").inc()
+            details = {"tokens": usage} if usage else {}
+            if not complete:
+                details["complete"] = False
+            self._finish(session, user_query, "".join(chunks).strip(), details)
@@ -2,16 +2,134 @@
 prompt_assembler.py - Builds LLM prompt from query and context
 """
 
-def default_prompt_assembler(user_query, context_text, history):
-    messages = [{"role": "system", "content": "You are a helpful healthcare assistant. Answer in 2-3 short sentences."}]
-    
-    # Inject chat history
-    messages += history
-    
-    # Inject retrieved knowledge
-    messages.append({"role": "system", "content": f"[KNOWLEDGE]: {context_text}"})
-    
-    # Add current user message
-    messages.append({"role": "user", "content": user_query})
-    
-    return messages
+from __future__ import annotations
+
+import logging
+
+from language_model.tokens import (
+    LLM_MAX_TOKENS,
+    LLM_MODEL,
+    MESSAGE_OVERHEAD_TOKENS,
+    count_tokens,
+    prompt_budget,
+    truncate_tokens,
+)
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_PROMPT = "You are a helpful healthcare assistant. Answer in 2-3 short sentences."
+KNOWLEDGE_PREFIX = "[KNOWLEDGE]: "
+SNIPPET_SEPARATOR = "\n\n"
+# Do not keep a trimmed snippet shorter than this many tokens
+MIN_SNIPPET_TOKENS = 32
+
+
+class Prompt(list):
+    """Chat messages plus the token accounting of the request.
+
+    Behaves exactly like the message list sent to the model; ``tokens_used``
+    and ``tokens_dropped`` report how much context was kept and cut.
+    """
+
+    def __init__(self, messages, tokens_used=0, tokens_dropped=0, snippets_dropped=0, history_dropped=0):
+        super().__init__(messages)
+        self.tokens_used = tokens_used
+        self.tokens_dropped = tokens_dropped
+        self.snippets_dropped = snippets_dropped
+        self.history_dropped = history_dropped
+
+    def usage(self) -> dict:
+        return {
+            "tokens_used": self.tokens_used,
+            "tokens_dropped": self.tokens_dropped,
+            "snippets_dropped": self.snippets_dropped,
+            "history_dropped": self.history_dropped,
+        }
+
+
+class BudgetedPromptAssembler:
+    """Assemble prompts that fit a per-model token budget.
+
+    The system prompt and question are always kept.  History (newest turns
+    first) may use up to ``history_share`` of what is left; retrieved snippets
+    fill the rest in rank order, the last one trimmed to fit and lower-ranked
+    ones dropped.  ``ChatEngine`` passes the ranked snippets as a list because
+    ``accepts_snippets`` is set; a plain string is treated as one snippet.
+    """
+
+    accepts_snippets = True
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        max_tokens: int = LLM_MAX_TOKENS,
+        budget: int | None = None,
+        history_share: float = 0.25,
+        token_counter=count_tokens,
+        truncator=truncate_tokens,
+    ):
+        self.model = model
+        self.budget = budget if budget is not None else prompt_budget(model, max_tokens)
+        self.history_share = history_share
+        self.count = token_counter
+        self.truncate = truncator
+
+    def _message_tokens(self, content: str) -> int:
+        return self.count(content) + MESSAGE_OVERHEAD_TOKENS
+
+    def __call__(self, user_query, context, history):
+        snippets = [context] if isinstance(context, str) else list(context)
+        used = self._message_tokens(SYSTEM_PROMPT) + self._message_tokens(user_query)
+        dropped = 0
+
+        # Newest history first, within its share of the remaining budget
+        history_budget = int(max(0, self.budget - used) * self.history_share)
+        kept_history = []
+        history_tokens = 0
+        for i in range(len(history) - 1, -1, -1):
+            cost = self._message_tokens(history[i]["content"])
+            if history_tokens + cost > history_budget:
+                dropped += sum(self._message_tokens(m["content"]) for m in history[: i + 1])
+                break
+            kept_history.append(history[i])
+            history_tokens += cost
+        kept_history.reverse()
+        used += history_tokens
+
+        # Snippets in rank order with whatever is left
+        remaining = self.budget - used - self._message_tokens(KNOWLEDGE_PREFIX)
+        separator = self.count(SNIPPET_SEPARATOR)
+        kept_snippets = []
+        snippets_dropped = 0
+        for rank, snippet in enumerate(snippets):
+            join_cost = separator if kept_snippets else 0
+            cost = self.count(snippet)
+            if cost + join_cost <= remaining:
+                kept_snippets.append(snippet)
+                remaining -= cost + join_cost
+                continue
+            # Trim the first snippet that does not fit, drop everything ranked below it
+            room = remaining - join_cost
+            rest = snippets[rank:]
+            if room >= MIN_SNIPPET_TOKENS:
+                trimmed = self.truncate(snippet, room)
+                kept_snippets.append(trimmed)
+                dropped += cost - self.count(trimmed)
+                rest = snippets[rank + 1:]
+            dropped += sum(self.count(s) for s in rest)
+            snippets_dropped = len(rest)
+            break
+        knowledge = KNOWLEDGE_PREFIX + SNIPPET_SEPARATOR.join(kept_snippets)
+
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        messages += kept_history
+        messages.append({"role": "system", "content": knowledge})
+        messages.append({"role": "user", "content": user_query})
+        tokens_used = sum(self._message_tokens(m["content"]) for m in messages)
+        prompt = Prompt(messages, tokens_used, dropped, snippets_dropped, len(history) - len(kept_history))
+        if dropped:
+            logger.debug("Prompt for %s trimmed to budget %d: %s", self.model, self.budget, prompt.usage())
+        return prompt
+
+
+default_prompt_assembler = BudgetedPromptAssembler()
@@ -2,9 +2,104 @@
 retriever.py - Handles document retrieval from vector DB
 """
 
-from vector_store.base import query_vector
+import os
+
+from vector_store.base import query_vector, query_vectors
+
+# Retriever used by ``get_retriever()`` when no name is given: "default" or "hybrid"
+RETRIEVER = os.getenv("RETRIEVER", "default")
 
 
 def default_retriever(vector, top_k=3, metadata_filter=None):
-    """Retrieve documents using vector search and optional metadata filtering."""
+    """Retrieve documents using vector search and optional metadata filtering.
+
+    ``metadata_filter`` is a ``{field: value}`` dict such as ``{"source": "a.txt"}``;
+    a list value matches any of its members.
+    """
     return query_vector(vector, top_k=top_k, filters=metadata_filter)
+
+
+def batch_retriever(vectors, top_k=3, metadata_filter=None):
+    """Retrieve documents for several query vectors in one batch search.
+
+    Returns one result list per vector, in the same order.
+    """
+    return query_vectors(vectors, top_k=top_k, filters=metadata_filter)
+
+
+class HybridRetriever:
+    """Fuse dense vector search with BM25 keyword search.
+
+    Both result lists are merged with reciprocal rank fusion:
+    ``score = sum(weight / (rrf_k + rank))`` over the lists a document appears
+    in.  ``ChatEngine`` passes the raw question as ``query_text`` because
+    ``uses_query_text`` is set; without it only dense results are returned.
+
+    The default BM25 index does not keep document text (the vector store has
+    it), so lexical-only hits get their payload from ``payload_lookup``
+    (default :func:`vector_store.base.get_payloads`).
+    """
+
+    uses_query_text = True
+
+    def __init__(
+        self,
+        dense_retriever=default_retriever,
+        lexical_index=None,
+        candidates: int = 20,
+        rrf_k: int = 60,
+        dense_weight: float = 1.0,
+        lexical_weight: float = 1.0,
+        payload_lookup=None,
+    ):
+        self.dense_retriever = dense_retriever
+        self.lexical_index = lexical_index
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.dense_weight = dense_weight
+        self.lexical_weight = lexical_weight
+        self.payload_lookup = payload_lookup
+
+    def __call__(self, vector, top_k=3, metadata_filter=None, query_text=None):
+        from vector_store.base import ScoredResult
+        from vector_store.bm25 import get_default_lexical_index
+
+        depth = max(top_k, self.candidates)
+        dense = self.dense_retriever(vector, top_k=depth, metadata_filter=metadata_filter)
+        if not query_text:
+            return list(dense)[:top_k]
+        index = self.lexical_index or get_default_lexical_index()
+        lexical = index.search(query_text, top_k=depth, filters=metadata_filter)
+
+        fused: dict = {}
+        for weight, results in ((self.dense_weight, dense), (self.lexical_weight, lexical)):
+            for rank, result in enumerate(results, start=1):
+                key = getattr(result, "id", None)
+                if key is None:
+                    key = (result.payload or {}).get("text")
+                score, payload = fused.get(key, (0.0, result.payload))
+                fused[key] = (score + weight / (self.rrf_k + rank), payload)
+
+        ranked = sorted(fused.items(), key=lambda item: item[1][0], reverse=True)[:top_k]
+        missing = [key for key, (_, payload) in ranked if "text" not in (payload or {})]
+        if missing:
+            if self.payload_lookup is None:
+                from vector_store.base import get_payloads as lookup
+            else:
+                lookup = self.payload_lookup
+            found = dict(zip(missing, lookup(missing)))
+            ranked = [(key, (score, found.get(key) or payload)) for key, (score, payload) in ranked]
+        return [ScoredResult(key, score, payload) for key, (score, payload) in ranked]
+
+
+hybrid_retriever = HybridRetriever()
+
+RETRIEVERS = {"default": default_retriever, "hybrid": hybrid_retriever}
+
+
+def get_retriever(name=None):
+    """Return the retriever registered under ``name`` (default: ``RETRIEVER`` env var)."""
+    name = (name or RETRIEVER).lower()
+    if name not in RETRIEVERS:
+        raise ValueError(f"Unknown retriever '{name}'. Options: {sorted(RETRIEVERS)}")
+    return RETRIEVERS[name]
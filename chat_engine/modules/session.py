@@ -1,12 +1,33 @@
+from collections import deque
+import os
+
+# Messages kept per session; older ones are discarded (only recent turns reach the prompt)
+CHAT_HISTORY_SIZE = int(os.getenv("CHAT_HISTORY_SIZE", "20"))
+
+
 class ChatSession:
-    def __init__(self):
-        self.history = []
+    """Conversation history of one user, kept in a bounded ring buffer."""
+
+    def __init__(self, session_id=None, max_messages=CHAT_HISTORY_SIZE, history=None):
+        self.session_id = session_id
+        self._history = deque(history or (), maxlen=max_messages)
+
+    @property
+    def history(self):
+        return list(self._history)
 
     def add_user_message(self, msg):
-        self.history.append({"role": "user", "content": msg})
+        self._history.append({"role": "user", "content": msg})
 
     def add_assistant_message(self, msg):
-        self.history.append({"role": "assistant", "content": msg})
+        self._history.append({"role": "assistant", "content": msg})
 
     def get_recent_history(self, max_turns=6):
         return self.history[-max_turns:]
+
+    def to_dict(self):
+        return {"session_id": self.session_id, "max_messages": self._history.maxlen, "history": self.history}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("session_id"), data.get("max_messages", CHAT_HISTORY_SIZE), data.get("history"))
@@ -0,0 +1,224 @@
+"""Per-user chat sessions with LRU/TTL eviction.
+
+:class:`SessionStore` keeps at most ``max_sessions`` :class:`ChatSession`
+objects in memory, keyed by session ID.  A session idle for ``ttl`` seconds
+expires; past ``max_sessions`` the least recently used one is evicted.  With
+a ``backend`` evicted sessions are spilled instead of lost and loaded again on
+their next request.  :class:`RedisSessionBackend` works with any client
+offering ``get``/``setex``/``delete`` (``redis.Redis`` or a local stand-in)
+and :class:`DirectorySessionBackend` writes JSON files to disk.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import os
+import threading
+import time
+import uuid
+
+from cybersecurity.integrity import generate_hash
+from utils.metrics import CHAT_SESSIONS
+from .session import ChatSession
+
+CHAT_SESSION_MAX = int(os.getenv("CHAT_SESSION_MAX", "10000"))
+# Seconds a session may stay idle before it is forgotten
+CHAT_SESSION_TTL = float(os.getenv("CHAT_SESSION_TTL", "1800"))
+# Redis URL that receives sessions evicted from memory; unset keeps them in memory only
+CHAT_SESSION_REDIS_URL = os.getenv("CHAT_SESSION_REDIS_URL")
+
+
+class RedisSessionBackend:
+    """Store sessions as JSON under ``prefix + session_id`` with a Redis TTL."""
+
+    def __init__(self, client, prefix: str = "chat_session:", ttl: float | None = CHAT_SESSION_TTL):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisSessionBackend":
+        import redis  # optional dependency
+
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def load(self, session_id: str) -> ChatSession | None:
+        data = self.client.get(self.prefix + session_id)
+        return ChatSession.from_dict(json.loads(data)) if data else None
+
+    def save(self, session: ChatSession) -> None:
+        data = json.dumps(session.to_dict(), ensure_ascii=False)
+        if self.ttl:
+            self.client.setex(self.prefix + session.session_id, int(self.ttl), data)
+        else:
+            self.client.set(self.prefix + session.session_id, data)
+
+    def delete(self, session_id: str) -> None:
+        self.client.delete(self.prefix + session_id)
+
+
+class DirectorySessionBackend:
+    """Spill sessions to JSON files in ``directory``, ignoring files older than ``ttl``."""
+
+    def __init__(self, directory: str, ttl: float | None = CHAT_SESSION_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id: str) -> str:
+        # Hash the ID so client-supplied values cannot escape the directory
+        return os.path.join(self.directory, generate_hash(session_id.encode("utf-8")) + ".json")
+
+    def load(self, session_id: str) -> ChatSession | None:
+        path = self._path(session_id)
+        try:
+            if self.ttl and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                return ChatSession.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, session: ChatSession) -> None:
+        path = self._path(session.session_id)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(session.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def delete(self, session_id: str) -> None:
+        try:
+            os.remove(self._path(session_id))
+        except OSError:
+            pass
+
+
+class _Entry:
+    __slots__ = ("session", "expires")
+
+    def __init__(self, session, expires):
+        self.session = session
+        self.expires = expires
+
+
+class SessionStore:
+    """LRU + TTL store of :class:`ChatSession` objects keyed by session ID."""
+
+    def __init__(
+        self,
+        max_sessions: int = CHAT_SESSION_MAX,
+        ttl: float | None = CHAT_SESSION_TTL,
+        backend=None,
+        clock=time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.backend = backend
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_session_id() -> str:
+        return uuid.uuid4().hex
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, session_id) -> bool:
+        with self._lock:
+            entry = self._entries.get(session_id)
+            return entry is not None and not self._expired(entry)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "sessions": len(self._entries),
+        }
+
+    def _expired(self, entry: _Entry) -> bool:
+        return entry.expires is not None and entry.expires <= self._clock()
+
+    def _deadline(self):
+        return self._clock() + self.ttl if self.ttl else None
+
+    def _purge_expired(self) -> None:
+        # Least recently used first, so expired sessions sit at the front
+        while self._entries:
+            session_id, entry = next(iter(self._entries.items()))
+            if not self._expired(entry):
+                break
+            del self._entries[session_id]
+            self.expirations += 1
+
+    def get(self, session_id: str | None = None) -> ChatSession:
+        """Return the session for ``session_id``, creating it if needed.
+
+        Without an ID a new session with a fresh ID is created.
+        """
+        if session_id is None:
+            session_id = self.new_session_id()
+        with self._lock:
+            self._purge_expired()
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                entry.expires = self._deadline()
+                self._entries.move_to_end(session_id)
+                self.hits += 1
+                return entry.session
+            self.misses += 1
+
+        session = self.backend.load(session_id) if self.backend is not None else None
+        if session is None:
+            session = ChatSession(session_id)
+
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None:  # another thread loaded it meanwhile
+                return entry.session
+            self._entries[session_id] = _Entry(session, self._deadline())
+            while len(self._entries) > self.max_sessions:
+                _, old = self._entries.popitem(last=False)
+                self.evictions += 1
+                evicted.append(old.session)
+            size = len(self._entries)
+
+        if CHAT_SESSIONS:
+            CHAT_SESSIONS.set(size)
+        if self.backend is not None:
+            for old in evicted:
+                self.backend.save(old)
+        return session
+
+    def discard(self, session_id: str) -> None:
+        """Forget a session in memory and in the backend."""
+        with self._lock:
+            self._entries.pop(session_id, None)
+        if self.backend is not None:
+            self.backend.delete(session_id)
+
+    def flush(self) -> None:
+        """Write every live session to the backend, e.g. before shutdown."""
+        if self.backend is None:
+            return
+        with self._lock:
+            self._purge_expired()
+            sessions = [entry.session for entry in self._entries.values()]
+        for session in sessions:
+            self.backend.save(session)
+
+
+def default_session_store() -> SessionStore:
+    """Session store configured from the environment."""
+    backend = RedisSessionBackend.from_url(CHAT_SESSION_REDIS_URL) if CHAT_SESSION_REDIS_URL else None
+    return SessionStore(backend=backend)
@@ -0,0 +1,165 @@
+"""Bulk execution of orchestrators over many messages.
+
+``run_many`` on :class:`~core.workflow.Workflow`,
+:class:`~core.multi_agent.MultiAgentCoordinator` and
+:class:`~core.supervisor.LLMSupervisor` returns a :class:`BatchRun`.  It
+splits the messages into chunks of ``batch_size``, hands each chunk to the
+orchestrator's ``_run_chunk`` on a thread or process pool and yields the
+results in input order as soon as they are available.  At most ``2 *
+workers`` chunks are in flight, so arbitrarily long inputs stream with
+bounded memory.  Once iteration finishes, :attr:`BatchRun.report` holds the
+items processed, seconds spent (summed over workers) and throughput of every
+agent.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+import multiprocessing
+import os
+import time
+from typing import Dict, Iterable, Iterator, List
+
+from utils.logger import log
+
+# Messages handed to a worker at once (and to each agent's act_batch)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "32"))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+
+MODES = ("thread", "process")
+
+
+def record(stats: Dict[str, list], agent: str, items: int, seconds: float) -> None:
+    """Add ``items`` processed in ``seconds`` to ``agent``'s totals in ``stats``."""
+    totals = stats.setdefault(agent, [0, 0.0])
+    totals[0] += items
+    totals[1] += seconds
+
+
+def _merge(stats: Dict[str, list], other: Dict[str, list]) -> None:
+    for agent, (items, seconds) in other.items():
+        record(stats, agent, items, seconds)
+
+
+def _chunks(messages: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(messages)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Orchestrator used by this worker process, set by the pool initializer
+_worker_target = None
+
+
+def _init_worker(target) -> None:
+    global _worker_target
+    _worker_target = target
+
+
+def _run_chunk_in_worker(chunk: List[str]):
+    return _worker_target._run_chunk(chunk)
+
+
+def _process_context():
+    # Forked workers inherit the orchestrator instead of unpickling it
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+class BatchRun:
+    """Iterable of the results of one ``run_many`` call, in input order."""
+
+    def __init__(
+        self,
+        target,
+        messages: Iterable[str],
+        workers: int = BATCH_WORKERS,
+        mode: str = "thread",
+        batch_size: int = BATCH_SIZE,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.target = target
+        self.messages = messages
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.batch_size = batch_size
+        self.report: Dict[str, dict] = {}
+        self.items = 0
+        self.seconds = 0.0
+        self._started = False
+
+    def __iter__(self) -> Iterator[str]:
+        if self._started:
+            raise RuntimeError("a BatchRun can only be iterated once")
+        self._started = True
+        stats: Dict[str, list] = {}
+        start = time.perf_counter()
+        try:
+            for results, chunk_stats in self._chunk_results():
+                _merge(stats, chunk_stats)
+                self.items += len(results)
+                yield from results
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.report = {
+                agent: {
+                    "items": items,
+                    "seconds": seconds,
+                    "items_per_second": items / seconds if seconds else float("inf"),
+                }
+                for agent, (items, seconds) in stats.items()
+            }
+            log(self.summary())
+
+    def _chunk_results(self):
+        chunks = _chunks(self.messages, self.batch_size)
+        if self.workers == 1:
+            for chunk in chunks:
+                yield self.target._run_chunk(chunk)
+            return
+
+        if self.mode == "thread":
+            pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="run-many")
+            submit = lambda chunk: pool.submit(self.target._run_chunk, chunk)  # noqa: E731
+        else:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=_process_context(),
+                initializer=_init_worker,
+                initargs=(self.target,),
+            )
+            submit = lambda chunk: pool.submit(_run_chunk_in_worker, chunk)  # noqa: E731
+
+        with pool:
+            pending = deque()
+            try:
+                for chunk in chunks:
+                    pending.append(submit(chunk))
+                    if len(pending) >= 2 * self.workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def summary(self) -> str:
+        """One-line throughput report for the log."""
+        rate = self.items / self.seconds if self.seconds else 0.0
+        parts = [
+            f"{agent} {stats['items']} in {stats['seconds']:.2f}s ({stats['items_per_second']:.1f}/s)"
+            for agent, stats in self.report.items()
+        ]
+        return (
+            f"run_many processed {self.items} messages in {self.seconds:.2f}s ({rate:.1f}/s)"
+            + (": " + "; ".join(parts) if parts else "")
+        )
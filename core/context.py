@@ -0,0 +1,92 @@
+"""Per-run agent contexts sharing read-only state copy-on-write.
+
+Orchestrators used to keep one ``context`` dict that every run mutated,
+which made an instance unsafe to share between threads and let the context
+grow forever.  Each run now gets its own :class:`RunContext` layered over a
+shared, read-only ``base``.  Reading a key falls through to the base; a
+mutable base value is copied into the run the first time it is read, so
+in-place changes (``context["messages"].append(...)``) never leak into the
+base or into other runs.  Writes and deletions only ever touch the run.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, MutableMapping
+import copy
+from typing import Any, Dict, Iterator
+
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None), frozenset)
+
+_DELETED = object()
+_MISSING = object()
+
+
+def _is_immutable(value: Any) -> bool:
+    if isinstance(value, tuple):
+        return all(_is_immutable(v) for v in value)
+    return isinstance(value, _IMMUTABLE)
+
+
+class RunContext(MutableMapping):
+    """Context of a single run, copy-on-write over a shared ``base`` mapping.
+
+    The base is never modified.  ``local`` holds only what this run set or
+    copied, so many concurrent runs over one base cost little memory.
+    """
+
+    __slots__ = ("base", "local")
+
+    def __init__(self, base: Mapping | None = None, **values):
+        self.base: Mapping = base if base is not None else {}
+        self.local: Dict[str, Any] = dict(values)
+
+    def __getitem__(self, key):
+        value = self.local.get(key, _MISSING)
+        if value is _DELETED:
+            raise KeyError(key)
+        if value is not _MISSING:
+            return value
+        value = self.base[key]
+        if not _is_immutable(value):
+            # Copy on first access so in-place changes stay in this run
+            value = self.local[key] = copy.deepcopy(value)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self.local[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self.base:
+            self.local[key] = _DELETED
+        else:
+            del self.local[key]
+
+    def __contains__(self, key) -> bool:
+        value = self.local.get(key)
+        if value is _DELETED:
+            return False
+        return key in self.local or key in self.base
+
+    def __iter__(self) -> Iterator:
+        for key, value in self.local.items():
+            if value is not _DELETED:
+                yield key
+        for key in self.base:
+            if key not in self.local:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RunContext({dict(self.items())!r})"
+
+    def to_dict(self) -> Dict:
+        return dict(self.items())
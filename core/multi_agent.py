@@ -1,5 +1,8 @@
-from typing import List, Dict
+import time
+from typing import Iterable, List, Dict, Mapping
 
+from core.batch import BATCH_SIZE, BATCH_WORKERS, BatchRun, record
+from core.context import RunContext
 from utils.logger import log
 from utils.event_bus import event_bus
 from utils.metrics import AGENT_RUNS, WORKFLOW_SECONDS
@@ -7,16 +10,84 @@ from agents.base import Agent
 
 
 class MultiAgentCoordinator:
-    """Coordinate multiple agents sharing a mutable context."""
+    """Coordinate multiple agents sharing a context within each run.
 
-    def __init__(self, agents: List[Agent]):
+    Every run gets its own :class:`~core.context.RunContext` over the
+    read-only ``shared_context``, so one coordinator can serve concurrent
+    runs.  Pass ``context`` to :meth:`run` to continue an earlier run's
+    context; :attr:`context` is the context of the last finished run.
+    """
+
+    def __init__(self, agents: List[Agent], shared_context: Mapping | None = None):
         self.agents = agents
-        self.context: Dict = {"messages": []}
+        self.shared_context: Dict = {"messages": [], **(shared_context or {})}
+        self._last_context: Dict | None = None
+
+    @property
+    def context(self) -> Dict:
+        if self._last_context is None:
+            return self.new_context()
+        return self._last_context
+
+    def new_context(self) -> RunContext:
+        """Fresh context for one run."""
+        return RunContext(self.shared_context)
+
+    def _run_chunk(self, messages: List[str]):
+        """Run a chunk of messages through each agent's ``act_batch`` in turn."""
+        contexts: List[Dict] = [self.new_context() for _ in messages]
+        stats: Dict[str, list] = {}
+        for agent in self.agents:
+            name = agent.__class__.__name__
+            start = time.perf_counter()
+            messages, contexts = agent.act_batch(messages, contexts)
+            record(stats, name, len(messages), time.perf_counter() - start)
+            if AGENT_RUNS:
+                AGENT_RUNS.labels(agent=name).inc(len(messages))
+        return list(messages), stats
+
+    def run_many(
+        self,
+        messages: Iterable[str],
+        workers: int = BATCH_WORKERS,
+        mode: str = "thread",
+        batch_size: int = BATCH_SIZE,
+    ) -> BatchRun:
+        """Run many messages on a ``mode`` pool, yielding results in input order."""
+        return BatchRun(self, messages, workers, mode, batch_size)
+
+    def run(self, message: str, context: Dict | None = None) -> str:
+        """Send the message through each agent with the run's context."""
+        cid = log(f"Starting multi-agent run with input: {message}")
+        msg = message
+        context = self.new_context() if context is None else context
+
+        if WORKFLOW_SECONDS:
+            timer = WORKFLOW_SECONDS.time()
+        else:
+            timer = None
+
+        event_bus.emit("workflow_start", message=message)
+
+        for agent in self.agents:
+            event_bus.emit("agent_start", agent=agent.__class__.__name__)
+            msg, context = agent.act(msg, context)
+            if AGENT_RUNS:
+                AGENT_RUNS.labels(agent=agent.__class__.__name__).inc()
+            event_bus.emit("agent_end", agent=agent.__class__.__name__, message=msg)
+            log(f"{agent.__class__.__name__} produced: {msg}", cid)
+
+        event_bus.emit("workflow_end", message=msg, context=context)
+        self._last_context = context
+        if timer:
+            timer.observe_duration()
+        return msg
 
-    def run(self, message: str) -> str:
-        """Send the message through each agent with shared context."""
+    async def run_async(self, message: str, context: Dict | None = None) -> str:
+        """Async variant of :meth:`run` awaiting each agent's ``act_async``."""
         cid = log(f"Starting multi-agent run with input: {message}")
         msg = message
+        context = self.new_context() if context is None else context
 
         if WORKFLOW_SECONDS:
             timer = WORKFLOW_SECONDS.time()
@@ -27,13 +98,14 @@ class MultiAgentCoordinator:
 
         for agent in self.agents:
             event_bus.emit("agent_start", agent=agent.__class__.__name__)
-            msg, self.context = agent.act(msg, self.context)
+            msg, context = await agent.act_async(msg, context)
             if AGENT_RUNS:
                 AGENT_RUNS.labels(agent=agent.__class__.__name__).inc()
             event_bus.emit("agent_end", agent=agent.__class__.__name__, message=msg)
             log(f"{agent.__class__.__name__} produced: {msg}", cid)
 
-        event_bus.emit("workflow_end", message=msg, context=self.context)
+        event_bus.emit("workflow_end", message=msg, context=context)
+        self._last_context = context
         if timer:
             timer.observe_duration()
         return msg
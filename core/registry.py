@@ -0,0 +1,133 @@
+"""Registry of agents constructed on first use.
+
+``discover_agents`` registers a factory (usually the agent class) per name
+instead of an instance, so a supervisor only pays for the agents it actually
+routes to.  Names, membership and ``len`` never construct anything; looking
+an agent up does, once, under a per-agent lock.  ``warm_up`` builds agents
+ahead of time, optionally on a background thread, and ``construction_times``
+records how long each one took.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator
+
+from agents.base import Agent
+from utils.logger import log
+from utils.metrics import AGENT_CONSTRUCTION_SECONDS
+
+
+class AgentRegistry(MutableMapping):
+    """Mapping of agent names to lazily constructed agents.
+
+    Assigning an :class:`Agent` instance registers it as already built; use
+    :meth:`register` to add a zero-argument factory.  An agent whose factory
+    raises is logged and removed, so lookups behave as if it never existed.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Agent]] | None = None):
+        self._factories: Dict[str, Callable[[], Agent]] = dict(factories or {})
+        self._agents: Dict[str, Agent] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.construction_times: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Agent]) -> None:
+        """Register ``factory`` to build agent ``name`` on first use."""
+        with self._lock:
+            self._factories[name] = factory
+            self._agents.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._agents
+
+    def loaded(self) -> list:
+        """Names of the agents constructed so far."""
+        return list(self._agents)
+
+    def _construct(self, name: str) -> Agent:
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is not None:
+                return agent
+            if name not in self._factories:
+                raise KeyError(name)
+            lock = self._locks.setdefault(name, threading.Lock())
+
+        with lock:
+            agent = self._agents.get(name)
+            if agent is not None:
+                return agent
+            factory = self._factories.get(name)
+            if factory is None:
+                raise KeyError(name)
+            start = time.perf_counter()
+            try:
+                agent = factory()
+            except Exception:
+                log(f"Failed to instantiate agent {name}")
+                with self._lock:
+                    self._factories.pop(name, None)
+                raise KeyError(name) from None
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._agents[name] = agent
+                self.construction_times[name] = elapsed
+            if AGENT_CONSTRUCTION_SECONDS:
+                AGENT_CONSTRUCTION_SECONDS.labels(agent=name).observe(elapsed)
+            log(f"Constructed agent {name} in {elapsed:.3f}s")
+            return agent
+
+    def warm_up(self, names: Iterable[str] | None = None, background: bool = True):
+        """Construct ``names`` (default: all agents) ahead of first use.
+
+        With ``background`` the agents are built on a daemon thread, which is
+        returned; lookups made meanwhile wait for the agent they need only.
+        """
+        names = list(self._factories) if names is None else list(names)
+
+        def build():
+            for name in names:
+                try:
+                    self._construct(name)
+                except KeyError:
+                    pass
+
+        if not background:
+            build()
+            return None
+        thread = threading.Thread(target=build, name="agent-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def __getitem__(self, name: str) -> Agent:
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+        return self._construct(name)
+
+    def __setitem__(self, name: str, agent: Agent) -> None:
+        with self._lock:
+            self._factories[name] = type(agent)
+            self._agents[name] = agent
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            del self._factories[name]
+            self._agents.pop(name, None)
+            self.construction_times.pop(name, None)
+
+    def __contains__(self, name) -> bool:
+        return name in self._factories
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._factories))
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __repr__(self) -> str:
+        return f"AgentRegistry({list(self._factories)}, loaded={self.loaded()})"
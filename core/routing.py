@@ -0,0 +1,205 @@
+"""Pluggable routers that let :class:`LLMSupervisor` skip the routing LLM call.
+
+A router looks at the current :class:`RoutingState` and returns a
+:class:`RoutingDecision` with a confidence in ``[0, 1]``, or ``None`` to
+abstain.  The supervisor asks its routers in order, takes the first decision
+at or above its confidence threshold and only falls back to the language
+model when none is confident.  Decisions made by the language model are then
+passed to each router's ``observe`` so caches and classifiers learn from them.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import math
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Protocol
+
+from cybersecurity.integrity import generate_hash
+
+FINISH = "FINISH"
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+class RoutingDecision(NamedTuple):
+    choice: str
+    confidence: float
+    source: str
+
+
+class RoutingState:
+    """What a router may look at when choosing the next agent."""
+
+    __slots__ = ("options", "messages", "steps")
+
+    def __init__(self, options: List[str], messages: List[dict], steps: List[str]):
+        self.options = options  # agent names plus FINISH
+        self.messages = messages  # the supervisor's context["messages"]
+        self.steps = steps  # agents already run in this run, in order
+
+    @property
+    def user_message(self) -> str:
+        """Latest user message of the conversation."""
+        return next((m["content"] for m in reversed(self.messages) if m.get("role") == "user"), "")
+
+
+class Router(Protocol):
+    """Router interface for :class:`LLMSupervisor`."""
+
+    def route(self, state: RoutingState) -> Optional[RoutingDecision]:  # pragma: no cover - interface
+        ...
+
+    def observe(self, state: RoutingState, choice: str) -> None:  # pragma: no cover - interface
+        ...
+
+
+class KeywordRouter:
+    """Deterministic router driven by keyword rules.
+
+    ``rules`` maps an agent name to keywords (lower-case words or regular
+    expressions).  Before the first step the agent whose rules match the user
+    message is chosen: with confidence 1.0 if it is the only match, 0.5 if
+    several agents tie.  Once ``max_steps`` agents have run the router answers
+    FINISH with full confidence; otherwise it abstains after the first step.
+    """
+
+    def __init__(self, rules: Dict[str, Iterable[str]], max_steps: int | None = 1):
+        self.rules = {
+            agent: [re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE) for pattern in patterns]
+            for agent, patterns in rules.items()
+        }
+        self.max_steps = max_steps
+
+    def route(self, state: RoutingState) -> Optional[RoutingDecision]:
+        if state.steps:
+            if self.max_steps is not None and len(state.steps) >= self.max_steps:
+                return RoutingDecision(FINISH, 1.0, "keyword")
+            return None
+        text = state.user_message
+        scores = {
+            agent: sum(1 for pattern in patterns if pattern.search(text))
+            for agent, patterns in self.rules.items()
+            if agent in state.options
+        }
+        best = max(scores.values(), default=0)
+        if not best:
+            return None
+        winners = [agent for agent, score in scores.items() if score == best]
+        return RoutingDecision(winners[0], 1.0 if len(winners) == 1 else 0.5, "keyword")
+
+    def observe(self, state: RoutingState, choice: str) -> None:
+        pass
+
+
+class DecisionCache:
+    """Remember routing decisions per conversation state.
+
+    The key covers the available options, the agents run so far and the
+    normalized message history, so a decision is only reused for exactly the
+    same situation.  The least recently used of ``max_items`` entries is
+    evicted first.
+    """
+
+    def __init__(self, max_items: int = 1024):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._decisions: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(state: RoutingState) -> str:
+        messages = [[m.get("role", ""), " ".join(str(m.get("content", "")).split())] for m in state.messages]
+        data = json.dumps([sorted(state.options), state.steps, messages], separators=(",", ":"))
+        return generate_hash(data.encode("utf-8"))
+
+    def route(self, state: RoutingState) -> Optional[RoutingDecision]:
+        key = self.key(state)
+        with self._lock:
+            choice = self._decisions.get(key)
+            if choice is None or choice not in state.options:
+                self.misses += 1
+                return None
+            self._decisions.move_to_end(key)
+            self.hits += 1
+        return RoutingDecision(choice, 1.0, "cache")
+
+    def observe(self, state: RoutingState, choice: str) -> None:
+        key = self.key(state)
+        with self._lock:
+            self._decisions[key] = choice
+            self._decisions.move_to_end(key)
+            while len(self._decisions) > self.max_items:
+                self._decisions.popitem(last=False)
+
+
+class LocalClassifier:
+    """Multinomial naive Bayes over the user message and the step count.
+
+    Train it up front with ``examples`` (``{choice: [utterances]}``) and/or
+    let it learn from the supervisor's observed decisions.  Confidence is the
+    posterior probability of the best choice, so it stays low until the
+    classifier has seen enough clearly separated examples.
+    """
+
+    def __init__(self, examples: Dict[str, Iterable[str]] | None = None, alpha: float = 1.0, learn: bool = True):
+        self.alpha = alpha
+        self.learn = learn
+        self._doc_counts: Dict[str, int] = {}
+        self._word_counts: Dict[str, Dict[str, int]] = {}
+        self._totals: Dict[str, int] = {}
+        self._vocabulary: set = set()
+        self._lock = threading.Lock()
+        for choice, texts in (examples or {}).items():
+            for text in texts:
+                self.train(text, choice)
+
+    @staticmethod
+    def _features(text: str, steps: int = 0) -> List[str]:
+        return _words(text) + [f"__step{min(steps, 3)}"]
+
+    def train(self, text: str, choice: str, steps: int = 0) -> None:
+        features = self._features(text, steps)
+        with self._lock:
+            self._doc_counts[choice] = self._doc_counts.get(choice, 0) + 1
+            counts = self._word_counts.setdefault(choice, {})
+            for feature in features:
+                counts[feature] = counts.get(feature, 0) + 1
+            self._totals[choice] = self._totals.get(choice, 0) + len(features)
+            self._vocabulary.update(features)
+
+    def predict(self, text: str, options: Iterable[str], steps: int = 0) -> Optional[RoutingDecision]:
+        features = self._features(text, steps)
+        with self._lock:
+            choices = [c for c in options if c in self._doc_counts]
+            if not choices:
+                return None
+            documents = sum(self._doc_counts[c] for c in choices)
+            vocabulary = len(self._vocabulary) or 1
+            log_probs = {}
+            for choice in choices:
+                counts = self._word_counts[choice]
+                denominator = self._totals[choice] + self.alpha * vocabulary
+                log_prob = math.log(self._doc_counts[choice] / documents)
+                for feature in features:
+                    log_prob += math.log((counts.get(feature, 0) + self.alpha) / denominator)
+                log_probs[choice] = log_prob
+        best = max(log_probs, key=log_probs.get)
+        # Softmax over the log scores, relative to the best for stability
+        total = sum(math.exp(lp - log_probs[best]) for lp in log_probs.values())
+        confidence = 1.0 / total if len(log_probs) > 1 else 0.5
+        return RoutingDecision(best, confidence, "classifier")
+
+    def route(self, state: RoutingState) -> Optional[RoutingDecision]:
+        return self.predict(state.user_message, state.options, len(state.steps))
+
+    def observe(self, state: RoutingState, choice: str) -> None:
+        if self.learn:
+            self.train(state.user_message, choice, len(state.steps))
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, Iterable, List, Mapping
 import importlib
+import os
 import pkgutil
+import time
 
 from agents.base import Agent
+from core.batch import BATCH_SIZE, BATCH_WORKERS, BatchRun, record
+from core.context import RunContext
+from core.registry import AgentRegistry
+from core.routing import FINISH, DecisionCache, RoutingDecision, RoutingState
 from utils.logger import log
 from utils.event_bus import event_bus
-from utils.metrics import AGENT_RUNS, WORKFLOW_SECONDS
-from language_model.language_model import generate_answer
+from utils.metrics import AGENT_RUNS, ROUTING_DECISIONS, WORKFLOW_SECONDS
+from language_model.language_model import agenerate_answer, generate_answer
 
+# Construct discovered agents on a background thread as soon as a supervisor starts
+AGENT_WARM_UP = os.getenv("AGENT_WARM_UP", "0").lower() in {"1", "true", "yes"}
+# Conversation messages a run keeps when continuing an earlier context
+SUPERVISOR_MAX_MESSAGES = int(os.getenv("SUPERVISOR_MAX_MESSAGES", "50"))
 
-def discover_agents(package: str = "agents") -> Dict[str, Agent]:
-    """Import all Agent subclasses from the given package."""
+
+def discover_agents(package: str = "agents") -> AgentRegistry:
+    """Register all Agent subclasses from the given package.
+
+    Agents are not instantiated here: the returned :class:`AgentRegistry`
+    constructs each one the first time it is looked up.
+    """
     pkg = importlib.import_module(package)
-    discovered: Dict[str, Agent] = {}
+    discovered = AgentRegistry()
     for mod_info in pkgutil.iter_modules(pkg.__path__):
         module = importlib.import_module(f"{package}.{mod_info.name}")
         for name, obj in vars(module).items():
@@ -23,23 +38,73 @@ def discover_agents(package: str = "agents") -> Dict[str, Agent]:
                 and issubclass(obj, Agent)
                 and obj is not Agent
             ):
-                try:
-                    discovered[name] = obj()
-                except Exception:
-                    log(f"Failed to instantiate agent {name}")
+                discovered.register(name, obj)
     return discovered
 
 
 class LLMSupervisor:
-    """Coordinate agents using an LLM to dynamically choose the next step."""
+    """Coordinate agents using an LLM to dynamically choose the next step.
+
+    ``routers`` (see :mod:`core.routing`) are consulted before every step; the
+    first decision with at least ``confidence_threshold`` confidence is used
+    and the language model is only asked when no router is confident.  By
+    default a :class:`~core.routing.DecisionCache` replays earlier LLM
+    decisions for identical conversation states.
+
+    Agents discovered from a package are built on first use; with
+    ``warm_up`` they are constructed on a background thread right away.  An
+    agent whose construction fails is dropped from the registry, and with it
+    from the default system prompt and the routing options; if the LLM had
+    picked it, the step is routed again.
 
-    def __init__(self, agents: Dict[str, Agent] | None = None, system_prompt: str | None = None):
+    Each run works on its own :class:`~core.context.RunContext` over the
+    read-only ``shared_context``, so one supervisor can serve concurrent
+    runs.  Pass the ``context`` of an earlier run to continue that
+    conversation; only its last ``max_messages`` messages are kept.
+    :attr:`context` is the context of the last finished run.
+    """
+
+    def __init__(
+        self,
+        agents: Dict[str, Agent] | None = None,
+        system_prompt: str | None = None,
+        routers: List | None = None,
+        confidence_threshold: float = 0.8,
+        warm_up: bool = AGENT_WARM_UP,
+        shared_context: Mapping | None = None,
+        max_messages: int = SUPERVISOR_MAX_MESSAGES,
+    ):
         agents = agents or discover_agents()
         if not agents:
             raise ValueError("At least one agent must be provided")
         self.agents = agents
-        self.context: Dict = {"messages": []}
-        self.system_prompt = system_prompt or self._default_prompt()
+        if warm_up and isinstance(agents, AgentRegistry):
+            agents.warm_up()
+        self.shared_context: Dict = {"messages": [], **(shared_context or {})}
+        self.max_messages = max_messages
+        self._last_context: Dict | None = None
+        self._system_prompt = system_prompt
+        self.routers = [DecisionCache()] if routers is None else list(routers)
+        self.confidence_threshold = confidence_threshold
+
+    @property
+    def system_prompt(self) -> str:
+        """The prompt given at construction, or one listing the current agents."""
+        return self._system_prompt or self._default_prompt()
+
+    @system_prompt.setter
+    def system_prompt(self, prompt: str | None) -> None:
+        self._system_prompt = prompt
+
+    @property
+    def context(self) -> Dict:
+        if self._last_context is None:
+            return self.new_context()
+        return self._last_context
+
+    def new_context(self) -> RunContext:
+        """Fresh context for one run."""
+        return RunContext(self.shared_context)
 
     @classmethod
     def from_package(cls, package: str = "agents", **kwargs) -> "LLMSupervisor":
@@ -65,28 +130,154 @@ class LLMSupervisor:
             + ". After each response decide which agent should act next or reply FINISH."
         )
 
-    def _route(self) -> str:
-        """Ask the language model which agent should run next."""
-        options = list(self.agents.keys()) + ["FINISH"]
-        messages: List[dict] = (
+    def _route(self, state: RoutingState) -> str:
+        """Pick the next agent, asking the language model only when no router is confident."""
+        choice = self._route_without_llm(state)
+        if choice is None:
+            choice = self._learn(state, generate_answer(self._routing_messages(state)))
+        return choice
+
+    async def _route_async(self, state: RoutingState) -> str:
+        """Async variant of :meth:`_route` awaiting the language model."""
+        choice = self._route_without_llm(state)
+        if choice is None:
+            response = await agenerate_answer(self._routing_messages(state))
+            choice = self._learn(state, response)
+        return choice
+
+    def _routing_state(self, context: Dict, steps: List[str]) -> RoutingState:
+        options = list(self.agents.keys()) + [FINISH]
+        return RoutingState(options, context["messages"], list(steps))
+
+    def _route_without_llm(self, state: RoutingState) -> str | None:
+        """Return the first confident router decision, or ``None``."""
+        for router in self.routers:
+            decision = router.route(state)
+            if (
+                decision is not None
+                and decision.confidence >= self.confidence_threshold
+                and decision.choice in state.options
+            ):
+                return self._record(decision)
+        return None
+
+    def _learn(self, state: RoutingState, response: str) -> str:
+        """Parse the LLM's reply and let the routers learn from it.
+
+        Only a reply naming one of the options is observed.  Anything else,
+        including the offline echo model's fallback text, still ends the run
+        with FINISH but must not teach the routers to finish.
+        """
+        choice = self._parse_choice(response, state.options)
+        if response.strip() == choice:
+            for router in self.routers:
+                router.observe(state, choice)
+        return self._record(RoutingDecision(choice, 1.0, "llm"))
+
+    @staticmethod
+    def _record(decision: RoutingDecision) -> str:
+        if ROUTING_DECISIONS:
+            ROUTING_DECISIONS.labels(source=decision.source).inc()
+        return decision.choice
+
+    def _routing_messages(self, state: RoutingState) -> List[dict]:
+        """Messages asking the language model which agent should run next."""
+        return (
             [{"role": "system", "content": self.system_prompt}]
-            + self.context["messages"]
+            + state.messages
             + [
                 {
                     "role": "system",
-                    "content": f"Who should act next? Options: {options}",
+                    "content": f"Who should act next? Options: {state.options}",
                 }
             ]
         )
-        response = generate_answer(messages)
+
+    @staticmethod
+    def _parse_choice(response: str, options: List[str]) -> str:
         choice = response.strip()
         if choice not in options:
-            choice = "FINISH"
+            choice = FINISH
         return choice
 
-    def run(self, message: str) -> str:
+    def _start(self, message: str, context: Dict | None) -> Dict:
+        """Context for a new run, with the user message appended."""
+        if context is None:
+            context = self.new_context()
+        messages = context.setdefault("messages", [])
+        if self.max_messages and len(messages) >= self.max_messages:
+            del messages[: len(messages) - self.max_messages + 1]
+        messages.append({"role": "user", "content": message})
+        return context
+
+    def run(self, message: str, context: Dict | None = None) -> str:
+        return self._run(message, context)
+
+    def _run_chunk(self, messages: List[str]):
+        """Route each message of a chunk on its own; routing is per message."""
+        stats: Dict[str, list] = {}
+        return [self._run(message, None, stats) for message in messages], stats
+
+    def run_many(
+        self,
+        messages: Iterable[str],
+        workers: int = BATCH_WORKERS,
+        mode: str = "thread",
+        batch_size: int = BATCH_SIZE,
+    ) -> BatchRun:
+        """Run many messages on a ``mode`` pool, yielding results in input order.
+
+        Every message is routed independently, so agents are called through
+        ``act`` rather than ``act_batch``.
+        """
+        return BatchRun(self, messages, workers, mode, batch_size)
+
+    def _run(self, message: str, context: Dict | None = None, stats: Dict | None = None) -> str:
+        cid = log(f"Starting LLMSupervisor run with input: {message}")
+        context = self._start(message, context)
+        steps: List[str] = []
+
+        if WORKFLOW_SECONDS:
+            timer = WORKFLOW_SECONDS.time()
+        else:
+            timer = None
+
+        event_bus.emit("workflow_start", message=message)
+
+        msg = message
+        next_agent = self._route(self._routing_state(context, steps))
+        while next_agent != FINISH:
+            agent = self.agents.get(next_agent)
+            if agent is None:
+                # It failed to build and left the options; ask again without it
+                next_agent = self._route(self._routing_state(context, steps))
+                continue
+            steps.append(next_agent)
+            event_bus.emit("agent_start", agent=next_agent)
+            start = time.perf_counter()
+            msg, context = agent.act(msg, context)
+            if stats is not None:
+                record(stats, next_agent, 1, time.perf_counter() - start)
+            context["messages"].append({"role": "assistant", "content": msg})
+            if AGENT_RUNS:
+                AGENT_RUNS.labels(agent=next_agent).inc()
+            event_bus.emit("agent_end", agent=next_agent, message=msg)
+            log(f"{next_agent} produced: {msg}", cid)
+            next_agent = self._route(self._routing_state(context, steps))
+
+        event_bus.emit(
+            "workflow_end", message=msg, context=context
+        )
+        self._last_context = context
+        if timer:
+            timer.observe_duration()
+        return msg
+
+    async def run_async(self, message: str, context: Dict | None = None) -> str:
+        """Async variant of :meth:`run` awaiting routing and ``act_async``."""
         cid = log(f"Starting LLMSupervisor run with input: {message}")
-        self.context["messages"].append({"role": "user", "content": message})
+        context = self._start(message, context)
+        steps: List[str] = []
 
         if WORKFLOW_SECONDS:
             timer = WORKFLOW_SECONDS.time()
@@ -96,23 +287,26 @@ class LLMSupervisor:
         event_bus.emit("workflow_start", message=message)
 
         msg = message
-        next_agent = self._route()
-        while next_agent != "FINISH":
+        next_agent = await self._route_async(self._routing_state(context, steps))
+        while next_agent != FINISH:
             agent = self.agents.get(next_agent)
             if agent is None:
-                break
+                next_agent = await self._route_async(self._routing_state(context, steps))
+                continue
+            steps.append(next_agent)
             event_bus.emit("agent_start", agent=next_agent)
-            msg, self.context = agent.act(msg, self.context)
-            self.context["messages"].append({"role": "assistant", "content": msg})
+            msg, context = await agent.act_async(msg, context)
+            context["messages"].append({"role": "assistant", "content": msg})
             if AGENT_RUNS:
                 AGENT_RUNS.labels(agent=next_agent).inc()
             event_bus.emit("agent_end", agent=next_agent, message=msg)
             log(f"{next_agent} produced: {msg}", cid)
-            next_agent = self._route()
+            next_agent = await self._route_async(self._routing_state(context, steps))
 
         event_bus.emit(
-            "workflow_end", message=msg, context=self.context
+            "workflow_end", message=msg, context=context
         )
+        self._last_context = context
         if timer:
             timer.observe_duration()
         return msg
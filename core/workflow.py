@@ -1,18 +1,73 @@
-from typing import List
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import copy
+import os
+import time
+from typing import Dict, Iterable, List, Set
 
 
 from utils.event_bus import event_bus
 from utils.metrics import AGENT_RUNS, WORKFLOW_SECONDS
+from core.batch import BATCH_SIZE, BATCH_WORKERS, BatchRun, record
 from core.hooks import WorkflowHook
 
 from utils.logger import log
-from agents.base import Agent
+from agents.base import MESSAGE, Agent
+
+# Threads used to run independent agents at the same time
+WORKFLOW_MAX_WORKERS = int(os.getenv("WORKFLOW_MAX_WORKERS", "4"))
+
+_MISSING = object()
+
+
+def _declared(agent: Agent) -> bool:
+    return agent.reads is not None and agent.writes is not None
+
+
+def _replaces_message(agent: Agent) -> bool:
+    """Return ``True`` if the message ``agent`` returns is passed on."""
+    return not _declared(agent) or MESSAGE in agent.writes
+
+
+def _conflicts(first: Agent, second: Agent) -> bool:
+    """Return ``True`` if ``second`` must wait for ``first``."""
+    if not (_declared(first) and _declared(second)):
+        return True
+    # Every agent receives the current message, so message writers order everyone
+    # after them.  Each agent's message output is kept separately, though, so
+    # a later message writer need not wait for earlier readers or writers.
+    second_reads = second.reads | {MESSAGE}
+    return bool(
+        first.writes & second_reads
+        or (first.writes & second.writes) - {MESSAGE}
+        or (first.reads & second.writes) - {MESSAGE}
+    )
 
 
 class Workflow:
-    """Simple sequential workflow that runs a list of agents."""
+    """Workflow that runs a list of agents, concurrently where their declarations allow.
 
-    def __init__(self, agents: List[Agent], hooks: List[WorkflowHook] | None = None):
+    Agents declaring ``reads``/``writes`` (see :class:`agents.base.Agent`)
+    form a dependency graph in list order: an agent waits for every earlier
+    agent whose writes it reads, whose reads it overwrites or whose writes it
+    overwrites.  Independent agents run together on a thread pool, each on
+    its own copy of the context; their changes are merged back in list order
+    so the result does not depend on which finished first.  Agents without
+    declarations run alone, exactly as in a sequential workflow.
+
+    Whatever the path (sequential, thread pool, :meth:`run_async` or
+    :meth:`run_many`), a declared agent's returned message is only passed on
+    when :data:`~agents.base.MESSAGE` is in its ``writes``.
+    """
+
+    def __init__(
+        self,
+        agents: List[Agent],
+        hooks: List[WorkflowHook] | None = None,
+        max_workers: int = WORKFLOW_MAX_WORKERS,
+    ):
         """Create a workflow, ensuring security checks precede any RAG agent."""
         new_agents: List[Agent] = []
         security_inserted = False
@@ -30,12 +85,163 @@ class Workflow:
 
         self.agents = new_agents
         self.hooks = hooks or []
+        self.max_workers = max_workers
+        self.dependencies = self._build_dependencies()
+
+    def _build_dependencies(self) -> List[Set[int]]:
+        """Return, for each agent, the indexes of the agents it waits for."""
+        dependencies: List[Set[int]] = []
+        for j, agent in enumerate(self.agents):
+            deps = {i for i in range(j) if _conflicts(self.agents[i], agent)}
+            if agent.__class__.__name__ == "RAGAgent":
+                # Security checks always finish before retrieval starts
+                deps |= {i for i in range(j) if self.agents[i].__class__.__name__ == "SecurityAgent"}
+            dependencies.append(deps)
+        return dependencies
+
+    def _run_agent(self, agent: Agent, msg: str, context: Dict, cid: str):
+        """Run one agent with its hooks, events and metrics."""
+        name = agent.__class__.__name__
+        event_bus.emit("agent_start", agent=name)
+
+        for hook in self.hooks:
+            msg, context = hook.before_agent(agent, msg, context)
+
+        msg, context = agent.act(msg, context)
+
+        for hook in self.hooks:
+            msg, context = hook.after_agent(agent, msg, context)
+
+        if AGENT_RUNS:
+            AGENT_RUNS.labels(agent=name).inc()
+        event_bus.emit("agent_end", agent=name, message=msg)
+        log(f"{name} produced: {msg}", cid)
+        return msg, context
+
+    @staticmethod
+    def _snapshot(agent: Agent, context: Dict) -> Dict:
+        """Private copy of ``context``; values the agent writes are deep-copied."""
+        snapshot = dict(context)
+        for key in agent.writes:
+            if key in snapshot:
+                snapshot[key] = copy.deepcopy(snapshot[key])
+        return snapshot
+
+    @staticmethod
+    def _changes(before: Dict, after: Dict) -> Dict:
+        """Keys an agent set or removed, with ``_MISSING`` marking removals."""
+        changes = {key: value for key, value in after.items() if before.get(key, _MISSING) is not value}
+        changes.update({key: _MISSING for key in before if key not in after})
+        return changes
+
+    @staticmethod
+    def _apply(context: Dict, changes: Dict) -> None:
+        for key, value in changes.items():
+            if value is _MISSING:
+                context.pop(key, None)
+            else:
+                context[key] = value
+
+    def _run_sequential(self, message: str, cid: str):
+        context: Dict = {}
+        msg = message
+        for agent in self.agents:
+            output, context = self._run_agent(agent, msg, context, cid)
+            if _replaces_message(agent):
+                msg = output
+        return msg, context
+
+    def _run_parallel(self, message: str, cid: str):
+        graph = _GraphRun(self, message)
+        running: Dict = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="workflow") as pool:
+            while graph.pending or running:
+                for j in graph.ready():
+                    agent, msg, context = graph.start(j)
+                    running[pool.submit(self._run_agent, agent, msg, context, cid)] = j
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    graph.finish(running.pop(future), *future.result())
+        return graph.result()
+
+    async def _run_agent_async(self, agent: Agent, msg: str, context: Dict, cid: str):
+        """Async counterpart of :meth:`_run_agent` using ``agent.act_async``."""
+        name = agent.__class__.__name__
+        event_bus.emit("agent_start", agent=name)
+
+        for hook in self.hooks:
+            msg, context = hook.before_agent(agent, msg, context)
+
+        msg, context = await agent.act_async(msg, context)
+
+        for hook in self.hooks:
+            msg, context = hook.after_agent(agent, msg, context)
+
+        if AGENT_RUNS:
+            AGENT_RUNS.labels(agent=name).inc()
+        event_bus.emit("agent_end", agent=name, message=msg)
+        log(f"{name} produced: {msg}", cid)
+        return msg, context
+
+    async def _run_graph_async(self, message: str, cid: str):
+        graph = _GraphRun(self, message)
+        running: Dict = {}
+        while graph.pending or running:
+            for j in graph.ready():
+                agent, msg, context = graph.start(j)
+                running[asyncio.ensure_future(self._run_agent_async(agent, msg, context, cid))] = j
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                graph.finish(running.pop(task), *task.result())
+        return graph.result()
+
+    def _run_chunk(self, messages: List[str]):
+        """Run a chunk of messages through the agents in list order, batch by batch.
+
+        Each agent gets every message at once through ``act_batch``; the
+        message passed on follows the same rules as :meth:`run`.
+        """
+        carried = list(messages)
+        contexts: List[Dict] = [{} for _ in messages]
+        stats: Dict[str, list] = {}
+        for agent in self.agents:
+            name = agent.__class__.__name__
+            inputs = list(carried)
+            for hook in self.hooks:
+                for i, msg in enumerate(inputs):
+                    inputs[i], contexts[i] = hook.before_agent(agent, msg, contexts[i])
+
+            start = time.perf_counter()
+            outputs, contexts = agent.act_batch(inputs, contexts)
+            record(stats, name, len(inputs), time.perf_counter() - start)
+            outputs, contexts = list(outputs), list(contexts)
+
+            for hook in self.hooks:
+                for i, msg in enumerate(outputs):
+                    outputs[i], contexts[i] = hook.after_agent(agent, msg, contexts[i])
+            if AGENT_RUNS:
+                AGENT_RUNS.labels(agent=name).inc(len(inputs))
+            if _replaces_message(agent):
+                carried = outputs
+        return carried, stats
+
+    def run_many(
+        self,
+        messages: Iterable[str],
+        workers: int = BATCH_WORKERS,
+        mode: str = "thread",
+        batch_size: int = BATCH_SIZE,
+    ) -> BatchRun:
+        """Run many messages on a ``mode`` pool, yielding results in input order.
+
+        See :class:`core.batch.BatchRun`; its ``report`` holds per-agent
+        throughput once iteration finishes.
+        """
+        return BatchRun(self, messages, workers, mode, batch_size)
 
     def run(self, message: str) -> str:
-        """Send the message through each agent in sequence with shared context."""
+        """Send the message through the agents, running independent ones concurrently."""
         cid = log(f"Starting workflow with input: {message}")
-        context = {}
-        msg = message
 
         if WORKFLOW_SECONDS:
             timer = WORKFLOW_SECONDS.time()
@@ -44,21 +250,30 @@ class Workflow:
 
         event_bus.emit("workflow_start", message=message)
 
-        for agent in self.agents:
-            event_bus.emit("agent_start", agent=agent.__class__.__name__)
+        if self.max_workers > 1 and any(_declared(agent) for agent in self.agents):
+            msg, context = self._run_parallel(message, cid)
+        else:
+            msg, context = self._run_sequential(message, cid)
 
-            for hook in self.hooks:
-                msg, context = hook.before_agent(agent, msg, context)
+        event_bus.emit("workflow_end", message=msg, context=context)
 
-            msg, context = agent.act(msg, context)
+        if timer:
+            timer.observe_duration()
 
-            for hook in self.hooks:
-                msg, context = hook.after_agent(agent, msg, context)
+        return msg
 
-            if AGENT_RUNS:
-                AGENT_RUNS.labels(agent=agent.__class__.__name__).inc()
-            event_bus.emit("agent_end", agent=agent.__class__.__name__, message=msg)
-            log(f"{agent.__class__.__name__} produced: {msg}", cid)
+    async def run_async(self, message: str) -> str:
+        """Async variant of :meth:`run`; independent agents run as concurrent tasks."""
+        cid = log(f"Starting workflow with input: {message}")
+
+        if WORKFLOW_SECONDS:
+            timer = WORKFLOW_SECONDS.time()
+        else:
+            timer = None
+
+        event_bus.emit("workflow_start", message=message)
+
+        msg, context = await self._run_graph_async(message, cid)
 
         event_bus.emit("workflow_end", message=msg, context=context)
 
@@ -66,3 +281,53 @@ class Workflow:
             timer.observe_duration()
 
         return msg
+
+
+class _GraphRun:
+    """Bookkeeping for one dependency-graph run of a :class:`Workflow`."""
+
+    def __init__(self, workflow: Workflow, message: str):
+        self.agents = workflow.agents
+        self.dependencies = workflow.dependencies
+        self.message = message
+        self.live: Dict = {}
+        self.outputs: List = [None] * len(self.agents)  # (message, changes) per finished agent
+        self.pending = set(range(len(self.agents)))
+        self._before: Dict = {}
+
+    def ready(self) -> List[int]:
+        return [
+            j for j in sorted(self.pending)
+            if all(self.outputs[i] is not None for i in self.dependencies[j])
+        ]
+
+    def input_message(self, j: int) -> str:
+        """Output of the closest earlier agent that replaces the message."""
+        for i in range(j - 1, -1, -1):
+            if _replaces_message(self.agents[i]):
+                return self.outputs[i][0]
+        return self.message
+
+    def start(self, j: int):
+        """Return ``(agent, message, context)`` to run agent ``j`` with."""
+        agent = self.agents[j]
+        self.pending.discard(j)
+        self._before[j] = dict(self.live)
+        # Undeclared agents depend on everything, so they always run alone
+        context = Workflow._snapshot(agent, self.live) if _declared(agent) else self.live
+        return agent, self.input_message(j), context
+
+    def finish(self, j: int, msg: str, context: Dict) -> None:
+        changes = Workflow._changes(self._before.pop(j), context)
+        self.outputs[j] = (msg, changes)
+        if _declared(self.agents[j]):
+            Workflow._apply(self.live, changes)
+        else:
+            self.live = context
+
+    def result(self):
+        """Final message and the context merged deterministically in list order."""
+        merged: Dict = {}
+        for _, changes in self.outputs:
+            Workflow._apply(merged, changes)
+        return self.input_message(len(self.agents)), merged
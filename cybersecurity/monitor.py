@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
 from urllib.parse import urlparse
@@ -25,6 +26,16 @@ def check_service(url: str) -> bool:
         return False
 
 
+async def check_service_async(url: str) -> bool:
+    """Async variant of :func:`check_service`."""
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(url)
+        return response.status_code < 500
+    except Exception:
+        return False
+
+
 def _check_vector_store(url: str) -> bool:
     return check_service(url)
 
@@ -60,6 +71,21 @@ def check_services(vector_url: str | None = None, broker_url: str | None = None)
         log(f"Message broker check failed for {b_url}")
 
 
+async def check_services_async(vector_url: str | None = None, broker_url: str | None = None) -> None:
+    """Async variant of :func:`check_services`; both checks run concurrently."""
+    v_url = vector_url or VECTOR_STORE_URL
+    b_url = broker_url or BROKER_URL
+
+    vector_ok, broker_ok = await asyncio.gather(
+        check_service_async(v_url),
+        asyncio.to_thread(_check_broker, b_url),
+    )
+    if not vector_ok:
+        log(f"Vector store check failed for {v_url}")
+    if not broker_ok:
+        log(f"Message broker check failed for {b_url}")
+
+
 def monitor_services(interval: int = 60) -> None:
     """Continuously monitor services at the given interval (seconds)."""
     while True:
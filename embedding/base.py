@@ -1,4 +1,8 @@
 from abc import ABC, abstractmethod
+import os
+
+# Texts encoded per forward pass by ``embed_texts``
+EMBED_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
 
 class EmbeddingModel(ABC):
     """Abstract base class for embedding models."""
@@ -7,3 +11,11 @@ class EmbeddingModel(ABC):
     def embed(self, text: str):
         """Return the vector representation for the given text."""
         pass
+
+    def embed_texts(self, texts: list, batch_size: int = EMBED_BATCH_SIZE) -> list:
+        """Return one vector per text, in order.
+
+        Subclasses should override this when the backend can encode several
+        texts per call; the default simply loops over :meth:`embed`.
+        """
+        return [self.embed(text) for text in texts]
@@ -0,0 +1,251 @@
+"""Two-tier, content-addressed cache for text embeddings.
+
+Entries are keyed by ``<model name>:<sha256 of the text>`` so identical chunks
+and repeated questions are only embedded once.  A small in-process LRU sits in
+front of an optional SQLite file that survives restarts and is shared by every
+process pointing at the same path.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+import os
+import sqlite3
+import threading
+import time
+
+from cybersecurity.integrity import generate_hash
+from utils.metrics import EMBEDDING_CACHE_REQUESTS
+from .base import EMBED_BATCH_SIZE, EmbeddingModel
+
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.sqlite3")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_DISK_SIZE = int(os.getenv("EMBEDDING_CACHE_DISK_SIZE", "500000"))
+# Seconds between writes of memory-tier hits to the disk tier's access times
+EMBEDDING_CACHE_TOUCH_INTERVAL = float(os.getenv("EMBEDDING_CACHE_TOUCH_INTERVAL", "30"))
+
+
+class EmbeddingCache:
+    """In-memory LRU backed by a size-bounded on-disk store.
+
+    ``path=None`` keeps the cache purely in memory.  When the disk tier grows
+    past ``max_disk_items`` the least recently used entries are deleted.
+    Memory hits are remembered and written to the disk tier's access times in
+    batches (at most every ``touch_interval`` seconds, and always before the
+    disk tier evicts), so hot keys are not the first to leave the disk.
+    """
+
+    def __init__(
+        self,
+        max_memory_items: int = EMBEDDING_CACHE_SIZE,
+        path: str | None = None,
+        max_disk_items: int = EMBEDDING_CACHE_DISK_SIZE,
+        touch_interval: float = EMBEDDING_CACHE_TOUCH_INTERVAL,
+    ):
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.path = path
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._disk_count = 0
+        self.touch_interval = touch_interval
+        self._touched: dict = {}  # key -> last memory hit time not yet on disk
+        self._last_touch_flush = time.monotonic()
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        return f"{model_name}:{generate_hash(text.encode('utf-8'))}"
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def stats(self) -> dict:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_items": len(self._memory),
+            "disk_items": self._disk_count,
+        }
+
+    def _db(self):
+        """Return the SQLite connection, reopening it after a fork."""
+        if self.path is None:
+            return None
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings(last_access)"
+            )
+            conn.commit()
+            self._disk_count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _flush_touches(self, conn, force: bool = False) -> None:
+        """Write pending memory-hit access times to the disk tier (lock held)."""
+        if not self._touched:
+            return
+        if not force and time.monotonic() - self._last_touch_flush < self.touch_interval:
+            return
+        conn.executemany(
+            "UPDATE embeddings SET last_access = MAX(last_access, ?) WHERE key = ?",
+            [(when, key) for key, when in self._touched.items()],
+        )
+        conn.commit()
+        self._touched.clear()
+        self._last_touch_flush = time.monotonic()
+
+    def _remember(self, key: str, vector: list) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys: list) -> list:
+        """Return cached vectors for ``keys`` (``None`` where missing)."""
+        results = [None] * len(keys)
+        pending = {}
+        memory_hits = disk_hits = 0
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+                    memory_hits += 1
+                    if self.path is not None:
+                        self._touched[key] = time.time()
+                else:
+                    pending.setdefault(key, []).append(i)
+
+            conn = self._db()
+            if conn is not None:
+                self._flush_touches(conn)
+            if pending and conn is not None:
+                found = {}
+                lookup = list(pending)
+                for start in range(0, len(lookup), 500):
+                    chunk = lookup[start : start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for key, blob in conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", chunk
+                    ):
+                        found[key] = array("f", blob).tolist()
+                if found:
+                    now = time.time()
+                    conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+                    conn.commit()
+                for key, vector in found.items():
+                    self._remember(key, vector)
+                    for i in pending.pop(key):
+                        results[i] = vector
+                        disk_hits += 1
+
+            misses = sum(len(idx) for idx in pending.values())
+            self.memory_hits += memory_hits
+            self.disk_hits += disk_hits
+            self.misses += misses
+
+        if EMBEDDING_CACHE_REQUESTS:
+            EMBEDDING_CACHE_REQUESTS.labels(result="memory_hit").inc(memory_hits)
+            EMBEDDING_CACHE_REQUESTS.labels(result="disk_hit").inc(disk_hits)
+            EMBEDDING_CACHE_REQUESTS.labels(result="miss").inc(misses)
+        return results
+
+    def put_many(self, items: list) -> None:
+        """Store ``(key, vector)`` pairs in both tiers."""
+        if not items:
+            return
+        with self._lock:
+            for key, vector in items:
+                self._remember(key, list(vector))
+            conn = self._db()
+            if conn is None:
+                return
+            now = time.time()
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                [(key, array("f", vector).tobytes(), now) for key, vector in items],
+            )
+            self._disk_count += conn.total_changes - before
+            overflow = self._disk_count - self.max_disk_items
+            if overflow > 0:
+                self._flush_touches(conn, force=True)
+                conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+                    (overflow,),
+                )
+                self._disk_count -= overflow
+            conn.commit()
+
+    def get(self, key: str):
+        return self.get_many([key])[0]
+
+    def put(self, key: str, vector: list) -> None:
+        self.put_many([(key, vector)])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._last_touch_flush = time.monotonic()
+            conn = self._db()
+            if conn is not None:
+                conn.execute("DELETE FROM embeddings")
+                conn.commit()
+                self._disk_count = 0
+
+
+class CachedEmbeddingModel(EmbeddingModel):
+    """Wrap an :class:`EmbeddingModel` so only uncached texts reach the model.
+
+    Results are only stored while ``model.cacheable`` is true, which keeps
+    placeholder vectors (e.g. the offline fallback) out of the cache.
+    """
+
+    def __init__(self, model: EmbeddingModel, cache: EmbeddingCache | None = None, namespace: str | None = None):
+        self.model = model
+        self.cache = cache or EmbeddingCache()
+        self.namespace = namespace or getattr(model, "model_name", model.__class__.__name__)
+
+    def embed(self, text: str):
+        return self.embed_texts([text], batch_size=1)[0]
+
+    def embed_texts(self, texts: list, batch_size: int = EMBED_BATCH_SIZE) -> list:
+        texts = list(texts)
+        keys = [EmbeddingCache.key(self.namespace, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+
+        missing: dict = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(keys[i], []).append(i)
+        if not missing:
+            return vectors
+
+        todo = [texts[positions[0]] for positions in missing.values()]
+        computed = self.model.embed_texts(todo, batch_size=batch_size)
+        for positions, vector in zip(missing.values(), computed):
+            for i in positions:
+                vectors[i] = vector
+        if getattr(self.model, "cacheable", True):
+            self.cache.put_many(list(zip(missing.keys(), computed)))
+        return vectors
@@ -1,9 +1,12 @@
 # text_embedding/embedder.py
+import hashlib
+
 try:
     from sentence_transformers import SentenceTransformer
 except ImportError:  # pragma: no cover - optional dependency
     SentenceTransformer = None
-from .base import EmbeddingModel
+from .base import EMBED_BATCH_SIZE, EmbeddingModel
+from .cache import EMBEDDING_CACHE_PATH, CachedEmbeddingModel, EmbeddingCache
 try:
     import numpy as np
 except ImportError:  # pragma: no cover - optional dependency
@@ -12,9 +15,48 @@ except ImportError:  # pragma: no cover - optional dependency
 # Choose embedding model: MiniLM (fast) or BioBERT (domain-specific)
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 # For BioBERT, one could use a HuggingFace model like "pritamdeka/BioBERT-mnli-snli" or similar if available
+EMBEDDING_DIMENSION = 384
 
 _model = None
 
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _text_seed(text: str) -> int:
+    """Stable 64-bit seed for ``text`` (``hash()`` is salted per process)."""
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _fallback_embeddings(texts: list, dimension: int = EMBEDDING_DIMENSION) -> list:
+    """Deterministic pseudo-random vectors in ``[0, 1)`` derived from each text.
+
+    Uses a SplitMix64 counter hash so the whole batch is generated with a
+    handful of array operations instead of one RNG per text.
+    """
+    if np is not None:
+        seeds = np.array([_text_seed(t) for t in texts], dtype=np.uint64)
+        steps = np.arange(1, dimension + 1, dtype=np.uint64) * np.uint64(_GOLDEN)
+        z = seeds[:, None] + steps[None, :]
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        return ((z >> np.uint64(11)).astype(np.float64) / float(1 << 53)).tolist()
+
+    vectors = []
+    for text in texts:
+        seed = _text_seed(text)
+        vec = []
+        for i in range(1, dimension + 1):
+            z = (seed + i * _GOLDEN) & _MASK64
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+            z = z ^ (z >> 31)
+            vec.append((z >> 11) / float(1 << 53))
+        vectors.append(vec)
+    return vectors
+
 
 class SentenceTransformerEmbedder(EmbeddingModel):
     """Pluggable embedder based on SentenceTransformer."""
@@ -35,21 +77,40 @@ class SentenceTransformerEmbedder(EmbeddingModel):
                 self._model = None
         return self._model
 
+    @property
+    def cacheable(self) -> bool:
+        """Only real model outputs are worth caching, not fallback vectors."""
+        return self._model is not None
+
     def embed(self, text: str):
+        return self.embed_texts([text], batch_size=1)[0]
+
+    def embed_texts(self, texts: list, batch_size: int = EMBED_BATCH_SIZE) -> list:
+        texts = list(texts)
+        if not texts:
+            return []
         model = self._get_model()
         if model is None:
-            # Deterministic random vector based on text hash
-            if np is not None:
-                rng = np.random.RandomState(abs(hash(text)) % (2**32))
-                return rng.rand(384).tolist()
-            import random
-            random.seed(abs(hash(text)) % (2**32))
-            return [random.random() for _ in range(384)]
-        return model.encode(text).tolist()
+            # Deterministic random vectors based on a stable text hash
+            return _fallback_embeddings(texts)
+        return model.encode(texts, batch_size=batch_size).tolist()
 
-def embed_text(text: str):
-    """Generate a vector embedding for the given text."""
+
+def _get_default_embedder() -> EmbeddingModel:
     global _model
     if _model is None:
-        _model = SentenceTransformerEmbedder()
-    return _model.embed(text)
+        _model = CachedEmbeddingModel(
+            SentenceTransformerEmbedder(),
+            EmbeddingCache(path=EMBEDDING_CACHE_PATH or None),
+        )
+    return _model
+
+
+def embed_text(text: str):
+    """Generate a vector embedding for the given text."""
+    return _get_default_embedder().embed(text)
+
+
+def embed_texts(texts: list, batch_size: int = EMBED_BATCH_SIZE) -> list:
+    """Generate embeddings for many texts, encoding ``batch_size`` per pass."""
+    return _get_default_embedder().embed_texts(texts, batch_size=batch_size)
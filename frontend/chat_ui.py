@@ -1,6 +1,6 @@
 import streamlit as st
 from chat_engine.chat_engine import ChatEngine
-from chat_engine.modules.retriever import default_retriever
+from chat_engine.modules.retriever import get_retriever
 from chat_engine.modules.prompt_assembler import default_prompt_assembler
 from embedding.embedder import embed_text
 from language_model.language_model import generate_answer
@@ -13,7 +13,7 @@ st.set_page_config(page_title="RAG_HEITAA Chat", page_icon="🩺")
 if "engine" not in st.session_state:
     init_collection()
     st.session_state.engine = ChatEngine(
-        retriever=default_retriever,
+        retriever=get_retriever(),
         embedder=embed_text,
         llm=generate_answer,
         prompt_assembler=default_prompt_assembler,
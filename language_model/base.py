@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 class LanguageModel(ABC):
@@ -7,3 +8,19 @@ class LanguageModel(ABC):
     def generate(self, messages: list) -> str:
         """Return a model-generated answer for the given messages."""
         pass
+
+    async def agenerate(self, messages: list) -> str:
+        """Async variant of :meth:`generate`.
+
+        The default runs :meth:`generate` in a worker thread; models with a
+        native async client override it.
+        """
+        return await asyncio.to_thread(self.generate, messages)
+
+    def generate_stream(self, messages: list):
+        """Yield the answer in chunks as the model produces it.
+
+        The default yields the whole :meth:`generate` result at once; models
+        that support incremental output override it.
+        """
+        yield self.generate(messages)
@@ -0,0 +1,279 @@
+"""Response cache placed in front of a :class:`LanguageModel`.
+
+Answers are keyed by the model name and a normalized copy of the message list
+(roles lower-cased, whitespace collapsed), so the same prompt built from the
+same retrieved context is only sent to the API once.  An optional semantic
+mode also reuses an answer when the new question's embedding is within
+``semantic_threshold`` cosine similarity of a cached question *and* every
+other message (system prompt, retrieved knowledge, history) is identical.
+
+Entries expire after ``ttl`` seconds, the least recently used entry is evicted
+past ``max_items`` and :func:`invalidate_on_ingest` clears a cache whenever
+documents are ingested in the same process.  Ingestion by another process (the
+Celery worker or ``main.py``) is caught through ``version``: its value, such as
+the modification time of the shared BM25 index, is part of every key.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+
+from cybersecurity.integrity import generate_hash
+from utils.metrics import LLM_CACHE_REQUESTS
+from .base import LanguageModel
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1000"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+# Cosine similarity above which a cached answer is reused; unset disables semantic lookup
+LLM_CACHE_SEMANTIC_THRESHOLD = (
+    float(os.environ["LLM_CACHE_SEMANTIC_THRESHOLD"]) if os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD") else None
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_messages(messages: list) -> list:
+    """Return ``messages`` with lower-cased roles and collapsed whitespace."""
+    return [
+        {
+            "role": str(m.get("role", "")).strip().lower(),
+            "content": _WHITESPACE_RE.sub(" ", str(m.get("content", ""))).strip(),
+        }
+        for m in messages
+    ]
+
+
+def _digest(model_name: str, messages: list) -> str:
+    data = json.dumps([model_name, messages], ensure_ascii=False, separators=(",", ":"))
+    return generate_hash(data.encode("utf-8"))
+
+
+def _split_query(messages: list):
+    """Split normalized messages into ``(context, last user question)``."""
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i]["role"] == "user":
+            return messages[:i] + messages[i + 1:], messages[i]["content"]
+    return messages, ""
+
+
+def _cosine(a, b) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class _Entry:
+    __slots__ = ("answer", "expires", "context_key", "embedding")
+
+    def __init__(self, answer, expires, context_key=None, embedding=None):
+        self.answer = answer
+        self.expires = expires
+        self.context_key = context_key
+        self.embedding = embedding
+
+
+class ResponseCache:
+    """TTL + LRU cache of model answers with optional semantic lookup.
+
+    ``embedder`` turns a question into a vector and is only used when
+    ``semantic_threshold`` is set; it defaults to
+    :func:`embedding.embedder.embed_text`, imported on first use.
+    ``version`` is called on every lookup and its result is mixed into the
+    keys, so entries cached before it changed are no longer found (they age
+    out through the LRU and TTL).
+    """
+
+    def __init__(
+        self,
+        max_items: int = LLM_CACHE_SIZE,
+        ttl: float | None = LLM_CACHE_TTL,
+        semantic_threshold: float | None = None,
+        embedder=None,
+        clock=time.monotonic,
+        version=None,
+    ):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.semantic_threshold = semantic_threshold
+        self._embedder = embedder
+        self._clock = clock
+        self.version = version
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._by_context: dict = {}  # context key -> {exact key: None}
+        self._lock = threading.Lock()
+
+    @property
+    def hits(self) -> int:
+        return self.exact_hits + self.semantic_hits
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "items": len(self._entries),
+        }
+
+    def embed(self, text: str):
+        if self._embedder is None:
+            from embedding.embedder import embed_text
+
+            self._embedder = embed_text
+        return self._embedder(text)
+
+    def keys(self, model_name: str, messages: list):
+        """Return ``(exact key, context key, question)`` for a message list."""
+        normalized = normalize_messages(messages)
+        context, question = _split_query(normalized)
+        if self.version is not None:
+            model_name = f"{model_name}@{self.version()}"
+        return _digest(model_name, normalized), _digest(model_name, context), question
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        group = self._by_context.get(entry.context_key)
+        if group is not None:
+            group.pop(key, None)
+            if not group:
+                del self._by_context[entry.context_key]
+
+    def _live(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires is not None and entry.expires <= now:
+            self._drop(key)
+            return None
+        return entry
+
+    def _record(self, result: str) -> None:
+        if LLM_CACHE_REQUESTS:
+            LLM_CACHE_REQUESTS.labels(result=result).inc()
+
+    def get(self, model_name: str, messages: list, embedding=None):
+        """Return a cached answer or ``None``.
+
+        ``embedding`` may carry the question's vector when the caller already
+        computed it, so semantic lookup does not embed the text again.
+        """
+        key, context_key, question = self.keys(model_name, messages)
+        now = self._clock()
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.exact_hits += 1
+                self._record("exact")
+                return entry.answer
+            candidates = list(self._by_context.get(context_key, ()))
+        if self.semantic_threshold is not None and candidates and question:
+            if embedding is None:
+                embedding = self.embed(question)
+            with self._lock:
+                best_key, best = None, self.semantic_threshold
+                for candidate in candidates:
+                    entry = self._live(candidate, now)
+                    if entry is None or entry.embedding is None:
+                        continue
+                    similarity = _cosine(embedding, entry.embedding)
+                    if similarity >= best:
+                        best_key, best = candidate, similarity
+                if best_key is not None:
+                    self._entries.move_to_end(best_key)
+                    self.semantic_hits += 1
+                    self._record("semantic")
+                    return self._entries[best_key].answer
+        with self._lock:
+            self.misses += 1
+        self._record("miss")
+        return None
+
+    def put(self, model_name: str, messages: list, answer: str, embedding=None) -> None:
+        key, context_key, question = self.keys(model_name, messages)
+        if self.semantic_threshold is not None and embedding is None and question:
+            embedding = self.embed(question)
+        if embedding is not None:
+            embedding = [float(x) for x in embedding]
+        expires = self._clock() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(answer, expires, context_key, embedding)
+            if self.semantic_threshold is not None:
+                self._by_context.setdefault(context_key, {})[key] = None
+            while len(self._entries) > self.max_items:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_context.clear()
+
+
+def _model_name(model) -> str:
+    """Return the API model name, looking through wrapper models."""
+    name = getattr(model, "model", None)
+    while isinstance(name, LanguageModel):
+        name = getattr(name, "model", None)
+    return name if isinstance(name, str) else type(model).__name__
+
+
+class CachedLanguageModel(LanguageModel):
+    """Wrap ``model`` so identical (or, optionally, similar) prompts hit ``cache``."""
+
+    def __init__(self, model: LanguageModel, cache: ResponseCache):
+        self.model = model
+        self.cache = cache
+        self.model_name = _model_name(model)
+
+    def generate(self, messages: list) -> str:
+        answer = self.cache.get(self.model_name, messages)
+        if answer is None:
+            answer = self.model.generate(messages)
+            self.cache.put(self.model_name, messages, answer)
+        return answer
+
+    async def agenerate(self, messages: list) -> str:
+        answer = self.cache.get(self.model_name, messages)
+        if answer is None:
+            answer = await self.model.agenerate(messages)
+            self.cache.put(self.model_name, messages, answer)
+        return answer
+
+    def generate_stream(self, messages: list):
+        answer = self.cache.get(self.model_name, messages)
+        if answer is not None:
+            yield answer
+            return
+        chunks = []
+        for chunk in self.model.generate_stream(messages):
+            chunks.append(chunk)
+            yield chunk
+        # Only completed streams are cached
+        self.cache.put(self.model_name, messages, "".join(chunks).strip())
+
+
+def invalidate_on_ingest(cache: ResponseCache, bus=None) -> None:
+    """Clear ``cache`` whenever a ``document_ingested`` event is emitted."""
+    if bus is None:
+        from utils.event_bus import event_bus as bus
+
+    def _clear(event_name, **data):
+        if len(cache):
+            logger.debug("Clearing LLM response cache after %s", event_name)
+        cache.clear()
+
+    bus.subscribe("document_ingested", _clear)
@@ -1,6 +1,12 @@
 # language_model/lm.py
+import asyncio
+import json
 import os
 import logging
+import random
+import threading
+import time
+import weakref
 try:
     from dotenv import load_dotenv
 except ImportError:  # pragma: no cover - optional dependency
@@ -10,7 +16,20 @@ try:
     import requests
 except ImportError:  # pragma: no cover - optional dependency
     requests = None
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 from .base import LanguageModel
+from .cache import (
+    LLM_CACHE_SEMANTIC_THRESHOLD,
+    LLM_CACHE_SIZE,
+    CachedLanguageModel,
+    ResponseCache,
+    invalidate_on_ingest,
+)
+from .tokens import LLM_MAX_TOKENS, LLM_MODEL
 
 logger = logging.getLogger(__name__)
 
@@ -52,39 +71,223 @@ else:
         "GROQ_API_KEY not found. Falling back to local echo language model."
     )
 
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+# Keep-alive connections held open to the API per process
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+# Seconds an idle pooled connection is kept before being closed (async client)
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "10"))
+# Retries with jittered exponential backoff, only for these HTTP statuses
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.25"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "2"))
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# Failure rate that opens the breaker and seconds before it probes again
+LLM_BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+LLM_BREAKER_RESET_TIMEOUT = float(os.getenv("LLM_BREAKER_RESET_TIMEOUT", "30"))
+
+
+def _create_session(pool_size: int = LLM_POOL_SIZE):
+    """Return a ``requests.Session`` keeping up to ``pool_size`` connections alive."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def _create_async_client(pool_size: int = LLM_POOL_SIZE, timeout: float = LLM_TIMEOUT):
+    """Return an ``httpx.AsyncClient`` with a bounded keep-alive pool."""
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+async def _close_at_loop_shutdown(client):
+    """Async generator parked at ``yield``; the loop closes it on shutdown.
+
+    ``asyncio.run`` (and ``loop.shutdown_asyncgens``) finalizes every async
+    generator of the loop, which runs the ``finally`` and closes ``client``.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def _start(agen) -> None:
+    try:
+        await agen.__anext__()
+    except StopAsyncIteration:  # closed by aclose() before it started
+        pass
+
 
 class GroqLanguageModel(LanguageModel):
-    """Language model wrapper around the Groq API."""
+    """Language model wrapper around the Groq API.
 
-    def __init__(self, model: str = "llama3-8b-8192", max_tokens: int = 200):
+    Requests go through one long-lived pooled ``requests.Session`` so repeated
+    calls reuse TCP/TLS connections; ``agenerate`` does the same with an
+    ``httpx.AsyncClient`` per event loop.  Both are created on first use and
+    recreated in forked children so processes never share sockets.  Async
+    clients are closed when their loop shuts down; one passed in as
+    ``async_client`` belongs to the caller.
+    """
+
+    def __init__(
+        self,
+        model: str = LLM_MODEL,
+        max_tokens: int = LLM_MAX_TOKENS,
+        session=None,
+        async_client=None,
+        pool_size: int = LLM_POOL_SIZE,
+        timeout: float = LLM_TIMEOUT,
+        max_retries: int = LLM_MAX_RETRIES,
+    ):
         self.model = model
         self.max_tokens = max_tokens
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._session = session
+        self._session_pid = os.getpid() if session is not None else None
+        self._async_client = async_client
+        self._async_clients = weakref.WeakKeyDictionary()  # loop -> (client, shutdown closer)
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """Pooled ``requests.Session``, created on first use."""
+        if self._session is None or self._session_pid != os.getpid():
+            if requests is None:
+                raise RuntimeError("requests package is required for Groq API calls")
+            with self._lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    self._session = _create_session(self.pool_size)
+                    self._session_pid = os.getpid()
+        return self._session
+
+    @property
+    def async_client(self):
+        """Pooled ``httpx.AsyncClient`` bound to the running event loop."""
+        if self._async_client is not None:
+            return self._async_client
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            if httpx is None:
+                raise RuntimeError("httpx package is required for async Groq API calls")
+            # httpx connections belong to the loop that opened them
+            client = _create_async_client(self.pool_size, self.timeout)
+            closer = _close_at_loop_shutdown(client)
+            loop.create_task(_start(closer))
+            # Keep the generator alive: the loop only tracks it weakly
+            entry = self._async_clients[loop] = (client, closer)
+        return entry[0]
+
+    def _headers(self) -> dict:
+        return {
+            "Authorization": f"Bearer {GROQ_API_KEY}",
+            "Content-Type": "application/json",
+        }
+
+    def _body(self, messages: list) -> dict:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": self.max_tokens,
+            "temperature": 0.2,
+        }
+
+    @staticmethod
+    def _answer(result: dict) -> str:
+        return result["choices"][0]["message"]["content"].strip()
+
+    @staticmethod
+    def _retry_delay(attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * 2 ** attempt))
+
+    def _post(self, body: dict, stream: bool = False):
+        """POST ``body``, retrying only on :data:`RETRYABLE_STATUS_CODES`."""
+        for attempt in range(self.max_retries + 1):
+            kwargs = {"stream": True} if stream else {}
+            response = self.session.post(
+                GROQ_API_URL, headers=self._headers(), json=body, timeout=self.timeout, **kwargs
+            )
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                break
+            response.close()
+            delay = self._retry_delay(attempt)
+            logger.warning("Groq API returned %s, retrying in %.2fs", response.status_code, delay)
+            time.sleep(delay)
+        response.raise_for_status()
+        return response
 
     def generate(self, messages: list) -> str:
-        if requests is None:
-            raise RuntimeError("requests package is required for Groq API calls")
         try:
-            url = "https://api.groq.com/openai/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {GROQ_API_KEY}",
-                "Content-Type": "application/json",
-            }
-            body = {
-                "model": self.model,
-                "messages": messages,
-                "max_tokens": self.max_tokens,
-                "temperature": 0.2,
-            }
-
-            response = requests.post(url, headers=headers, json=body, timeout=10)
+            return self._answer(self._post(self._body(messages)).json())
+        except Exception as e:
+            logger.error("Groq API call failed: %s", e)
+            raise
+
+    def generate_stream(self, messages: list):
+        """Yield answer chunks from Groq's server-sent event stream."""
+        body = dict(self._body(messages), stream=True)
+        try:
+            with self._post(body, stream=True) as response:
+                started = False
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if not started and delta:
+                        delta = delta.lstrip()
+                    if delta:
+                        started = True
+                        yield delta
+        except Exception as e:
+            logger.error("Groq API call failed: %s", e)
+            raise
+
+    async def agenerate(self, messages: list) -> str:
+        try:
+            for attempt in range(self.max_retries + 1):
+                response = await self.async_client.post(
+                    GROQ_API_URL, headers=self._headers(), json=self._body(messages)
+                )
+                if response.status_code not in RETRYABLE_STATUS_CODES or attempt == self.max_retries:
+                    break
+                await asyncio.sleep(self._retry_delay(attempt))
             response.raise_for_status()
-            result = response.json()
-            answer = result["choices"][0]["message"]["content"]
-            return answer.strip()
+            return self._answer(response.json())
         except Exception as e:
             logger.error("Groq API call failed: %s", e)
             raise
 
+    def close(self) -> None:
+        """Close the pooled sync session."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self) -> None:
+        """Close the async client of the running loop (or the one passed in)."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        entry = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            client, closer = entry
+            await client.aclose()
+            await closer.aclose()
+
 
 class EchoLanguageModel(LanguageModel):
     """Very simple offline language model that echoes the last user message."""
@@ -97,12 +300,75 @@ class EchoLanguageModel(LanguageModel):
         )
 
 
+class CircuitBreakerLanguageModel(LanguageModel):
+    """Route calls to ``model`` through a :class:`CircuitBreaker`.
+
+    While the breaker is open every call raises :class:`CircuitOpenError`
+    immediately, so callers fall back without waiting for a timeout.
+    """
+
+    def __init__(self, model: LanguageModel, breaker: CircuitBreaker):
+        self.model = model
+        self.breaker = breaker
+
+    def generate(self, messages: list) -> str:
+        return self.breaker.call(self.model.generate, messages)
+
+    async def agenerate(self, messages: list) -> str:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker '{self.breaker.name}' is open")
+        try:
+            answer = await self.model.agenerate(messages)
+        except BaseException as exc:
+            self.breaker.record_error(exc)
+            raise
+        self.breaker.record_success()
+        return answer
+
+    def generate_stream(self, messages: list):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker '{self.breaker.name}' is open")
+        try:
+            yield from self.model.generate_stream(messages)
+        except GeneratorExit:
+            # The consumer stopped early while the service was answering
+            self.breaker.record_success()
+            raise
+        except BaseException as exc:
+            self.breaker.record_error(exc)
+            raise
+        self.breaker.record_success()
+
+_response_cache: ResponseCache | None = None
+
 if GROQ_API_KEY:
-    _default_lm = GroqLanguageModel()
+    _default_lm = CircuitBreakerLanguageModel(
+        GroqLanguageModel(),
+        CircuitBreaker(
+            "groq",
+            failure_threshold=LLM_BREAKER_FAILURE_RATE,
+            reset_timeout=LLM_BREAKER_RESET_TIMEOUT,
+        ),
+    )
+    if LLM_CACHE_SIZE > 0:
+        _response_cache = ResponseCache(semantic_threshold=LLM_CACHE_SEMANTIC_THRESHOLD)
+        invalidate_on_ingest(_response_cache)
+        _default_lm = CachedLanguageModel(_default_lm, _response_cache)
 else:
     _default_lm = EchoLanguageModel()
 
 
+def set_corpus_version(version) -> None:
+    """Key the default response cache by ``version()`` from now on.
+
+    Applications that share a corpus with an ingestion process pass e.g.
+    :func:`vector_store.bm25.corpus_version`, so answers cached before
+    another process ingested documents stop matching.
+    """
+    if _response_cache is not None:
+        _response_cache.version = version
+
+
 def generate_answer(messages: list) -> str:
     """Compatibility helper that delegates to the default language model."""
     try:
@@ -111,3 +377,30 @@ def generate_answer(messages: list) -> str:
         logger.warning("Falling back to echo model due to API failure")
         echo_lm = EchoLanguageModel()
         return echo_lm.generate(messages)
+
+
+def generate_answer_stream(messages: list):
+    """Streaming counterpart of :func:`generate_answer`.
+
+    Falls back to the echo model only if the default model fails before
+    producing any output; a failure mid-stream is re-raised.
+    """
+    started = False
+    try:
+        for chunk in _default_lm.generate_stream(messages):
+            started = True
+            yield chunk
+    except Exception:
+        if started:
+            raise
+        logger.warning("Falling back to echo model due to API failure")
+        yield from EchoLanguageModel().generate_stream(messages)
+
+
+async def agenerate_answer(messages: list) -> str:
+    """Async counterpart of :func:`generate_answer`."""
+    try:
+        return await _default_lm.agenerate(messages)
+    except Exception:
+        logger.warning("Falling back to echo model due to API failure")
+        return EchoLanguageModel().generate(messages)
@@ -0,0 +1,74 @@
+"""
+tokens.py - Token counting and per-model prompt budgets
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Context windows of the models we call; unknown models use DEFAULT_CONTEXT_WINDOW
+MODEL_CONTEXT_WINDOWS = {
+    "llama3-8b-8192": 8192,
+    "llama3-70b-8192": 8192,
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "mixtral-8x7b-32768": 32768,
+    "gemma2-9b-it": 8192,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+LLM_MODEL = os.getenv("LLM_MODEL", "llama3-8b-8192")
+# Tokens reserved for the model's answer (also sent as ``max_tokens``)
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "200"))
+# Upper bound on prompt tokens, well below the window to keep latency and cost down
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "3000"))
+
+# Approximate framing cost of one chat message (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+TIKTOKEN_ENCODING = "cl100k_base"
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """Return the tiktoken encoding, or ``None`` when it is unavailable."""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        except Exception as exc:  # missing package or BPE file download failed
+            logger.warning("tiktoken unavailable (%s); estimating tokens from text length", exc)
+            _encoding = None
+        _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens in ``text`` (about four characters per token without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` down to at most ``max_tokens`` tokens."""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    return text[: max_tokens * 4]
+
+
+def prompt_budget(model: str = LLM_MODEL, max_tokens: int = LLM_MAX_TOKENS) -> int:
+    """Prompt tokens allowed for ``model`` after reserving ``max_tokens`` for the answer."""
+    window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    return max(0, min(PROMPT_TOKEN_BUDGET, window - max_tokens))
@@ -1,26 +1,66 @@
+import os
+
 from chat_engine.chat_engine import ChatEngine
-from chat_engine.modules.retriever import default_retriever
+from chat_engine.modules.retriever import get_retriever
 from chat_engine.modules.prompt_assembler import default_prompt_assembler
-from embedding.embedder import embed_text
+from embedding.embedder import EMBEDDING_MODEL, embed_text, embed_texts
+from cybersecurity.integrity import generate_hash
 from language_model.language_model import generate_answer
 from vector_store.base import init_collection  # ✅ Make sure this is imported!
 from parsers.text_parser import parse_txt_folder  # ✅ Import parser
-from vector_store.base import index_document
+from vector_store.base import index_documents, load_snapshot, save_snapshot
+from vector_store.bm25 import (
+    SNAPSHOT_BM25,
+    BM25Index,
+    get_default_lexical_index,
+    index_texts,
+    set_default_lexical_index,
+)
 from uuid import uuid4
 
+INPUT_DIR = "input_data/"  # Customize folder path if needed
+# Where the local vector store is snapshotted between runs; empty disables it
+VECTOR_SNAPSHOT_DIR = os.getenv("VECTOR_SNAPSHOT_DIR", "vector_snapshot")
+
+
+def _corpus_fingerprint(folder_path: str) -> dict:
+    """Identify the indexed corpus so stale snapshots are not reused."""
+    parts = []
+    for filename in sorted(os.listdir(folder_path)):
+        if filename.endswith(".txt"):
+            with open(os.path.join(folder_path, filename), "rb") as f:
+                parts.append(f"{filename}:{generate_hash(f.read())}")
+    return {
+        "model": EMBEDDING_MODEL,
+        "corpus": generate_hash("\n".join(parts).encode()),
+    }
+
 
 def ingest_input_data():
-    """Initialize collection and index documents from the input folder."""
+    """Initialize collection and index documents from the input folder.
+
+    When the local vector store is in use and a snapshot of the same corpus
+    exists, it is memory-mapped instead of re-embedding every document.
+    """
     init_collection()
+    fingerprint = _corpus_fingerprint(INPUT_DIR)
+    if VECTOR_SNAPSHOT_DIR and load_snapshot(VECTOR_SNAPSHOT_DIR, expected_metadata=fingerprint):
+        if os.path.exists(os.path.join(VECTOR_SNAPSHOT_DIR, SNAPSHOT_BM25)):
+            set_default_lexical_index(BM25Index.load(VECTOR_SNAPSHOT_DIR))
+        print(f"⚡ Loaded vector snapshot from '{VECTOR_SNAPSHOT_DIR}'")
+        return
+
     print("📚 Parsing and indexing text documents from 'input_data/'...")
-    docs = parse_txt_folder("input_data/")  # Customize folder path if needed
-    for doc in docs:
-        vector = embed_text(doc["text"])
-        index_document(
-            doc_id=str(uuid4()),
-            vector=vector,
-            payload={"text": doc["text"], "source": doc["source"]},
-        )
+    docs = parse_txt_folder(INPUT_DIR)
+    ids = [str(uuid4()) for _ in docs]
+    payloads = [{"text": doc["text"], "source": doc["source"]} for doc in docs]
+    vectors = embed_texts([doc["text"] for doc in docs])
+    index_documents(zip(ids, vectors, payloads))
+    # Rebuild the lexical index for this corpus from scratch, saved with the snapshot below
+    set_default_lexical_index(BM25Index(keep_text=False))
+    index_texts(zip(ids, (doc["text"] for doc in docs), payloads), path=None)
+    if VECTOR_SNAPSHOT_DIR and save_snapshot(VECTOR_SNAPSHOT_DIR, metadata=fingerprint):
+        get_default_lexical_index().save(VECTOR_SNAPSHOT_DIR)
 # main.py - Entry point for the RAG_HEITAA Health Assistant
 
 
@@ -28,7 +68,7 @@ def ingest_input_data():
 if __name__ == "__main__":
     ingest_input_data()
     engine = ChatEngine(
-        retriever=default_retriever,
+        retriever=get_retriever(),
         embedder=embed_text,
         llm=generate_answer,
         prompt_assembler=default_prompt_assembler
@@ -1,23 +1,18 @@
 # question_answering/rag_qa.py
-from embedding.embedder import embed_text
-from vector_store.base import query_vector
+from embedding.embedder import embed_text, embed_texts
+from vector_store.base import query_vector, query_vectors
 from language_model.language_model import generate_answer
 
-def answer_query(user_query: str) -> str:
-    """Retrieve relevant contexts for the query and get an answer from the language model."""
-    # 1. Embed the user query
-    query_vec = embed_text(user_query)
-    # 2. Retrieve top relevant documents from Qdrant
-    results = query_vector(query_vec, top_k=3)
-    # 3. Build context string from retrieved results
+
+def _build_messages(user_query: str, results) -> list:
+    """Build a chat-style message list from the query and retrieved results."""
     context_snippets = []
     for res in results:
         # Assuming payload contains the text of the claim
         if res.payload and "text" in res.payload:
             context_snippets.append(res.payload["text"])
     context_text = "\n\n".join(context_snippets)
-    # 4. Build a chat-style message list for the language model
-    messages = [
+    return [
         {
             "role": "system",
             "content": (
@@ -29,6 +24,31 @@ def answer_query(user_query: str) -> str:
         {"role": "user", "content": user_query},
     ]
 
-    # 5. Generate answer using the language model
+
+def answer_query(user_query: str) -> str:
+    """Retrieve relevant contexts for the query and get an answer from the language model."""
+    # 1. Embed the user query
+    query_vec = embed_text(user_query)
+    # 2. Retrieve top relevant documents from Qdrant
+    results = query_vector(query_vec, top_k=3)
+    # 3. Build a chat-style message list from the retrieved context
+    messages = _build_messages(user_query, results)
+    # 4. Generate answer using the language model
     answer = generate_answer(messages)
     return answer
+
+
+def answer_queries(user_queries: list) -> list:
+    """Answer several questions, embedding and retrieving them as one batch.
+
+    Returns the answers in the same order as ``user_queries``.
+    """
+    user_queries = list(user_queries)
+    if not user_queries:
+        return []
+    query_vecs = embed_texts(user_queries)
+    all_results = query_vectors(query_vecs, top_k=3)
+    return [
+        generate_answer(_build_messages(query, results))
+        for query, results in zip(user_queries, all_results)
+    ]
@@ -0,0 +1,59 @@
+import argparse
+import time
+
+import numpy as np
+
+from vector_store.base import InMemoryVectorStore
+from vector_store.quantized import QuantizedVectorStore
+
+
+def benchmark(n: int, dim: int, queries: int, top_k: int, rescore_multiplier: int, seed: int = 0):
+    """Compare int8 search with exact float32 search on clustered random data."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, n // 100), dim)).astype(np.float32)
+    data = centers[rng.integers(0, len(centers), n)] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    probes = data[rng.integers(0, n, queries)] + 0.1 * rng.standard_normal((queries, dim)).astype(np.float32)
+
+    exact = InMemoryVectorStore(dimension=dim)
+    quantized = QuantizedVectorStore(dimension=dim, rescore_multiplier=rescore_multiplier)
+    points = [(i, vec, {}) for i, vec in enumerate(data)]
+    exact.index_documents(points)
+    quantized.index_documents(points)
+
+    hits = 0
+    exact_time = quantized_time = 0.0
+    for probe in probes:
+        start = time.perf_counter()
+        truth = {r.id for r in exact.query_vector(probe, top_k=top_k)}
+        exact_time += time.perf_counter() - start
+        start = time.perf_counter()
+        found = {r.id for r in quantized.query_vector(probe, top_k=top_k)}
+        quantized_time += time.perf_counter() - start
+        hits += len(truth & found)
+
+    usage = quantized.memory_usage()
+    return {
+        f"recall@{top_k}": hits / (queries * top_k),
+        "float32_mb": usage["float32"] / 2**20,
+        "int8_mb": usage["int8_codes"] / 2**20,
+        "exact_ms_per_query": 1000 * exact_time / queries,
+        "int8_ms_per_query": 1000 * quantized_time / queries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure recall and memory of int8 quantized vector search")
+    parser.add_argument("--n", type=int, default=100_000, help="Number of stored vectors")
+    parser.add_argument("--dim", type=int, default=384, help="Vector dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rescore-multiplier", type=int, default=4)
+    args = parser.parse_args()
+    results = benchmark(args.n, args.dim, args.queries, args.top_k, args.rescore_multiplier)
+    for name, value in results.items():
+        print(f"{name:>20}: {value:.4f}")
+
+
+if __name__ == "__main__":
+    main()
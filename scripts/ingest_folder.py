@@ -1,8 +1,9 @@
 import argparse
 
-from embedding.embedder import embed_text
+from embedding.embedder import embed_texts
 from parsers.text_parser import parse_txt_folder
-from vector_store.base import init_collection, index_document
+from vector_store.base import init_collection, index_documents
+from vector_store.bm25 import index_texts
 from uuid import uuid4
 
 
@@ -10,10 +11,11 @@ def ingest_folder(folder_path: str):
     """Parse text files in ``folder_path`` and index them in the vector store."""
     init_collection()
     docs = parse_txt_folder(folder_path)
-    for doc in docs:
-        vector = embed_text(doc["text"])
-        index_document(doc_id=str(uuid4()), vector=vector,
-                       payload={"text": doc["text"], "source": doc["source"]})
+    ids = [str(uuid4()) for _ in docs]
+    payloads = [{"text": doc["text"], "source": doc["source"]} for doc in docs]
+    vectors = embed_texts([doc["text"] for doc in docs])
+    index_documents(zip(ids, vectors, payloads))
+    index_texts(zip(ids, (doc["text"] for doc in docs), payloads))
 
 
 def main():
@@ -1,11 +1,23 @@
 # text_cleaning/deid.py
+import os
+from typing import Iterable, Iterator
+
 from utils.logger import log
 
+# Only NER is needed for redaction; tok2vec stays in case NER listens to it
+NER_PIPES = ("tok2vec", "ner")
+# Texts per nlp.pipe batch and worker processes for deidentify_texts
+DEID_BATCH_SIZE = int(os.getenv("DEID_BATCH_SIZE", "64"))
+DEID_N_PROCESS = int(os.getenv("DEID_N_PROCESS", "1"))
+
 try:
     import spacy
     try:
         # Load spaCy model for NER (using a general English model; could use a clinical NER model if available)
         nlp = spacy.load("en_core_web_sm")
+        # Skip the parser, lemmatizer, tagger etc. on every call
+        nlp.select_pipes(enable=[name for name in NER_PIPES if name in nlp.pipe_names])
+        log(f"deidentifier loaded with pipes: {', '.join(nlp.pipe_names)}")
     except OSError:  # model not found
         log("Warning: spaCy model 'en_core_web_sm' not found. PHI will not be removed.")
         nlp = None
@@ -16,21 +28,38 @@ except ModuleNotFoundError:  # spaCy not installed at all
 # Define which entity labels to redact (PHI categories)
 PHI_LABELS = {"PERSON", "ORG", "GPE", "LOC", "FAC", "DATE"}  # Names, Orgs, Geographical, Facilities, Dates, etc.
 
-def deidentify_text(text: str) -> str:
-    """Remove or mask PHI entities from the input text."""
-    if nlp is None:
-        # spaCy unavailable, just return original text
-        log("deidentifier unavailable - returning input text")
-        return text
 
-    doc = nlp(text)
+def _redact(text: str, doc) -> str:
     cleaned_text = text
-    # Optional feedback via logging
-    log("deidentifier loaded")
-
     for ent in doc.ents:
         if ent.label_ in PHI_LABELS:
             # Replace the entity text with a generic tag to indicate removal
             placeholder = f"[{ent.label_}]"
             cleaned_text = cleaned_text.replace(ent.text, placeholder)
     return cleaned_text
+
+
+def deidentify_text(text: str) -> str:
+    """Remove or mask PHI entities from the input text."""
+    if nlp is None:
+        # spaCy unavailable, just return original text (already warned at import)
+        return text
+    return _redact(text, nlp(text))
+
+
+def deidentify_texts(
+    texts: Iterable[str],
+    batch_size: int = DEID_BATCH_SIZE,
+    n_process: int = DEID_N_PROCESS,
+) -> Iterator[str]:
+    """De-identify many texts with ``nlp.pipe``, yielding results in input order.
+
+    ``n_process`` > 1 spreads the batches over worker processes.
+    """
+    if nlp is None:
+        yield from texts
+        return
+
+    # Keep the originals alongside their docs for the string replacement
+    for doc, text in nlp.pipe(((t, t) for t in texts), as_tuples=True, batch_size=batch_size, n_process=n_process):
+        yield _redact(text, doc)
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from storage import audit_log  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def audit_log_in_tmp_path(tmp_path, monkeypatch):
+    """Keep audit entries written by tests out of the working tree."""
+    monkeypatch.setattr(audit_log, "AUDIT_LOG", str(tmp_path / "audit.log"))
@@ -0,0 +1,106 @@
+import os
+import sys
+import threading
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from agents.base import Agent  # noqa: E402
+from core.registry import AgentRegistry  # noqa: E402
+
+
+class CountingAgent(Agent):
+    built = 0
+
+    def __init__(self):
+        CountingAgent.built += 1
+
+    def act(self, message: str, context: dict):
+        return message + "c", context
+
+
+class BrokenAgent(Agent):
+    def __init__(self):
+        raise RuntimeError("missing dependency")
+
+    def act(self, message: str, context: dict):  # pragma: no cover - never constructed
+        return message, context
+
+
+def test_names_do_not_construct():
+    CountingAgent.built = 0
+    registry = AgentRegistry({"Counting": CountingAgent})
+    assert list(registry) == ["Counting"]
+    assert "Counting" in registry and len(registry) == 1
+    assert CountingAgent.built == 0
+    assert not registry.is_loaded("Counting")
+
+
+def test_first_lookup_constructs_once_and_times_it():
+    CountingAgent.built = 0
+    registry = AgentRegistry({"Counting": CountingAgent})
+    agent = registry["Counting"]
+    assert registry.get("Counting") is agent
+    assert CountingAgent.built == 1
+    assert registry.loaded() == ["Counting"]
+    assert registry.construction_times["Counting"] >= 0
+
+
+def test_concurrent_lookups_share_one_instance():
+    CountingAgent.built = 0
+    registry = AgentRegistry({"Counting": CountingAgent})
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(registry["Counting"])) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert CountingAgent.built == 1
+    assert len({id(a) for a in seen}) == 1
+
+
+def test_failed_construction_removes_agent():
+    registry = AgentRegistry({"Broken": BrokenAgent, "Counting": CountingAgent})
+    assert registry.get("Broken") is None
+    assert list(registry) == ["Counting"]
+
+
+def test_background_warm_up():
+    CountingAgent.built = 0
+    registry = AgentRegistry({"Counting": CountingAgent, "Broken": BrokenAgent})
+    registry.warm_up().join()
+    assert registry.loaded() == ["Counting"]
+    assert "Broken" not in registry
+
+
+def test_supervisor_only_builds_routed_agents(monkeypatch):
+    import core.supervisor as sup_mod
+
+    CountingAgent.built = 0
+    registry = AgentRegistry({"Counting": CountingAgent, "Broken": BrokenAgent})
+    responses = iter(["Counting", "FINISH"])
+    monkeypatch.setattr(sup_mod, "generate_answer", lambda messages: next(responses))
+    sup = sup_mod.LLMSupervisor(registry, routers=[])
+    assert sup.run("x") == "xc"
+    assert registry.loaded() == ["Counting"]
+    assert "Broken" in registry
+
+
+def test_agents_failing_to_build_leave_prompt_and_options(monkeypatch):
+    import core.supervisor as sup_mod
+
+    registry = AgentRegistry({"Broken": BrokenAgent, "Counting": CountingAgent})
+    prompts = []
+    responses = iter(["Broken", "Counting", "FINISH"])
+
+    def fake(messages):
+        prompts.append(messages[0]["content"] + messages[-1]["content"])
+        return next(responses)
+
+    monkeypatch.setattr(sup_mod, "generate_answer", fake)
+    sup = sup_mod.LLMSupervisor(registry, routers=[])
+    assert sup.run("x") == "xc"  # the failed pick is routed again, not the end of the run
+    assert "Broken" in prompts[0]
+    assert all("Broken" not in prompt for prompt in prompts[1:])
+    assert "Broken" not in sup.system_prompt
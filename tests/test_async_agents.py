@@ -0,0 +1,92 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from agents.base import Agent  # noqa: E402
+from core.multi_agent import MultiAgentCoordinator  # noqa: E402
+from core.workflow import Workflow  # noqa: E402
+
+
+class AgentA(Agent):
+    def act(self, message: str, context: dict):
+        context.setdefault("order", []).append("A")
+        return message + "a", context
+
+
+class AgentB(Agent):
+    def act(self, message: str, context: dict):
+        context.setdefault("order", []).append("B")
+        return message + "b", context
+
+
+class WaitingAgent(Agent):
+    """Native async agent that only finishes once its partner has started."""
+
+    def __init__(self, key, started, partner):
+        self.key = key
+        self.reads = frozenset()
+        self.writes = frozenset({key})
+        self.started = started
+        self.partner = partner
+
+    def act(self, message, context):  # pragma: no cover - only the async path is used
+        raise AssertionError("act_async should be used")
+
+    async def act_async(self, message, context):
+        self.started[self.key].set()
+        await asyncio.wait_for(self.started[self.partner].wait(), timeout=2)
+        context[self.key] = message
+        return message, context
+
+
+def test_default_act_async_runs_act():
+    msg, ctx = asyncio.run(AgentA().act_async("x", {}))
+    assert msg == "xa"
+    assert ctx["order"] == ["A"]
+
+
+def test_coordinator_run_async_keeps_order():
+    coord = MultiAgentCoordinator([AgentA(), AgentB()])
+    assert asyncio.run(coord.run_async("x")) == "xab"
+    assert coord.context["order"] == ["A", "B"]
+
+
+def test_supervisor_run_async_awaits_routing(monkeypatch):
+    import core.supervisor as sup_mod
+
+    responses = iter(["AgentA", "AgentB", "FINISH"])
+
+    async def fake_agenerate_answer(messages):
+        return next(responses)
+
+    monkeypatch.setattr(sup_mod, "agenerate_answer", fake_agenerate_answer)
+    sup = sup_mod.LLMSupervisor({"AgentA": AgentA(), "AgentB": AgentB()}, routers=[])
+    assert asyncio.run(sup.run_async("x")) == "xab"
+    assert sup.context["order"] == ["A", "B"]
+
+
+def test_workflow_run_async_overlaps_independent_agents():
+    async def main():
+        started = {"left": asyncio.Event(), "right": asyncio.Event()}
+        wf = Workflow([WaitingAgent("left", started, "right"), WaitingAgent("right", started, "left")])
+        return await wf.run_async("x")
+
+    # Each agent waits for the other to start, so this only finishes if both overlap
+    assert asyncio.run(main()) == "x"
+
+
+def test_workflow_run_async_matches_run():
+    wf = Workflow([AgentA(), AgentB()])
+    assert asyncio.run(wf.run_async("x")) == wf.run("x") == "xab"
+
+
+def test_many_workflows_share_one_loop():
+    async def main():
+        wf = Workflow([AgentA(), AgentB()])
+        return await asyncio.gather(*(wf.run_async(str(i)) for i in range(5)))
+
+    assert asyncio.run(main()) == [f"{i}ab" for i in range(5)]
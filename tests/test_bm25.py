@@ -0,0 +1,177 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from vector_store.base import ScoredResult  # noqa: E402
+from vector_store.bm25 import BM25Index, tokenize  # noqa: E402
+
+
+def _index():
+    index = BM25Index()
+    index.add_documents([
+        ("a", "Claim CLM-1001 was denied for missing prior authorization.", {"text": "a", "source": "x.txt"}),
+        ("b", "Prior authorization is required for MRI scans.", {"text": "b", "source": "y.txt"}),
+        ("c", "Members can appeal a denied claim within 60 days.", {"text": "c", "source": "y.txt"}),
+    ])
+    return index
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    assert tokenize("Claim CLM-1001, CPT 99213.") == ["claim", "clm-1001", "clm", "1001", "cpt", "99213"]
+
+
+def test_bm25_ranks_exact_identifier_first():
+    index = _index()
+    assert [r.id for r in index.search("CLM-1001")] == ["a"]
+    assert [r.id for r in index.search("1001")] == ["a"]
+    hits = index.search("prior authorization", top_k=5)
+    assert [r.id for r in hits] == ["b", "a"]
+    assert hits[0].score > hits[1].score
+    assert index.search("unrelated words") == []
+
+
+def test_bm25_filters_and_replacement():
+    index = _index()
+    assert [r.id for r in index.search("denied claim", filters={"source": "y.txt"})] == ["c"]
+
+    index.add("a", "Dental cleaning is covered twice a year.", {"text": "a2", "source": "x.txt"})
+    assert len(index) == 3
+    assert index.search("CLM-1001") == []
+    assert index.search("dental")[0].payload["text"] == "a2"
+
+
+def test_bm25_save_load_roundtrip(tmp_path):
+    index = _index()
+    index.add("c", "Appeals go to the review board.", {"text": "c2", "source": "y.txt"})
+    index.save(str(tmp_path))
+
+    loaded = BM25Index.load(str(tmp_path))
+    assert len(loaded) == 3
+    for query in ("CLM-1001", "prior authorization", "appeals review", "60 days"):
+        assert [(r.id, round(r.score, 6)) for r in loaded.search(query)] == [
+            (r.id, round(r.score, 6)) for r in index.search(query)
+        ]
+
+
+def test_hybrid_retriever_fuses_dense_and_lexical_ranks(monkeypatch):
+    # Import against the real vector store and drop the module again afterwards
+    monkeypatch.setitem(sys.modules, "chat_engine.modules.retriever", None)
+    monkeypatch.delitem(sys.modules, "chat_engine.modules.retriever")
+    from chat_engine.modules.retriever import HybridRetriever
+
+    def dense(vector, top_k=3, metadata_filter=None):
+        return [ScoredResult("b", 0.9, {"text": "b"}), ScoredResult("c", 0.8, {"text": "c"})][:top_k]
+
+    retriever = HybridRetriever(dense_retriever=dense, lexical_index=_index(), lexical_weight=2.0)
+    assert [r.id for r in retriever([0.0], top_k=2)] == ["b", "c"]
+
+    fused = retriever([0.0], top_k=3, query_text="CLM-1001 denied")
+    # "c" is in both lists, "a" tops the (heavier) lexical list, "b" is dense only
+    assert [r.id for r in fused] == ["c", "a", "b"]
+    assert fused[0].score > fused[1].score
+
+
+def test_ingested_index_is_persisted_and_picked_up(tmp_path, monkeypatch):
+    from vector_store import bm25
+
+    path = str(tmp_path / "index")
+    monkeypatch.setattr(bm25, "BM25_INDEX_DIR", path)
+    monkeypatch.setattr(bm25, "BM25_RELOAD_INTERVAL", 0.0)
+    monkeypatch.setattr(bm25, "_next_check", 0.0)
+    bm25.set_default_lexical_index(None)
+    try:
+        # Ingestion process: writes through to disk
+        assert bm25.index_texts([("a", "claim CLM-7", None)], path=path) == 1
+        # API process: starts empty, then sees what ingestion wrote
+        bm25.set_default_lexical_index(BM25Index())
+        assert [r.id for r in bm25.get_default_lexical_index().search("CLM-7")] == ["a"]
+        # A second ingestion extends the persisted index instead of replacing it
+        bm25.set_default_lexical_index(None)
+        bm25.index_texts([("b", "claim CLM-8", None)], path=path)
+        assert len(BM25Index.load(path)) == 2
+    finally:
+        bm25.set_default_lexical_index(None)
+
+
+def test_search_while_adding_does_not_fail():
+    import threading
+
+    index = BM25Index()
+    index.add_documents((f"d{i}", f"claim denied prior authorization word{i}", None) for i in range(2000))
+    errors = []
+
+    def guarded(work):
+        def run():
+            try:
+                work()
+            except Exception as exc:  # appending while a search views the postings
+                errors.append(exc)
+        return run
+
+    def add():
+        for i in range(2000):
+            index.add(f"n{i}", "claim denied prior authorization")
+
+    def search():
+        for _ in range(100):
+            index.search("claim prior authorization denied")
+
+    threads = [threading.Thread(target=guarded(add))] + [threading.Thread(target=guarded(search)) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_streamed_ingestion_batches_saves_and_drops_text(tmp_path, monkeypatch):
+    import json
+
+    from vector_store import bm25
+
+    path = str(tmp_path / "index")
+    saves = []
+    monkeypatch.setattr(bm25, "BM25_SAVE_BATCH", 3)
+    monkeypatch.setattr(BM25Index, "save", lambda self, p, _save=BM25Index.save: saves.append(p) or _save(self, p))
+    bm25.set_default_lexical_index(None)
+    try:
+        for i in range(4):
+            bm25.index_texts([(f"d{i}", f"claim CLM-{i}", {"text": f"claim CLM-{i}", "source": "s"})], path, flush=False)
+        assert len(saves) == 1  # after the third document
+        assert bm25.get_default_lexical_index().search("CLM-3")[0].id == "d3"
+        bm25.flush_lexical_index(path)
+        assert len(saves) == 2
+        bm25.flush_lexical_index(path)  # nothing queued
+        assert len(saves) == 2
+
+        with open(os.path.join(path, bm25.SNAPSHOT_BM25)) as f:
+            assert json.load(f)["payloads"][0] == {"source": "s"}
+        assert len(BM25Index.load(path)) == 4
+    finally:
+        bm25.set_default_lexical_index(None)
+
+
+def test_hybrid_retriever_fetches_text_for_lexical_hits(monkeypatch):
+    monkeypatch.setitem(sys.modules, "chat_engine.modules.retriever", None)
+    monkeypatch.delitem(sys.modules, "chat_engine.modules.retriever")
+    from chat_engine.modules.retriever import HybridRetriever
+
+    index = BM25Index(keep_text=False)
+    index.add("a", "Claim CLM-1001 was denied.", {"text": "Claim CLM-1001 was denied.", "source": "x.txt"})
+    lookups = []
+
+    def lookup(ids):
+        lookups.append(ids)
+        return [{"text": f"stored {doc_id}", "source": "x.txt"} for doc_id in ids]
+
+    retriever = HybridRetriever(
+        dense_retriever=lambda vector, top_k=3, metadata_filter=None: [],
+        lexical_index=index,
+        payload_lookup=lookup,
+    )
+    assert index.search("CLM-1001")[0].payload == {"source": "x.txt"}
+    assert [r.payload["text"] for r in retriever([0.0], query_text="CLM-1001")] == ["stored a"]
+    assert lookups == [["a"]]
@@ -16,6 +16,7 @@ def stub_external_modules(monkeypatch):
     embedding = types.ModuleType("embedding")
     embedder = types.ModuleType("embedding.embedder")
     embedder.embed_text = lambda text: [0.1, 0.2]
+    embedder.embed_texts = lambda texts, batch_size=64: [[0.1, 0.2] for _ in texts]
     embedding.embedder = embedder
     monkeypatch.setitem(sys.modules, "embedding", embedding)
     monkeypatch.setitem(sys.modules, "embedding.embedder", embedder)
@@ -28,6 +29,7 @@ def stub_external_modules(monkeypatch):
             self.payload = payload
     base.DummyResult = DummyResult
     base.query_vector = lambda vec, top_k=5, filters=None: [DummyResult({"text": "ctx"})]
+    base.query_vectors = lambda vecs, top_k=5, filters=None: [[DummyResult({"text": "ctx"})] for _ in vecs]
     vector_store.base = base
     monkeypatch.setitem(sys.modules, "vector_store", vector_store)
     monkeypatch.setitem(sys.modules, "vector_store.base", base)
@@ -78,3 +80,188 @@ def test_answer_query_updates_history():
         {"role": "user", "content": user_msg},
         {"role": "assistant", "content": assistant_reply},
     ]
+
+
+def test_answer_query_passes_text_to_hybrid_retriever():
+    ChatEngine = importlib.import_module("chat_engine.chat_engine").ChatEngine
+    calls = []
+
+    class DummyRes:
+        payload = {"text": "retrieved"}
+
+    class TextRetriever:
+        uses_query_text = True
+
+        def __call__(self, vec, top_k=3, query_text=None):
+            calls.append(query_text)
+            return [DummyRes()]
+
+    engine = ChatEngine(
+        retriever=TextRetriever(),
+        embedder=lambda text: [1.0],
+        llm=lambda prompt: "ok",
+        prompt_assembler=lambda q, c, h: "prompt",
+    )
+    assert engine.answer_query("What about CLM-1001?") == "ok"
+    assert calls == ["What about CLM-1001?"]
+
+
+def test_answer_query_stream_finalizes_history_and_audit(monkeypatch):
+    ce_module = importlib.import_module("chat_engine.chat_engine")
+    audited = []
+    monkeypatch.setattr(ce_module, "log_audit_event", lambda event, details: audited.append(details))
+
+    class DummyRes:
+        payload = {"text": "retrieved"}
+
+    engine = ce_module.ChatEngine(
+        retriever=lambda vec, top_k=3: [DummyRes()],
+        embedder=lambda text: [1.0],
+        llm=lambda prompt: "unused",
+        llm_stream=lambda prompt: iter(["Claims ", "take ", "30 days."]),
+        prompt_assembler=lambda q, c, h: "prompt",
+    )
+    stream = engine.answer_query_stream("how long?")
+    assert next(stream) == "Claims "
+    assert engine.session.history == [{"role": "user", "content": "how long?"}]
+    assert list(stream) == ["take ", "30 days."]
+    assert engine.session.history[-1] == {"role": "assistant", "content": "Claims take 30 days."}
+    assert audited == [{"question": "how long?", "answer": "Claims take 30 days."}]
+
+    # A consumer that disconnects early still leaves a consistent session
+    stream = engine.answer_query_stream("again?")
+    next(stream)
+    stream.close()
+    assert engine.session.history[-1] == {"role": "assistant", "content": "Claims"}
+    assert audited[-1] == {"question": "again?", "answer": "Claims", "complete": False}
+
+
+def test_budgeted_assembler_gets_ranked_snippets_and_usage_is_audited(monkeypatch):
+    ce_module = importlib.import_module("chat_engine.chat_engine")
+    audited = []
+    monkeypatch.setattr(ce_module, "log_audit_event", lambda event, details: audited.append(details))
+
+    class DummyRes:
+        def __init__(self, text):
+            self.payload = {"text": text}
+
+    class Prompt(list):
+        def usage(self):
+            return {"tokens_used": 12, "tokens_dropped": 3}
+
+    class SnippetAssembler:
+        accepts_snippets = True
+
+        def __call__(self, user_query, context, history):
+            assert context == ["first", "second"]
+            return Prompt([{"role": "user", "content": user_query}])
+
+    engine = ce_module.ChatEngine(
+        retriever=lambda vec, top_k=3: [DummyRes("first"), DummyRes("second")],
+        embedder=lambda text: [1.0],
+        llm=lambda prompt: "ok",
+        prompt_assembler=SnippetAssembler(),
+    )
+    assert engine.answer_query("q") == "ok"
+    assert audited == [{"question": "q", "answer": "ok", "tokens": {"tokens_used": 12, "tokens_dropped": 3}}]
+
+
+def test_concurrent_identical_queries_are_coalesced():
+    import threading
+
+    ChatEngine = importlib.import_module("chat_engine.chat_engine").ChatEngine
+    release = threading.Event()
+    llm_calls = []
+
+    class DummyRes:
+        payload = {"text": "retrieved"}
+
+    def slow_llm(prompt):
+        llm_calls.append(prompt)
+        release.wait(5)
+        return "shared answer"
+
+    engine = ChatEngine(
+        retriever=lambda vec, top_k=3: [DummyRes()],
+        embedder=lambda text: [1.0],
+        llm=slow_llm,
+        prompt_assembler=lambda q, c, h: "prompt",
+    )
+    answers = []
+    threads = [
+        threading.Thread(target=lambda q=q: answers.append(engine.answer_query(q)))
+        for q in ["What is covered?", "what is  covered?", "What is covered?"]
+    ]
+    for t in threads:
+        t.start()
+    threading.Timer(0.2, release.set).start()
+    for t in threads:
+        t.join()
+
+    assert answers == ["shared answer"] * 3
+    assert len(llm_calls) == 1
+    assert engine.single_flight.coalesced == 2
+    assert len(engine.session.history) == 2
+
+
+def test_same_question_from_different_sessions_is_coalesced():
+    import threading
+
+    ChatEngine = importlib.import_module("chat_engine.chat_engine").ChatEngine
+    from chat_engine.modules.session import ChatSession
+
+    release = threading.Event()
+    llm_calls = []
+
+    class DummyRes:
+        payload = {"text": "retrieved"}
+
+    def slow_llm(prompt):
+        llm_calls.append(prompt)
+        release.wait(5)
+        return "shared answer"
+
+    engine = ChatEngine(
+        retriever=lambda vec, top_k=3: [DummyRes()],
+        embedder=lambda text: [1.0],
+        llm=slow_llm,
+        prompt_assembler=lambda q, c, h: "prompt",
+    )
+    sessions = [ChatSession(f"user-{i}") for i in range(3)]
+    threads = [
+        threading.Thread(target=engine.answer_query, args=("What is covered?", session))
+        for session in sessions
+    ]
+    for t in threads:
+        t.start()
+    threading.Timer(0.2, release.set).start()
+    for t in threads:
+        t.join()
+
+    assert len(llm_calls) == 1
+    for session in sessions:
+        assert session.history == [
+            {"role": "user", "content": "What is covered?"},
+            {"role": "assistant", "content": "shared answer"},
+        ]
+
+
+def test_sessions_keep_histories_apart():
+    ce_module = importlib.import_module("chat_engine.chat_engine")
+    from chat_engine.modules.session import ChatSession
+
+    class DummyRes:
+        def __init__(self, payload):
+            self.payload = payload
+
+    engine = ce_module.ChatEngine(
+        retriever=lambda vec, top_k=3: [DummyRes({"text": "ctx"})],
+        embedder=lambda text: [0.0],
+        llm=lambda prompt: "answer",
+        prompt_assembler=lambda q, c, h: "prompt",
+    )
+    alice, bob = ChatSession(), ChatSession()
+    engine.answer_query("hi", session=alice)
+    engine.answer_query("hi", session=bob)
+    assert len(alice.history) == len(bob.history) == 2
+    assert engine.session.history == []
@@ -0,0 +1,143 @@
+import os
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError  # noqa: E402
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail():
+    raise ConnectionError("down")
+
+
+def test_breaker_opens_on_failure_rate_and_probes_half_open():
+    clock = Clock()
+    breaker = CircuitBreaker("test", failure_threshold=0.5, window=4, min_calls=4, reset_timeout=10, clock=clock)
+    assert breaker.call(lambda: "ok") == "ok"
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+    assert breaker.state == CLOSED  # only 3 calls so far
+    with pytest.raises(ConnectionError):
+        breaker.call(_fail)
+    assert breaker.state == OPEN
+    assert breaker.failure_rate() == 0.75
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    assert calls == []
+
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # one probe at a time
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now = 20
+    assert breaker.call(lambda: "back") == "back"
+    assert breaker.state == CLOSED
+    assert breaker.failure_rate() == 0.0
+
+
+def test_breaker_language_model_fails_fast_when_open():
+    from language_model.base import LanguageModel
+    from language_model.language_model import CircuitBreakerLanguageModel
+
+    class DownModel(LanguageModel):
+        calls = 0
+
+        def generate(self, messages):
+            self.calls += 1
+            raise TimeoutError("no answer")
+
+    model = DownModel()
+    lm = CircuitBreakerLanguageModel(model, CircuitBreaker("lm", window=2, min_calls=2, reset_timeout=60))
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            lm.generate([])
+    with pytest.raises(CircuitOpenError):
+        lm.generate([])
+    with pytest.raises(CircuitOpenError):
+        list(lm.generate_stream([]))
+    assert model.calls == 2
+
+
+class HTTPError(Exception):
+    """Shaped like ``requests.HTTPError`` / ``httpx.HTTPStatusError``."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = type("Response", (), {"status_code": status_code})()
+
+
+def test_client_errors_are_not_recorded():
+    clock = Clock()
+    breaker = CircuitBreaker("test", window=4, min_calls=2, reset_timeout=10, clock=clock)
+
+    def raise_status(status):
+        raise HTTPError(status)
+
+    for status in (400, 401, 404, 422):
+        with pytest.raises(HTTPError):
+            breaker.call(raise_status, status)
+    assert breaker.state == CLOSED
+    assert breaker.failure_rate() == 0.0
+
+    for status in (503, 408):
+        with pytest.raises(HTTPError):
+            breaker.call(raise_status, status)
+    assert breaker.state == OPEN
+
+    # A client error during the half-open probe frees the slot for the next one
+    clock.now = 10
+    with pytest.raises(HTTPError):
+        breaker.call(raise_status, 400)
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe_frees_the_slot():
+    import asyncio
+
+    from language_model.base import LanguageModel
+    from language_model.language_model import CircuitBreakerLanguageModel
+
+    class SlowModel(LanguageModel):
+        def generate(self, messages):  # pragma: no cover - only agenerate is used
+            raise AssertionError
+
+        async def agenerate(self, messages):
+            await asyncio.sleep(10)
+            return "late"
+
+    clock = Clock()
+    breaker = CircuitBreaker("lm", window=2, min_calls=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now = 10
+    lm = CircuitBreakerLanguageModel(SlowModel(), breaker)
+
+    async def main():
+        probe = asyncio.ensure_future(lm.agenerate([]))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(main())
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()  # the next call may probe
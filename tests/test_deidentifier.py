@@ -0,0 +1,53 @@
+import os
+import sys
+import types
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from agents.deid_agent import DeidAgent  # noqa: E402
+from storage import deidentifier  # noqa: E402
+
+
+class FakeNLP:
+    """Tags every capitalised word as a PERSON."""
+
+    def __init__(self):
+        self.pipe_calls = []
+
+    def _doc(self, text):
+        ents = [types.SimpleNamespace(text=w, label_="PERSON") for w in text.split() if w[:1].isupper()]
+        return types.SimpleNamespace(ents=ents)
+
+    def __call__(self, text):
+        return self._doc(text)
+
+    def pipe(self, items, as_tuples=False, batch_size=1000, n_process=1):
+        self.pipe_calls.append((batch_size, n_process))
+        for text, context in items:
+            yield self._doc(text), context
+
+
+def test_deidentify_texts_batches_in_order(monkeypatch):
+    fake = FakeNLP()
+    monkeypatch.setattr(deidentifier, "nlp", fake)
+    texts = ["Alice was seen", "no phi here", "Bob called"]
+    result = list(deidentifier.deidentify_texts(iter(texts), batch_size=2, n_process=2))
+    assert result == ["[PERSON] was seen", "no phi here", "[PERSON] called"]
+    assert result == [deidentifier.deidentify_text(t) for t in texts]
+    assert fake.pipe_calls == [(2, 2)]
+
+
+def test_deidentify_texts_without_model(monkeypatch):
+    monkeypatch.setattr(deidentifier, "nlp", None)
+    assert list(deidentifier.deidentify_texts(["Alice"])) == ["Alice"]
+
+
+def test_deid_agent_batch(monkeypatch):
+    fake = FakeNLP()
+    monkeypatch.setattr(deidentifier, "nlp", fake)
+    messages, contexts = DeidAgent().act_batch(["Carol here", "ok"], [{}, {}])
+    assert messages == ["[PERSON] here", "ok"]
+    assert [c["deidentified"] for c in contexts] == messages
+    assert len(fake.pipe_calls) == 1
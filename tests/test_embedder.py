@@ -0,0 +1,41 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from embedding import embedder  # noqa: E402
+
+
+def test_fallback_batch_matches_single_embeddings(monkeypatch):
+    monkeypatch.setattr(embedder, "SentenceTransformer", None)
+    model = embedder.SentenceTransformerEmbedder()
+    texts = ["claim 123", "member id", "claim 123"]
+    batch = model.embed_texts(texts)
+    assert len(batch) == 3
+    assert len(batch[0]) == embedder.EMBEDDING_DIMENSION
+    assert batch[0] == batch[2]
+    assert batch[0] != batch[1]
+    assert model.embed("member id") == batch[1]
+
+
+def test_embed_texts_uses_model_batching(monkeypatch):
+    calls = []
+
+    class FakeArray(list):
+        def tolist(self):
+            return list(self)
+
+    class FakeModel:
+        def __init__(self, name):
+            pass
+
+        def encode(self, texts, batch_size=32):
+            calls.append((list(texts), batch_size))
+            return FakeArray([[float(len(t))] for t in texts])
+
+    monkeypatch.setattr(embedder, "SentenceTransformer", FakeModel)
+    model = embedder.SentenceTransformerEmbedder()
+    assert model.embed_texts(["a", "bb"], batch_size=8) == [[1.0], [2.0]]
+    assert calls == [(["a", "bb"], 8)]
@@ -0,0 +1,86 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from embedding.base import EmbeddingModel  # noqa: E402
+from embedding.cache import CachedEmbeddingModel, EmbeddingCache  # noqa: E402
+
+
+class CountingModel(EmbeddingModel):
+    model_name = "counting"
+
+    def __init__(self, cacheable=True):
+        self.cacheable = cacheable
+        self.seen = []
+
+    def embed(self, text):
+        self.seen.append(text)
+        return [float(len(text)), 1.0]
+
+
+def test_cached_model_skips_model_on_repeat(tmp_path):
+    model = CountingModel()
+    cached = CachedEmbeddingModel(model, EmbeddingCache(path=str(tmp_path / "cache.db")))
+
+    assert cached.embed_texts(["a", "bb", "a"]) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert model.seen == ["a", "bb"]
+    assert cached.embed("bb") == [2.0, 1.0]
+    assert model.seen == ["a", "bb"]
+    assert cached.cache.memory_hits == 1
+    assert cached.cache.misses == 3
+
+
+def test_disk_tier_survives_new_cache_instance(tmp_path):
+    path = str(tmp_path / "cache.db")
+    EmbeddingCache(path=path).put("m:k", [0.5, 0.25])
+
+    cache = EmbeddingCache(path=path)
+    assert cache.get("m:k") == [0.5, 0.25]
+    assert cache.disk_hits == 1
+    assert cache.get("m:k") == [0.5, 0.25]
+    assert cache.memory_hits == 1
+
+
+def test_cache_tiers_are_size_bounded(tmp_path):
+    cache = EmbeddingCache(max_memory_items=2, path=str(tmp_path / "cache.db"), max_disk_items=3)
+    for i in range(5):
+        cache.put(f"k{i}", [float(i)])
+    assert len(cache._memory) == 2
+    assert cache.stats()["disk_items"] == 3
+    assert cache.get("k0") is None
+    assert cache.get("k4") == [4.0]
+
+
+def test_uncacheable_results_are_not_stored():
+    model = CountingModel(cacheable=False)
+    cached = CachedEmbeddingModel(model)
+    cached.embed("x")
+    cached.embed("x")
+    assert model.seen == ["x", "x"]
+
+
+def test_memory_hits_keep_disk_entries_fresh(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(max_memory_items=1, path=path, max_disk_items=2, touch_interval=3600)
+    cache.put("hot", [1.0])
+    cache.put("cold", [2.0])
+    cache.put("hot", [1.0])  # back in memory, disk access time unchanged
+    assert cache.get("hot") == [1.0]  # memory hit, only recorded for later
+    cache.put("new", [3.0])  # disk eviction flushes the recorded hit first
+    assert EmbeddingCache(path=path).get("hot") == [1.0]
+    assert EmbeddingCache(path=path).get("cold") is None
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = EmbeddingCache(path=path)
+    cache.put("k", [1.0])
+    assert cache.get("k") == [1.0]
+    cache.clear()
+    assert len(cache._memory) == 0
+    assert cache.stats()["disk_items"] == 0
+    assert cache.get("k") is None
+    assert EmbeddingCache(path=path).get("k") is None
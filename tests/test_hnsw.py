@@ -0,0 +1,61 @@
+import os
+import random
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from vector_store.base import InMemoryVectorStore  # noqa: E402
+from vector_store.hnsw import HNSWVectorStore  # noqa: E402
+
+
+def _build(n=600, dim=16, seed=0):
+    rng = random.Random(seed)
+    vectors = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(n)]
+    hnsw = HNSWVectorStore(m=8, ef_construction=64, ef_search=64, seed=seed)
+    exact = InMemoryVectorStore()
+    for i, vec in enumerate(vectors):
+        payload = {"source": f"s{i % 4}"}
+        hnsw.index_document(i, vec, payload)
+        exact.index_document(i, vec, payload)
+    queries = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(20)]
+    return hnsw, exact, queries
+
+
+def test_hnsw_recall_against_exact_search():
+    hnsw, exact, queries = _build()
+    hits = 0
+    for q in queries:
+        approx = {r.id for r in hnsw.query_vector(q, top_k=10)}
+        truth = {r.id for r in exact.query_vector(q, top_k=10)}
+        hits += len(approx & truth)
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_hnsw_filtered_graph_search_only_returns_matches():
+    hnsw, exact, queries = _build()
+    hnsw.exact_search_threshold = 0  # force the graph path
+    for q in queries[:5]:
+        results = hnsw.query_vector(q, top_k=5, filters={"source": "s1"})
+        assert len(results) == 5
+        assert all(r.payload["source"] == "s1" for r in results)
+
+
+def test_hnsw_incremental_insert_and_replace():
+    store = HNSWVectorStore(seed=1)
+    assert store.query_vector([1.0, 0.0]) == []
+    store.index_document("a", [1.0, 0.0], {"text": "a"})
+    store.index_document("b", [0.0, 1.0], {"text": "b"})
+    assert store.query_vector([1.0, 0.1], top_k=1)[0].id == "a"
+    store.index_document("a", [-1.0, 0.0], {"text": "moved"})
+    assert store.query_vector([1.0, 0.1], top_k=1)[0].id == "b"
+    assert store.query_vector([-1.0, 0.0], top_k=1)[0].payload == {"text": "moved"}
+
+
+def test_hnsw_snapshot_restores_graph(tmp_path):
+    hnsw, _, queries = _build(n=200)
+    hnsw.save(str(tmp_path))
+    loaded = HNSWVectorStore.load(str(tmp_path))
+    for q in queries[:5]:
+        assert [r.id for r in loaded.query_vector(q, top_k=5)] == [r.id for r in hnsw.query_vector(q, top_k=5)]
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import sys
+
+import httpx
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from language_model.language_model import GROQ_API_URL, GroqLanguageModel  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _completion(text):
+    return {"choices": [{"message": {"content": f" {text} "}}]}
+
+
+def test_generate_reuses_pooled_session():
+    calls = []
+
+    class FakeResponse:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return _completion("hello")
+
+    class FakeSession:
+        def post(self, url, headers, json, timeout):
+            calls.append((url, json["model"], json["messages"], timeout))
+            return FakeResponse()
+
+    lm = GroqLanguageModel(session=FakeSession(), timeout=3)
+    session = lm.session
+    assert lm.generate(MESSAGES) == "hello"
+    assert lm.generate(MESSAGES) == "hello"
+    assert lm.session is session
+    assert calls == [(GROQ_API_URL, lm.model, MESSAGES, 3)] * 2
+
+
+def test_default_session_keeps_connections_pooled():
+    lm = GroqLanguageModel(pool_size=4)
+    session = lm.session
+    assert lm.session is session
+    assert session.get_adapter(GROQ_API_URL)._pool_maxsize == 4
+    lm.close()
+
+
+def test_agenerate_uses_async_client():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url)
+        return httpx.Response(200, json=_completion("async hello"))
+
+    async def run():
+        lm = GroqLanguageModel(async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        answers = await asyncio.gather(lm.agenerate(MESSAGES), lm.agenerate(MESSAGES))
+        await lm.aclose()
+        return answers
+
+    assert asyncio.run(run()) == ["async hello", "async hello"]
+    assert [str(url) for url in seen] == [GROQ_API_URL] * 2
+
+
+def test_generate_stream_parses_server_sent_events():
+    lines = [
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        "",
+        'data: {"choices": [{"delta": {"content": " Claims"}}]}',
+        'data: {"choices": [{"delta": {"content": " are paid."}}]}',
+        "data: [DONE]",
+    ]
+    requests_made = []
+
+    class FakeStreamResponse:
+        status_code = 200
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self, decode_unicode=False):
+            return iter(lines)
+
+    class FakeSession:
+        def post(self, url, headers, json, timeout, stream=False):
+            requests_made.append((json["stream"], stream))
+            return FakeStreamResponse()
+
+    lm = GroqLanguageModel(session=FakeSession())
+    assert list(lm.generate_stream(MESSAGES)) == ["Claims", " are paid."]
+    assert requests_made == [(True, True)]
+
+
+def test_generate_retries_only_retryable_statuses(monkeypatch):
+    from language_model import language_model as lm_module
+
+    monkeypatch.setattr(lm_module.time, "sleep", lambda delay: None)
+
+    class FakeResponse:
+        def __init__(self, status_code):
+            self.status_code = status_code
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise RuntimeError(f"HTTP {self.status_code}")
+
+        def close(self):
+            pass
+
+        def json(self):
+            return _completion("recovered")
+
+    class FakeSession:
+        def __init__(self, statuses):
+            self.statuses = list(statuses)
+
+        def post(self, url, headers, json, timeout):
+            return FakeResponse(self.statuses.pop(0))
+
+    session = FakeSession([503, 429, 200])
+    assert GroqLanguageModel(session=session, max_retries=2).generate(MESSAGES) == "recovered"
+    assert session.statuses == []
+
+    session = FakeSession([400, 200])
+    with pytest.raises(RuntimeError, match="HTTP 400"):
+        GroqLanguageModel(session=session, max_retries=2).generate(MESSAGES)
+    assert session.statuses == [200]
+
+    session = FakeSession([503, 503, 200])
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        GroqLanguageModel(session=session, max_retries=1).generate(MESSAGES)
+
+
+def test_async_clients_close_with_their_event_loop(monkeypatch):
+    import httpx
+    from language_model import language_model as lm_mod
+
+    created = []
+
+    def factory(pool_size, timeout):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, json=_completion("hi"))))
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(lm_mod, "_create_async_client", factory)
+    lm = GroqLanguageModel()
+    assert asyncio.run(lm.agenerate(MESSAGES)) == "hi"
+    assert asyncio.run(lm.agenerate(MESSAGES)) == "hi"
+    assert len(created) == 2
+    assert all(client.is_closed for client in created)
+
+    async def explicit_close():
+        await lm.agenerate(MESSAGES)
+        await lm.aclose()
+        return created[-1].is_closed
+
+    assert asyncio.run(explicit_close())
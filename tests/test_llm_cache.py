@@ -0,0 +1,170 @@
+import os
+import subprocess
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from language_model.base import LanguageModel  # noqa: E402
+from language_model.cache import CachedLanguageModel, ResponseCache, invalidate_on_ingest  # noqa: E402
+from utils.event_bus import EventBus  # noqa: E402
+
+
+class CountingModel(LanguageModel):
+    model = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, messages):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+def _messages(question, knowledge="claims are paid in 30 days"):
+    return [
+        {"role": "system", "content": "You are a helpful healthcare assistant."},
+        {"role": "system", "content": f"[KNOWLEDGE]: {knowledge}"},
+        {"role": "user", "content": question},
+    ]
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exact_hit_ignores_whitespace_and_role_case():
+    model = CountingModel()
+    cached = CachedLanguageModel(model, ResponseCache())
+    assert cached.generate(_messages("How long does a claim take?")) == "answer 1"
+    variant = _messages("  How long   does a claim take? ")
+    variant[0]["role"] = "SYSTEM"
+    assert cached.generate(variant) == "answer 1"
+    assert cached.generate(_messages("Is dental covered?")) == "answer 2"
+    assert model.calls == 2
+    assert cached.cache.stats() == {"exact_hits": 1, "semantic_hits": 0, "misses": 2, "items": 2}
+
+
+def test_ttl_and_lru_eviction():
+    clock = Clock()
+    cache = ResponseCache(max_items=2, ttl=10, clock=clock)
+    cache.put("m", _messages("a"), "A")
+    cache.put("m", _messages("b"), "B")
+    assert cache.get("m", _messages("a")) == "A"  # "a" becomes most recently used
+    cache.put("m", _messages("c"), "C")
+    assert cache.get("m", _messages("b")) is None
+    assert cache.get("m", _messages("a")) == "A"
+
+    clock.now = 11
+    assert cache.get("m", _messages("a")) is None
+    assert len(cache) == 1  # only "c" is left until it is looked up
+
+
+def test_semantic_hit_requires_same_context():
+    vectors = {
+        "how long does a claim take?": [1.0, 0.0],
+        "how long until my claim is paid?": [0.95, 0.1],
+        "is dental covered?": [0.0, 1.0],
+    }
+    cache = ResponseCache(semantic_threshold=0.9, embedder=lambda text: vectors[text.lower()])
+    cache.put("m", _messages("How long does a claim take?"), "30 days")
+
+    assert cache.get("m", _messages("How long until my claim is paid?")) == "30 days"
+    assert cache.get("m", _messages("Is dental covered?")) is None
+    assert cache.get("m", _messages("How long until my claim is paid?", knowledge="other")) is None
+    assert cache.get("other-model", _messages("How long until my claim is paid?")) is None
+    assert cache.semantic_hits == 1
+
+
+def test_ingest_event_clears_cache():
+    bus = EventBus()
+    cache = ResponseCache()
+    invalidate_on_ingest(cache, bus)
+    cache.put("m", _messages("a"), "A")
+    bus.emit("document_ingested", source="new.txt")
+    assert len(cache) == 0
+    assert cache.get("m", _messages("a")) is None
+
+
+def test_stream_is_cached_once_complete():
+    class StreamingModel(CountingModel):
+        def generate_stream(self, messages):
+            self.calls += 1
+            yield "30 "
+            yield "days"
+
+    model = StreamingModel()
+    cached = CachedLanguageModel(model, ResponseCache())
+    partial = cached.generate_stream(_messages("a"))
+    next(partial)
+    partial.close()
+    assert len(cached.cache) == 0
+
+    assert list(cached.generate_stream(_messages("a"))) == ["30 ", "days"]
+    assert list(cached.generate_stream(_messages("a"))) == ["30 days"]
+    assert cached.generate(_messages("a")) == "30 days"
+    assert model.calls == 2
+
+
+def test_version_change_invalidates_entries():
+    version = ["v1"]
+    cache = ResponseCache(version=lambda: version[0])
+    cache.put("m", _messages("a"), "A")
+    assert cache.get("m", _messages("a")) == "A"
+    version[0] = "v2"  # another process ingested documents
+    assert cache.get("m", _messages("a")) is None
+
+
+def test_semantic_hit_through_chat_engine():
+    from types import SimpleNamespace
+
+    from chat_engine.chat_engine import ChatEngine
+    from chat_engine.modules.session import ChatSession
+
+    vectors = {
+        "how long does a claim take?": [1.0, 0.0],
+        "how long until my claim is paid?": [0.95, 0.1],
+    }
+    model = CountingModel()
+    cache = ResponseCache(semantic_threshold=0.9, embedder=lambda text: vectors[text.lower()])
+    engine = ChatEngine(
+        retriever=lambda vec, top_k=3: [SimpleNamespace(payload={"text": "claims are paid in 30 days"})],
+        embedder=lambda text: [0.0],
+        llm=CachedLanguageModel(model, cache).generate,
+        coalesce=False,
+    )
+    assert engine.answer_query("How long does a claim take?", ChatSession()) == "answer 1"
+    assert engine.answer_query("How long until my claim is paid?", ChatSession()) == "answer 1"
+    assert model.calls == 1
+    assert cache.semantic_hits == 1
+
+
+def test_version_keys_cached_answers():
+    version = ["1"]
+    model = CountingModel()
+    cache = ResponseCache()
+    cached = CachedLanguageModel(model, cache)
+    messages = _messages("How long does a claim take?")
+    cached.generate(messages)
+    cache.version = lambda: version[0]
+    cached.generate(messages)
+    cached.generate(messages)
+    version[0] = "2"
+    cached.generate(messages)
+    assert model.calls == 3
+
+
+def test_model_module_does_not_import_retrieval_stack():
+    code = (
+        "import sys, language_model.language_model; "
+        "print(sorted({m.split('.')[0] for m in sys.modules} & {'chat_engine', 'vector_store', 'numpy'}))"
+    )
+    env = {**os.environ, "GROQ_API_KEY": ""}
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_root, env=env, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip().splitlines()[-1] == "[]"
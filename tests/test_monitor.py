@@ -35,3 +35,17 @@ def test_check_services_logs(monkeypatch):
     monitor.check_services("vec", "bro")
     assert any("vec" in m for m in messages)
     assert any("bro" in m for m in messages)
+
+
+def test_check_services_async_logs(monkeypatch):
+    import asyncio
+
+    async def fake_check(url):
+        return False
+
+    logs = []
+    monkeypatch.setattr(monitor, "check_service_async", fake_check)
+    monkeypatch.setattr(monitor, "_check_broker", lambda url: True)
+    monkeypatch.setattr(monitor, "log", lambda msg: logs.append(msg))
+    asyncio.run(monitor.check_services_async("http://v", "http://b"))
+    assert logs == ["Vector store check failed for http://v"]
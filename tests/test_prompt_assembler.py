@@ -0,0 +1,77 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from chat_engine.modules import prompt_assembler as pa  # noqa: E402
+from language_model.tokens import count_tokens, prompt_budget, truncate_tokens  # noqa: E402
+
+
+def words(text):
+    return len(text.split())
+
+
+def first_words(text, n):
+    return " ".join(text.split()[:n])
+
+
+def _assembler(budget, **kwargs):
+    return pa.BudgetedPromptAssembler(budget=budget, token_counter=words, truncator=first_words, **kwargs)
+
+
+def _fixed_cost(question):
+    # system prompt, question and the knowledge message framing
+    overhead = pa.MESSAGE_OVERHEAD_TOKENS
+    return words(pa.SYSTEM_PROMPT) + words(question) + words(pa.KNOWLEDGE_PREFIX) + 3 * overhead
+
+
+def test_everything_kept_within_budget():
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello there"}]
+    prompt = _assembler(1000)("claim status?", ["alpha beta", "gamma"], history)
+    assert prompt == [
+        {"role": "system", "content": pa.SYSTEM_PROMPT},
+        *history,
+        {"role": "system", "content": "[KNOWLEDGE]: alpha beta\n\ngamma"},
+        {"role": "user", "content": "claim status?"},
+    ]
+    assert prompt.tokens_dropped == 0
+    assert prompt.tokens_used == sum(words(m["content"]) + pa.MESSAGE_OVERHEAD_TOKENS for m in prompt)
+
+
+def test_lowest_ranked_snippets_trimmed_then_dropped(monkeypatch):
+    monkeypatch.setattr(pa, "MIN_SNIPPET_TOKENS", 5)
+    question = "claim status?"
+    snippets = [" ".join(["top"] * 40), " ".join(["mid"] * 40), " ".join(["low"] * 40)]
+    budget = _fixed_cost(question) + 40 + 10
+    prompt = _assembler(budget)(question, snippets, [])
+
+    knowledge = prompt[1]["content"]
+    assert knowledge.count("top") == 40
+    assert knowledge.count("mid") == 10
+    assert "low" not in knowledge
+    assert prompt.snippets_dropped == 1
+    assert prompt.tokens_dropped == 30 + 40
+    assert prompt.tokens_used <= budget
+
+
+def test_oldest_history_dropped_first():
+    history = [{"role": "user", "content": " ".join([f"turn{i}"] * 10)} for i in range(4)]
+    question = "next?"
+    per_turn = 10 + pa.MESSAGE_OVERHEAD_TOKENS
+    budget = words(pa.SYSTEM_PROMPT) + words(question) + 2 * pa.MESSAGE_OVERHEAD_TOKENS + 4 * 2 * per_turn
+    prompt = _assembler(budget, history_share=0.25)(question, ["ctx"], history)
+
+    assert [m["content"] for m in prompt[1:3]] == [history[2]["content"], history[3]["content"]]
+    assert prompt.history_dropped == 2
+    assert prompt.usage()["tokens_dropped"] == 2 * per_turn
+
+
+def test_token_helpers_and_model_budget():
+    assert count_tokens("") == 0
+    assert count_tokens("claims are paid within thirty days") > 0
+    text = "word " * 200
+    assert count_tokens(truncate_tokens(text, 10)) <= 10
+    assert prompt_budget("llama3-8b-8192", max_tokens=200) <= 8192 - 200
+    assert prompt_budget("llama3-8b-8192", max_tokens=8192) == 0
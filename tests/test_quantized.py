@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from vector_store.base import InMemoryVectorStore  # noqa: E402
+from vector_store.quantized import QuantizedVectorStore  # noqa: E402
+
+
+def _data(n=500, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n, dim)).astype(np.float32), rng.standard_normal((20, dim)).astype(np.float32)
+
+
+def test_quantized_search_recall_and_memory():
+    data, queries = _data()
+    exact = InMemoryVectorStore()
+    quantized = QuantizedVectorStore(rescore_multiplier=4)
+    points = [(i, vec, {"source": f"s{i % 3}"}) for i, vec in enumerate(data)]
+    exact.index_documents(points, batch_size=128)
+    quantized.index_documents(points, batch_size=128)
+
+    hits = 0
+    for q in queries:
+        truth = exact.query_vector(q, top_k=10)
+        found = quantized.query_vector(q, top_k=10)
+        hits += len({r.id for r in truth} & {r.id for r in found})
+        # Rescoring reports exact cosine scores
+        expected = exact._normalize(q) @ exact._normalize(data[found[0].id])
+        assert found[0].score == pytest.approx(float(expected), abs=1e-5)
+    assert hits / (10 * len(queries)) >= 0.95
+
+    usage = quantized.memory_usage()
+    assert usage["float32"] == 4 * usage["int8_codes"]
+
+    filtered = quantized.query_vector(queries[0], top_k=5, filters={"source": "s1"})
+    assert [r.id for r in filtered] == [r.id for r in exact.query_vector(queries[0], top_k=5, filters={"source": "s1"})]
+
+
+def test_quantized_incremental_upsert_and_snapshot(tmp_path):
+    store = QuantizedVectorStore(initial_capacity=2)
+    store.index_document("a", [1.0, 0.0, 0.0], {"text": "a"})
+    store.index_document("b", [0.0, 1.0, 0.0], {"text": "b"})
+    store.index_document("c", [0.0, 0.0, -5.0], {"text": "c"})  # widens the bounds
+    assert store.query_vector([0.1, 0.0, -1.0], top_k=1)[0].id == "c"
+
+    store.save(str(tmp_path / "snap"))
+    loaded = QuantizedVectorStore.load(str(tmp_path / "snap"))
+    assert [r.id for r in loaded.query_vector([1.0, 0.1, 0.0], top_k=2)] == ["a", "b"]
+    loaded.index_document("a", [0.0, -1.0, 0.0], {"text": "moved"})
+    assert loaded.query_vector([0.0, -1.0, 0.0], top_k=1)[0].payload == {"text": "moved"}
+    # The snapshot itself is left untouched by writes to the loaded store
+    again = QuantizedVectorStore.load(str(tmp_path / "snap"))
+    assert again.query_vector([1.0, 0.0, 0.0], top_k=1)[0].id == "a"
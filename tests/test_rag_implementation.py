@@ -16,6 +16,7 @@ def stub_modules(monkeypatch):
     embedding = types.ModuleType("embedding")
     embedder = types.ModuleType("embedding.embedder")
     embedder.embed_text = lambda text: [0.1, 0.2]
+    embedder.embed_texts = lambda texts, batch_size=64: [[0.1, 0.2] for _ in texts]
     embedding.embedder = embedder
     monkeypatch.setitem(sys.modules, "embedding", embedding)
     monkeypatch.setitem(sys.modules, "embedding.embedder", embedder)
@@ -27,6 +28,7 @@ def stub_modules(monkeypatch):
             self.payload = payload
     base.DummyResult = DummyResult
     base.query_vector = lambda vec, top_k=5, filters=None: [DummyResult({"text": "ctx"})]
+    base.query_vectors = lambda vecs, top_k=5, filters=None: [[DummyResult({"text": "ctx"})] for _ in vecs]
     vector_store.base = base
     monkeypatch.setitem(sys.modules, "vector_store", vector_store)
     monkeypatch.setitem(sys.modules, "vector_store.base", base)
@@ -45,3 +47,16 @@ def test_answer_query_returns_llm_output():
     mod = importlib.import_module("question_answering.rag_implementation")
     result = mod.answer_query("hello")
     assert result == "assistant response"
+
+
+def test_answer_queries_batches_in_order(monkeypatch):
+    mod = importlib.import_module("question_answering.rag_implementation")
+    seen = []
+
+    def fake_generate(messages):
+        seen.append(messages[-1]["content"])
+        return f"answer to {messages[-1]['content']}"
+
+    monkeypatch.setattr(mod, "generate_answer", fake_generate)
+    assert mod.answer_queries(["q1", "q2"]) == ["answer to q1", "answer to q2"]
+    assert seen == ["q1", "q2"]
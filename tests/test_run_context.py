@@ -0,0 +1,79 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from agents.base import Agent  # noqa: E402
+from core.context import RunContext  # noqa: E402
+from core.multi_agent import MultiAgentCoordinator  # noqa: E402
+
+
+class Recorder(Agent):
+    def act(self, message: str, context: dict):
+        context.setdefault("seen", []).append(message)
+        context["messages"].append({"role": "assistant", "content": message})
+        return message, context
+
+
+def test_writes_do_not_touch_base():
+    base = {"messages": [{"role": "user", "content": "hi"}], "limit": 3}
+    ctx = RunContext(base)
+    ctx["messages"].append({"role": "assistant", "content": "hello"})
+    ctx["limit"] = 4
+    del ctx["limit"]
+    assert base == {"messages": [{"role": "user", "content": "hi"}], "limit": 3}
+    assert "limit" not in ctx
+    assert len(ctx["messages"]) == 2
+    assert set(ctx) == {"messages"}
+
+
+def test_immutable_values_are_shared_not_copied():
+    ctx = RunContext({"name": "x", "mutable": [1]})
+    assert ctx["name"] == "x"
+    assert "name" not in ctx.local
+    ctx["mutable"]
+    assert "mutable" in ctx.local
+
+
+def test_context_behaves_like_dict():
+    ctx = RunContext({"a": 1}, b=2)
+    assert ctx == {"a": 1, "b": 2}
+    assert ctx.get("missing") is None
+    assert ctx.setdefault("c", []) == []
+    assert ctx.to_dict() == {"a": 1, "b": 2, "c": []}
+
+
+def test_coordinator_runs_are_isolated():
+    coord = MultiAgentCoordinator([Recorder(), Recorder()])
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(coord.run, [str(i) for i in range(20)]))
+    assert results == [str(i) for i in range(20)]
+    assert coord.shared_context == {"messages": []}
+    assert len(coord.context["seen"]) == 2
+
+
+def test_coordinator_can_continue_a_context():
+    coord = MultiAgentCoordinator([Recorder()])
+    ctx = coord.new_context()
+    coord.run("a", ctx)
+    coord.run("b", ctx)
+    assert ctx["seen"] == ["a", "b"]
+
+
+def test_supervisor_keeps_runs_apart_and_bounds_history(monkeypatch):
+    import core.supervisor as sup_mod
+
+    monkeypatch.setattr(sup_mod, "generate_answer", lambda messages: "FINISH")
+    sup = sup_mod.LLMSupervisor({"Recorder": Recorder()}, routers=[], max_messages=3)
+    sup.run("first")
+    sup.run("second")
+    assert sup.context["messages"] == [{"role": "user", "content": "second"}]
+
+    ctx = sup.new_context()
+    for i in range(5):
+        sup.run(str(i), ctx)
+    assert [m["content"] for m in ctx["messages"]] == ["2", "3", "4"]
+    assert sup.shared_context == {"messages": []}
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from agents.base import MESSAGE, Agent  # noqa: E402
+from core.multi_agent import MultiAgentCoordinator  # noqa: E402
+from core.workflow import Workflow  # noqa: E402
+
+
+class Upper(Agent):
+    reads = frozenset({MESSAGE})
+    writes = frozenset({MESSAGE})
+
+    def act(self, message, context):
+        return message.upper(), context
+
+
+class BatchSuffix(Agent):
+    """Records the batch sizes it was called with."""
+
+    reads = frozenset({MESSAGE})
+    writes = frozenset({MESSAGE})
+
+    def __init__(self):
+        self.batches = []
+
+    def act(self, message, context):  # pragma: no cover - act_batch is used
+        raise AssertionError("act_batch should be used")
+
+    def act_batch(self, messages, contexts):
+        self.batches.append(len(messages))
+        return [m + "!" for m in messages], contexts
+
+
+class KeyOnly(Agent):
+    """Declared agent that does not replace the message."""
+
+    reads = frozenset({MESSAGE})
+    writes = frozenset({"length"})
+
+    def act(self, message, context):
+        context["length"] = len(message)
+        return "ignored", context
+
+
+def test_workflow_run_many_keeps_input_order():
+    wf = Workflow([Upper(), KeyOnly(), BatchSuffix()])
+    messages = [f"m{i}" for i in range(50)]
+    results = wf.run_many(messages, workers=4, batch_size=7)
+    assert list(results) == [m.upper() + "!" for m in messages]
+    assert results.report["Upper"]["items"] == 50
+    assert results.report["BatchSuffix"]["items"] == 50
+    assert results.report["KeyOnly"]["items_per_second"] > 0
+
+
+def test_agents_receive_whole_batches():
+    suffix = BatchSuffix()
+    coord = MultiAgentCoordinator([Upper(), suffix])
+    assert list(coord.run_many(["a", "b", "c"], workers=1, batch_size=2)) == ["A!", "B!", "C!"]
+    assert suffix.batches == [2, 1]
+
+
+def test_results_stream_lazily():
+    produced = []
+
+    def messages():
+        for i in range(100):
+            produced.append(i)
+            yield str(i)
+
+    results = iter(MultiAgentCoordinator([Upper()]).run_many(messages(), workers=2, batch_size=5))
+    assert next(results) == "0"
+    assert len(produced) < 100
+
+
+def test_process_mode():
+    wf = Workflow([Upper(), KeyOnly()])
+    results = wf.run_many(["a", "b", "c"], workers=2, mode="process", batch_size=1)
+    assert list(results) == ["A", "B", "C"]
+    assert results.report["Upper"]["items"] == 3
+
+
+def test_supervisor_run_many(monkeypatch):
+    import core.supervisor as sup_mod
+
+    monkeypatch.setattr(
+        sup_mod, "generate_answer", lambda messages: "FINISH" if messages[-2]["role"] == "assistant" else "Upper"
+    )
+    sup = sup_mod.LLMSupervisor({"Upper": Upper()}, routers=[])
+    results = sup.run_many(["a", "b"], workers=2)
+    assert list(results) == ["A", "B"]
+    assert results.report["Upper"]["items"] == 2
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        Workflow([Upper()]).run_many(["a"], mode="fiber")
@@ -0,0 +1,114 @@
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from chat_engine.modules.session import ChatSession  # noqa: E402
+from chat_engine.modules.session_store import (  # noqa: E402
+    DirectorySessionBackend,
+    RedisSessionBackend,
+    SessionStore,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Local stand-in for the subset of the redis client the backend uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value):
+        self.data[key] = value.encode()
+
+    def setex(self, key, ttl, value):
+        self.ttls[key] = ttl
+        self.set(key, value)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def test_history_is_a_bounded_ring_buffer():
+    session = ChatSession(max_messages=4)
+    for i in range(5):
+        session.add_user_message(str(i))
+    assert session.history == [{"role": "user", "content": str(i)} for i in range(1, 5)]
+    assert session.get_recent_history(2) == session.history[-2:]
+
+
+def test_same_id_returns_same_session():
+    store = SessionStore()
+    session = store.get("abc")
+    assert store.get("abc") is session
+    assert session.session_id == "abc"
+    assert store.get().session_id not in (None, "abc")
+
+
+def test_lru_eviction():
+    store = SessionStore(max_sessions=2)
+    a = store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+    assert "b" not in store
+    assert store.get("a") is a
+    assert store.evictions == 1
+
+
+def test_idle_sessions_expire():
+    clock = FakeClock()
+    store = SessionStore(ttl=10, clock=clock)
+    first = store.get("a")
+    clock.now = 5
+    assert store.get("a") is first  # access renews the deadline
+    clock.now = 14
+    assert "a" in store
+    clock.now = 16
+    assert store.get("a") is not first
+    assert store.expirations == 1
+
+
+def test_evicted_sessions_spill_to_redis_backend():
+    redis = FakeRedis()
+    store = SessionStore(max_sessions=1, backend=RedisSessionBackend(redis, ttl=60))
+    store.get("a").add_user_message("remember me")
+    store.get("b")
+    assert redis.ttls == {"chat_session:a": 60}
+
+    restored = store.get("a")
+    assert restored.history == [{"role": "user", "content": "remember me"}]
+
+    store.discard("a")
+    assert "chat_session:a" not in redis.data
+
+
+def test_directory_backend_round_trip(tmp_path):
+    backend = DirectorySessionBackend(str(tmp_path / "sessions"))
+    session = ChatSession("../escape", max_messages=3)
+    session.add_assistant_message("hi")
+    backend.save(session)
+    assert os.listdir(tmp_path / "sessions")[0].endswith(".json")
+    assert backend.load("../escape").history == session.history
+    assert backend.load("missing") is None
+
+
+def test_flush_writes_live_sessions():
+    redis = FakeRedis()
+    store = SessionStore(backend=RedisSessionBackend(redis))
+    store.get("a")
+    store.flush()
+    assert "chat_session:a" in redis.data
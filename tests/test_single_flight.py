@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.single_flight import SingleFlight  # noqa: E402
+
+
+def _run_concurrently(n, target):
+    results = [None] * n
+    errors = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = target()
+        except Exception as exc:
+            errors[i] = exc
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test")
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    def call():
+        return flight.do("key", slow)
+
+    releaser = threading.Timer(0.2, release.set)
+    releaser.start()
+    results, errors = _run_concurrently(8, call)
+    assert results == ["answer"] * 8
+    assert errors == [None] * 8
+    assert len(calls) == 1
+    assert flight.coalesced == 7
+    assert flight.in_flight() == 0
+    # Finished calls are not cached
+    assert flight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_leader_error_is_shared():
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    leader = threading.Thread(target=lambda: pytest.raises(ValueError, flight.do, "k", failing))
+    leader.start()
+    started.wait(5)
+    with pytest.raises(ValueError, match="boom"):
+        flight.do("k", lambda: "unused")
+    leader.join()
+
+
+def test_waiting_is_bounded():
+    flight = SingleFlight("test", timeout=0.05)
+    release = threading.Event()
+    started = threading.Event()
+
+    def stuck():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    leader = threading.Thread(target=flight.do, args=("k", stuck))
+    leader.start()
+    started.wait(5)
+    assert flight.do("k", lambda: "own") == "own"
+    assert flight.timeouts == 1
+    release.set()
+    leader.join()
@@ -0,0 +1,176 @@
+import os
+import random
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from vector_store.base import InMemoryVectorStore  # noqa: E402
+
+
+def _cosine(v1, v2):
+    dot = sum(a * b for a, b in zip(v1, v2))
+    n1 = sum(a * a for a in v1) ** 0.5
+    n2 = sum(b * b for b in v2) ** 0.5
+    return dot / ((n1 * n2) or 1.0)
+
+
+def test_in_memory_top_k_matches_brute_force():
+    rng = random.Random(0)
+    vectors = [[rng.uniform(-1, 1) for _ in range(16)] for _ in range(50)]
+    store = InMemoryVectorStore(initial_capacity=4)
+    for i, vec in enumerate(vectors):
+        store.index_document(i, vec, {"text": f"doc {i}"})
+    assert len(store) == 50
+
+    query = [rng.uniform(-1, 1) for _ in range(16)]
+    expected = sorted(range(50), key=lambda i: _cosine(query, vectors[i]), reverse=True)[:5]
+    results = store.query_vector(query, top_k=5)
+    assert [r.id for r in results] == expected
+    assert [r.payload["text"] for r in results] == [f"doc {i}" for i in expected]
+    assert results[0].score >= results[-1].score
+
+
+def test_in_memory_upsert_replaces_existing_point():
+    store = InMemoryVectorStore()
+    store.index_document("a", [1.0, 0.0], {"text": "old"})
+    store.index_document("b", [0.0, 1.0], {"text": "other"})
+    store.index_document("a", [0.0, 1.0], {"text": "new"})
+    assert len(store) == 2
+
+    results = store.query_vector([0.0, 1.0], top_k=10)
+    assert len(results) == 2
+    assert {r.payload["text"] for r in results} == {"new", "other"}
+    assert store.get_payloads(["a", "missing"]) == [{"text": "new"}, None]
+
+
+def test_in_memory_index_documents_bulk():
+    store = InMemoryVectorStore(initial_capacity=2)
+    docs = [(i, [float(i), 1.0], {"text": str(i)}) for i in range(7)]
+    assert store.index_documents(docs, batch_size=3) == 7
+    assert len(store) == 7
+    assert store.query_vector([6.0, 1.0], top_k=1)[0].id == 6
+
+
+def test_qdrant_index_documents_waits_only_on_last_batch(monkeypatch):
+    from vector_store import base
+
+    calls = []
+
+    class FakeClient:
+        def upsert(self, collection_name, wait, points):
+            calls.append((wait, len(points)))
+
+    class FakePoint:
+        def __init__(self, id, vector, payload):
+            self.id = id
+
+    monkeypatch.setattr(base, "PointStruct", FakePoint)
+
+    docs = [(i, [0.0, 1.0], {}) for i in range(5)]
+    assert base.QdrantVectorStore(client=FakeClient()).index_documents(docs, batch_size=2) == 5
+    assert calls == [(False, 2), (False, 2), (True, 1)]
+
+
+def test_in_memory_filters_use_payload_index():
+    store = InMemoryVectorStore()
+    store.index_document(1, [1.0, 0.0], {"text": "a", "source": "a.txt"})
+    store.index_document(2, [0.9, 0.1], {"text": "b", "source": "b.txt"})
+    store.index_document(3, [0.0, 1.0], {"text": "c", "source": "c.txt", "tags": ["cpt", "denied"]})
+
+    hits = store.query_vector([1.0, 0.0], top_k=5, filters={"source": "b.txt"})
+    assert [h.id for h in hits] == [2]
+
+    hits = store.query_vector([1.0, 0.0], top_k=5, filters={"source": ["c.txt", "b.txt"]})
+    assert [h.id for h in hits] == [2, 3]
+
+    assert [h.id for h in store.query_vector([1.0, 0.0], filters={"tags": "denied"})] == [3]
+    assert store.query_vector([1.0, 0.0], filters={"source": "missing.txt"}) == []
+    assert [h.id for h in store.query_vector([1.0, 0.0], filters={"text": "a"})] == [1]
+
+    # Re-indexing a point moves it to its new posting lists
+    store.index_document(2, [0.9, 0.1], {"text": "b", "source": "a.txt"})
+    assert store.query_vector([1.0, 0.0], filters={"source": "b.txt"}) == []
+    assert [h.id for h in store.query_vector([1.0, 0.0], filters={"source": "a.txt"})] == [1, 2]
+
+
+def test_snapshot_roundtrip_is_memory_mapped(tmp_path):
+    import numpy as np
+
+    store = InMemoryVectorStore()
+    store.index_documents([
+        ("a", [1.0, 0.0], {"text": "a", "source": "x.txt"}),
+        ("b", [0.0, 1.0], {"text": "b", "source": "y.txt"}),
+    ])
+    store.save(str(tmp_path), metadata={"corpus": "v1"})
+    assert InMemoryVectorStore.read_snapshot_meta(str(tmp_path))["metadata"] == {"corpus": "v1"}
+
+    loaded = InMemoryVectorStore.load(str(tmp_path))
+    assert isinstance(loaded._matrix, np.memmap)
+    assert [r.id for r in loaded.query_vector([1.0, 0.1], top_k=2)] == ["a", "b"]
+    assert [r.id for r in loaded.query_vector([1.0, 0.0], filters={"source": "y.txt"})] == ["b"]
+
+    # Writes copy the mapped matrix instead of touching the snapshot file
+    loaded.index_document("a", [0.0, -1.0], {"text": "a2"})
+    loaded.index_document("c", [1.0, 1.0], {"text": "c"})
+    assert len(loaded) == 3
+    reloaded = InMemoryVectorStore.load(str(tmp_path), mmap=False)
+    assert reloaded.query_vector([1.0, 0.0], top_k=1)[0].id == "a"
+
+
+def test_query_vectors_matches_single_queries():
+    from vector_store.hnsw import HNSWVectorStore
+    from vector_store.quantized import QuantizedVectorStore
+
+    rng = random.Random(1)
+    docs = [(i, [rng.uniform(-1, 1) for _ in range(8)], {"source": f"s{i % 2}"}) for i in range(40)]
+    queries = [[rng.uniform(-1, 1) for _ in range(8)] for _ in range(5)]
+    for store in (InMemoryVectorStore(), HNSWVectorStore(seed=0), QuantizedVectorStore()):
+        store.index_documents(docs)
+        for filters in (None, {"source": "s1"}):
+            batch = store.query_vectors(queries, top_k=4, filters=filters)
+            assert len(batch) == len(queries)
+            for q, results in zip(queries, batch):
+                single = store.query_vector(q, top_k=4, filters=filters)
+                assert [r.id for r in results] == [r.id for r in single]
+    assert InMemoryVectorStore().query_vectors(queries) == [[]] * len(queries)
+
+
+def test_index_documents_rejects_ragged_batches():
+    store = InMemoryVectorStore()
+    for vectors in ([[1.0, 0.0], [1.0]], [1.0, 0.0]):
+        with pytest.raises(ValueError, match="equal-length"):
+            store.index_documents([(i, v, {}) for i, v in enumerate(vectors)])
+    assert len(store) == 0
+
+
+def test_client_created_lazily_and_pooled(monkeypatch):
+    from vector_store import base
+
+    created = []
+
+    def factory(url):
+        created.append(url)
+        return object()
+
+    monkeypatch.setattr(base, "_client_pool", base.ClientPool(factory))
+    store = base.QdrantVectorStore()
+    assert created == []
+    first = store.client
+    assert base.get_client() is first
+    assert base.QdrantVectorStore().client is first
+    assert created == [base.QDRANT_URL]
+
+
+def test_store_follows_pool_after_fork_reset(monkeypatch):
+    from vector_store import base
+
+    monkeypatch.setattr(base, "_client_pool", base.ClientPool(lambda url: object()))
+    store = base.QdrantVectorStore()
+    parent = store.client
+    base._client_pool.clear(close=False)  # what the after-fork hook does in the child
+    assert store.client is not parent
+    assert store.client is base.get_client()
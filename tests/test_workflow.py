@@ -16,6 +16,7 @@ def stub_modules(monkeypatch):
     embedding = types.ModuleType("embedding")
     embedder = types.ModuleType("embedding.embedder")
     embedder.embed_text = lambda text: [0.1, 0.2]
+    embedder.embed_texts = lambda texts, batch_size=64: [[0.1, 0.2] for _ in texts]
     embedding.embedder = embedder
     monkeypatch.setitem(sys.modules, "embedding", embedding)
     monkeypatch.setitem(sys.modules, "embedding.embedder", embedder)
@@ -27,6 +28,7 @@ def stub_modules(monkeypatch):
             self.payload = payload
     base.DummyResult = DummyResult
     base.query_vector = lambda vec, top_k=5, filters=None: [DummyResult({"text": "ctx"})]
+    base.query_vectors = lambda vecs, top_k=5, filters=None: [[DummyResult({"text": "ctx"})] for _ in vecs]
     vector_store.base = base
     monkeypatch.setitem(sys.modules, "vector_store", vector_store)
     monkeypatch.setitem(sys.modules, "vector_store.base", base)
@@ -34,6 +36,11 @@ def stub_modules(monkeypatch):
     language_model = types.ModuleType("language_model")
     lm_mod = types.ModuleType("language_model.language_model")
     lm_mod.generate_answer = lambda messages: "assistant response"
+
+    async def agenerate_answer(messages):
+        return "assistant response"
+
+    lm_mod.agenerate_answer = agenerate_answer
     language_model.language_model = lm_mod
     monkeypatch.setitem(sys.modules, "language_model", language_model)
     monkeypatch.setitem(sys.modules, "language_model.language_model", lm_mod)
@@ -49,3 +56,50 @@ def test_workflow_runs_with_rag_agent():
     output = wf.run("hello")
     assert output == "assistant response"
 
+
+
+def test_concurrent_rag_runs_keep_separate_histories():
+    from concurrent.futures import ThreadPoolExecutor
+
+    coordinator_module = importlib.import_module("core.multi_agent")
+    rag_mod = importlib.import_module("agents.rag_agent")
+
+    agent = rag_mod.RAGAgent()
+    coordinator = coordinator_module.MultiAgentCoordinator([agent])
+    contexts = [coordinator.new_context() for _ in range(2)]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(coordinator.run, ["first question", "second question"], contexts))
+
+    for question, context in zip(["first question", "second question"], contexts):
+        assert context["chat_session"].history == [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": "assistant response"},
+        ]
+    assert agent.engine.session.history == []
+
+
+def test_builtin_agent_dependency_graph():
+    workflow_module = importlib.import_module("core.workflow")
+    from agents.base import MESSAGE, Agent
+    from agents.deid_agent import DeidAgent
+    from agents.nlp_agent import NLPAgent
+    from agents.summary_agent import SummaryAgent
+    rag_mod = importlib.import_module("agents.rag_agent")
+
+    class Tagger(Agent):
+        reads = frozenset({MESSAGE})
+        writes = frozenset({"tags"})
+
+        def act(self, message, context):
+            context["tags"] = message.split()
+            return message, context
+
+    wf = workflow_module.Workflow(
+        [DeidAgent(), Tagger(), NLPAgent(["hello world"]), SummaryAgent(), rag_mod.RAGAgent()]
+    )
+    assert [type(a).__name__ for a in wf.agents] == [
+        "DeidAgent", "Tagger", "NLPAgent", "SummaryAgent", "SecurityAgent", "RAGAgent",
+    ]
+    # Every built-in agent replaces the message, so they form a chain; the
+    # key-only Tagger runs alongside NLPAgent
+    assert wf.dependencies == [set(), {0}, {0}, {0, 2}, {0, 2, 3}, {0, 2, 3, 4}]
@@ -0,0 +1,153 @@
+import os
+import sys
+import threading
+import time
+
+project_root = os.path.dirname(os.path.dirname(__file__))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from agents.base import MESSAGE, Agent  # noqa: E402
+from core.workflow import Workflow  # noqa: E402
+from utils.event_bus import event_bus  # noqa: E402
+
+
+class KeyAgent(Agent):
+    """Writes ``key`` = f(message) after an optional delay."""
+
+    def __init__(self, key, reads=(), delay=0.0, barrier=None):
+        self.key = key
+        self.reads = frozenset(reads)
+        self.writes = frozenset({key})
+        self.delay = delay
+        self.barrier = barrier
+
+    def act(self, message, context):
+        if self.barrier is not None:
+            self.barrier.wait()
+        time.sleep(self.delay)
+        inputs = [context.get(k) for k in sorted(self.reads)]
+        context[self.key] = f"{self.key}({message},{inputs})"
+        return f"ignored {self.key}", context
+
+
+class Upper(Agent):
+    reads = frozenset({MESSAGE})
+    writes = frozenset({MESSAGE, "upper"})
+
+    def act(self, message, context):
+        context["upper"] = True
+        return message.upper(), context
+
+
+def test_independent_agents_run_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    agents = [KeyAgent(k, barrier=barrier) for k in ("a", "b", "c")]
+    wf = Workflow(agents, max_workers=3)
+    assert wf.dependencies == [set(), set(), set()]
+    # Would time out on the barrier if the agents ran one after another
+    assert wf.run("hi") == "hi"
+
+
+def test_dependencies_and_deterministic_merge():
+    agents = [
+        Upper(),
+        KeyAgent("slow", delay=0.1),
+        KeyAgent("fast"),
+        KeyAgent("both", reads={"slow", "fast"}),
+    ]
+    wf = Workflow(agents, max_workers=4)
+    assert wf.dependencies == [set(), {0}, {0}, {0, 1, 2}]
+
+    ends = []
+    contexts = []
+
+    def on_end(event, **data):
+        ends.append(data.get("agent"))
+
+    def on_workflow_end(event, **data):
+        contexts.append(data["context"])
+
+    event_bus.subscribe("agent_end", on_end)
+    event_bus.subscribe("workflow_end", on_workflow_end)
+    try:
+        assert wf.run("hi") == "HI"
+    finally:
+        event_bus._subscribers["agent_end"].remove(on_end)
+        event_bus._subscribers["workflow_end"].remove(on_workflow_end)
+
+    assert ends == ["Upper", "KeyAgent", "KeyAgent", "KeyAgent"]
+    assert list(contexts[-1]) == ["upper", "slow", "fast", "both"]
+    assert contexts[-1]["both"] == "both(HI,['fast(HI,[])', 'slow(HI,[])'])"
+
+
+def test_security_runs_before_rag_and_hooks_fire_per_agent():
+    order = []
+
+    class SecurityAgent(Agent):
+        reads = frozenset()
+        writes = frozenset({"checked"})
+
+        def act(self, message, context):
+            time.sleep(0.05)
+            order.append("security")
+            context["checked"] = True
+            return message, context
+
+    class RAGAgent(Agent):
+        reads = frozenset()
+        writes = frozenset({"answer"})
+
+        def act(self, message, context):
+            order.append("rag")
+            context["answer"] = context.get("checked")
+            return message, context
+
+    class CountingHook:
+        def __init__(self):
+            self.seen = []
+
+        def before_agent(self, agent, message, context):
+            self.seen.append(("before", agent.__class__.__name__))
+            return message, context
+
+        def after_agent(self, agent, message, context):
+            self.seen.append(("after", agent.__class__.__name__))
+            return message, context
+
+    hook = CountingHook()
+    wf = Workflow([SecurityAgent(), RAGAgent()], hooks=[hook])
+    assert wf.dependencies == [set(), {0}]
+    wf.run("q")
+    assert order == ["security", "rag"]
+    assert hook.seen == [
+        ("before", "SecurityAgent"), ("after", "SecurityAgent"),
+        ("before", "RAGAgent"), ("after", "RAGAgent"),
+    ]
+
+
+def test_every_path_passes_on_the_same_message():
+    import asyncio
+
+    def workflow(max_workers):
+        return Workflow([Upper(), KeyAgent("a"), KeyAgent("b")], max_workers=max_workers)
+
+    message = "claim " * 30
+    expected = message.upper()
+    assert workflow(1).run(message) == expected
+    assert workflow(4).run(message) == expected
+    assert asyncio.run(workflow(1).run_async(message)) == expected
+    assert list(workflow(1).run_many([message], workers=1)) == [expected]
+
+
+def test_builtin_agents_pass_their_message_on():
+    from agents.nlp_agent import NLPAgent
+    from agents.summary_agent import SummaryAgent
+    from core.multi_agent import MultiAgentCoordinator
+
+    agents = [NLPAgent(["hello world"]), SummaryAgent()]
+    expected = MultiAgentCoordinator(agents).run("hello world")
+    assert expected.startswith("Keywords: ")
+    assert Workflow(agents, max_workers=1).run("hello world") == expected
+    assert Workflow(agents, max_workers=4).run("hello world") == expected
+    assert list(Workflow(agents).run_many(["hello world"], workers=1)) == [expected]
@@ -0,0 +1,172 @@
+"""Circuit breaker for calls to flaky remote services.
+
+The breaker tracks the outcome of the last ``window`` calls.  Once at least
+``min_calls`` have been made and the failure rate reaches
+``failure_threshold`` it *opens*: calls fail immediately with
+:class:`CircuitOpenError` instead of waiting on a dead service.  After
+``reset_timeout`` seconds it goes *half-open* and lets up to
+``half_open_max_calls`` probe calls through; a successful probe closes the
+breaker again, a failed one re-opens it.
+
+Only errors that say something about the service's health count as
+failures: by default HTTP errors count when the status is 5xx or 408, while
+other 4xx responses (a bad request, an invalid key) are re-raised without
+being recorded.  Timeouts, connection errors and anything else without an
+HTTP status still count.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+import logging
+import threading
+import time
+
+from utils.metrics import CIRCUIT_BREAKER_STATE, CIRCUIT_BREAKER_TRANSITIONS
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Numeric values exported through the circuit_breaker_state gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the service while the breaker is open."""
+
+
+def is_service_failure(exc: BaseException) -> bool:
+    """Return ``False`` for HTTP client errors (4xx other than 408), else ``True``.
+
+    Works with ``requests.HTTPError`` and ``httpx.HTTPStatusError``, which
+    both carry the ``response`` they were raised for.
+    """
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if not isinstance(status, int):
+        return True
+    return status >= 500 or status == 408
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with half-open probing.
+
+    ``is_failure`` decides whether an exception raised by the service counts
+    against it; see :func:`is_service_failure`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock=time.monotonic,
+        is_failure=is_service_failure,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self.is_failure = is_failure
+        self._outcomes: deque = deque(maxlen=window)  # True for failures
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._export_state()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def failure_rate(self) -> float:
+        with self._lock:
+            return sum(self._outcomes) / len(self._outcomes) if self._outcomes else 0.0
+
+    def _export_state(self) -> None:
+        if CIRCUIT_BREAKER_STATE:
+            CIRCUIT_BREAKER_STATE.labels(name=self.name).set(STATE_VALUES[self._state])
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning("Circuit breaker '%s': %s -> %s", self.name, self._state, state)
+        if CIRCUIT_BREAKER_TRANSITIONS:
+            CIRCUIT_BREAKER_TRANSITIONS.labels(name=self.name, from_state=self._state, to_state=state).inc()
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == CLOSED:
+            self._outcomes.clear()
+        self._export_state()
+
+    def _maybe_half_open(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._transition(HALF_OPEN)
+
+    def allow(self) -> bool:
+        """Return ``True`` if a call may go through now (and count it as a probe)."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(CLOSED)
+            else:
+                self._outcomes.append(False)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._transition(OPEN)
+                return
+            self._outcomes.append(True)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.failure_threshold
+            ):
+                self._transition(OPEN)
+
+    def record_error(self, exc: BaseException) -> None:
+        """Record ``exc`` as a failure, or just free its probe slot if it is not one.
+
+        Cancellation and other ``BaseException``s say nothing about the
+        service, but must still free the slot: a half-open breaker whose only
+        probe never reported back would reject every call from then on.
+        """
+        if isinstance(exc, Exception) and self.is_failure(exc):
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def call(self, func, *args, **kwargs):
+        """Run ``func`` through the breaker, raising :class:`CircuitOpenError` when open."""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' is open")
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as exc:
+            self.record_error(exc)
+            raise
+        self.record_success()
+        return result
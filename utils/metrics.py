@@ -3,17 +3,45 @@
 from __future__ import annotations
 
 try:
-    from prometheus_client import Counter, Histogram, start_http_server
+    from prometheus_client import Counter, Gauge, Histogram, start_http_server
 except ImportError:  # pragma: no cover - optional dependency
-    Counter = Histogram = None
+    Counter = Gauge = Histogram = None
     start_http_server = None
 
 # Counters for agent executions and ingested documents
 AGENT_RUNS = Counter("agent_runs_total", "Number of times an agent was executed", ["agent"]) if Counter else None
 DOCUMENTS_INGESTED = Counter("documents_ingested_total", "Total documents ingested") if Counter else None
+EMBEDDING_CACHE_REQUESTS = Counter(
+    "embedding_cache_requests_total", "Embedding cache lookups by result", ["result"]
+) if Counter else None
+LLM_CACHE_REQUESTS = Counter(
+    "llm_cache_requests_total", "LLM response cache lookups by result", ["result"]
+) if Counter else None
+PROMPT_TOKENS = Counter(
+    "prompt_tokens_total", "Prompt tokens sent to the model and dropped to fit the budget", ["kind"]
+) if Counter else None
+COALESCED_REQUESTS = Counter(
+    "coalesced_requests_total", "Duplicate in-flight requests served by another call", ["name", "outcome"]
+) if Counter else None
+ROUTING_DECISIONS = Counter(
+    "routing_decisions_total", "Supervisor routing decisions by source", ["source"]
+) if Counter else None
+
+CHAT_SESSIONS = Gauge("chat_sessions", "Chat sessions held in memory") if Gauge else None
+
+# Circuit breaker state (0 closed, 1 half-open, 2 open) and state changes
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open", ["name"]
+) if Gauge else None
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total", "Circuit breaker state changes", ["name", "from_state", "to_state"]
+) if Counter else None
 
 # Histogram to measure workflow runtime
 WORKFLOW_SECONDS = Histogram("workflow_run_seconds", "Time spent running a workflow") if Histogram else None
+AGENT_CONSTRUCTION_SECONDS = Histogram(
+    "agent_construction_seconds", "Time spent constructing an agent on first use", ["agent"]
+) if Histogram else None
 
 
 def start_metrics_server(port: int = 8001) -> None:
@@ -0,0 +1,78 @@
+"""Single-flight coalescing of concurrent identical calls.
+
+While a call for a key is in flight, further calls with the same key wait for
+it and receive its result (or exception) instead of repeating the work.
+Waiting is bounded per call by ``timeout``; a caller that gives up runs the
+work itself so a stuck leader never blocks everyone.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from utils.metrics import COALESCED_REQUESTS
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome."""
+
+    def __init__(self, name: str, timeout: float | None = None):
+        self.name = name
+        self.timeout = timeout
+        self.coalesced = 0
+        self.timeouts = 0
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def _record(self, outcome: str) -> None:
+        with self._lock:
+            if outcome == "coalesced":
+                self.coalesced += 1
+            else:
+                self.timeouts += 1
+        if COALESCED_REQUESTS:
+            COALESCED_REQUESTS.labels(name=self.name, outcome=outcome).inc()
+
+    def do(self, key, func, *args, **kwargs):
+        """Return ``func(*args, **kwargs)``, sharing it with concurrent callers of ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                self._record("timeout")
+                return func(*args, **kwargs)
+            self._record("coalesced")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
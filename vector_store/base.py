@@ -1,50 +1,223 @@
 # vector_store/base.py
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+from array import array
+import heapq
+import json
 import logging
+import math
 import os
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
 try:
     from qdrant_client import QdrantClient
     from qdrant_client.models import Distance, VectorParams
     from qdrant_client.http.exceptions import UnexpectedResponse
-    from qdrant_client.http.models import PointStruct
+    from qdrant_client.http.models import (
+        FieldCondition,
+        Filter,
+        MatchAny,
+        MatchValue,
+        PointStruct,
+        SearchRequest,
+    )
 except ImportError:  # pragma: no cover - optional dependency
     QdrantClient = None
     Distance = None
     VectorParams = None
     UnexpectedResponse = Exception
     PointStruct = None
+    FieldCondition = Filter = MatchAny = MatchValue = SearchRequest = None
 
 COLLECTION_NAME = "claims_collection"
 VECTOR_DIMENSION = 384
 DISTANCE_METRIC = Distance.COSINE if Distance else None
+# Number of points sent per upsert request by ``index_documents``
+UPSERT_BATCH_SIZE = int(os.getenv("VECTOR_UPSERT_BATCH_SIZE", "256"))
+# Queries scored per matrix-matrix product by ``InMemoryVectorStore.query_vectors``
+QUERY_BATCH_SIZE = 64
+# Payload fields the local stores never put in their inverted index
+UNINDEXED_PAYLOAD_FIELDS = frozenset({"text"})
+
+# Snapshot layout written by ``InMemoryVectorStore.save``
+SNAPSHOT_VECTORS = "vectors.f32"
+SNAPSHOT_POINTS = "points.jsonl"
+SNAPSHOT_META = "meta.json"
+SNAPSHOT_FORMAT = 1
 
 logger = logging.getLogger(__name__)
 
 QDRANT_URL = os.getenv("QDRANT_URL")
+# Seconds before a Qdrant request (including the first connectivity check) times out
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", "5"))
+# "qdrant", "memory", "int8" or "hnsw"; empty picks Qdrant when the client is installed
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "").lower()
 
-def _create_client():
+def _create_client(url: str | None = None):
     """Create a Qdrant client if available and reachable."""
 
     if QdrantClient is None:
         logger.warning("qdrant_client not installed; falling back to in-memory store")
         return None
 
-    if not QDRANT_URL:
+    if not url:
         logger.warning("QDRANT_URL not set, using in-memory instance")
         return QdrantClient(location=":memory:")
 
     try:
-        client = QdrantClient(url=QDRANT_URL)
+        client = QdrantClient(url=url, timeout=QDRANT_TIMEOUT)
         # Trigger a simple request to verify connectivity
         client.get_collections()
         return client
     except Exception:
-        logger.warning("Could not connect to Qdrant at %s, using in-memory instance", QDRANT_URL)
+        logger.warning("Could not connect to Qdrant at %s, using in-memory instance", url)
         return QdrantClient(location=":memory:")
 
 
-client = _create_client()
+class ClientPool:
+    """Process-local cache of Qdrant clients, one per URL.
+
+    Clients are created on first use by the configured factory and then
+    reused by every store in the process.  The pool is emptied in forked
+    children (e.g. Celery workers) so they never share the parent's sockets.
+    """
+
+    def __init__(self, factory=_create_client):
+        self.factory = factory
+        self._clients: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str | None = None):
+        key = url or ""
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.factory(url)
+                    self._clients[key] = client
+        return client
+
+    def clear(self, close: bool = True) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        if close:
+            for client in clients:
+                try:
+                    client.close()
+                except Exception:  # pragma: no cover - best effort cleanup
+                    pass
+
+
+_client_pool = ClientPool()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _client_pool.clear(close=False))
+
+
+def set_client_factory(factory) -> None:
+    """Configure how this process creates Qdrant clients.
+
+    ``factory(url)`` receives the Qdrant URL (``None`` for a local instance)
+    and returns a client.  Existing pooled clients are discarded.
+    """
+    _client_pool.clear()
+    _client_pool.factory = factory
+
+
+def get_client(url: str | None = None):
+    """Return the pooled client for ``url`` (default ``QDRANT_URL``), creating it lazily."""
+    return _client_pool.get(url or QDRANT_URL)
+
+
+def __getattr__(name):
+    # ``vector_store.base.client`` used to be created at import time
+    if name == "client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _batched(iterable, size: int):
+    """Yield ``(batch, is_last)`` pairs of lists with at most ``size`` items."""
+    size = max(1, size)
+    batch = []
+    for item in iterable:
+        if len(batch) == size:
+            yield batch, False
+            batch = []
+        batch.append(item)
+    if batch:
+        yield batch, True
+
+
+def _atomic_write(filename: str, writer, binary: bool = False) -> None:
+    """Call ``writer(file)`` on a temporary file, then move it into place."""
+    tmp = filename + ".tmp"
+    if binary:
+        with open(tmp, "wb") as f:
+            writer(f)
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            writer(f)
+    os.replace(tmp, filename)
+
+
+def _filter_values(value) -> list:
+    """Accepted values for one filter condition (a list means set membership)."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def _indexable_values(value) -> list:
+    """Hashable scalar values of a payload field, flattening lists."""
+    values = value if isinstance(value, (list, tuple)) else [value]
+    return [v for v in values if isinstance(v, (str, int, float, bool))]
+
+
+def payload_matches(payload, filters) -> bool:
+    """Return ``True`` if ``payload`` satisfies a ``{field: value(s)}`` filter.
+
+    A scalar matches by equality, a list/tuple/set matches any of its values.
+    Array payload fields match when any element matches, as in Qdrant.
+    """
+    if not filters:
+        return True
+    if not payload:
+        return False
+    for field, value in filters.items():
+        if field not in payload:
+            return False
+        stored = payload[field]
+        stored = stored if isinstance(stored, (list, tuple)) else [stored]
+        wanted = _filter_values(value)
+        if not any(s in wanted for s in stored):
+            return False
+    return True
+
+
+def _to_qdrant_filter(filters):
+    """Translate a ``{field: value(s)}`` dict into a Qdrant ``Filter``.
+
+    Anything that is not a dict (e.g. a ready-made ``Filter``) is passed through.
+    """
+    if not isinstance(filters, dict) or Filter is None:
+        return filters
+    conditions = []
+    for field, value in filters.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            match = MatchAny(any=list(value))
+        else:
+            match = MatchValue(value=value)
+        conditions.append(FieldCondition(key=field, match=match))
+    return Filter(must=conditions)
 
 
 class VectorStore(ABC):
@@ -62,93 +235,575 @@ class VectorStore(ABC):
     def query_vector(self, vector, top_k: int = 5, filters=None):
         pass
 
+    def query_vectors(self, vectors, top_k: int = 5, filters=None) -> list:
+        """Run several queries at once; returns one result list per vector, in order.
+
+        The default loops over :meth:`query_vector`; backends override it with
+        a real batch search.
+        """
+        return [self.query_vector(vector, top_k=top_k, filters=filters) for vector in vectors]
+
+    def get_payloads(self, ids) -> list:
+        """Return the payload stored for each of ``ids``, in order (``None`` if unknown).
+
+        The default knows no payloads; backends override it.
+        """
+        return [None for _ in ids]
+
+    def index_documents(self, documents, batch_size: int = UPSERT_BATCH_SIZE, wait: bool = False) -> int:
+        """Index an iterable of ``(doc_id, vector, payload)`` tuples.
+
+        Backends override this to send ``batch_size`` points per request.  When
+        ``wait`` is ``False`` only the final batch blocks until it is applied.
+        Returns the number of indexed points.
+        """
+        count = 0
+        for doc_id, vector, payload in documents:
+            self.index_document(doc_id, vector, payload)
+            count += 1
+        return count
+
 
 class QdrantVectorStore(VectorStore):
-    """Qdrant-backed vector store implementation."""
+    """Qdrant-backed vector store implementation.
+
+    Unless a client is passed in explicitly, it is resolved from the
+    process-wide pool on every access (a dictionary lookup), so a store
+    created before a fork uses the child's own connection afterwards.
+    """
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            return get_client()
+        return self._client
 
     def init_collection(self):
-        existing = client.get_collections().collections
+        existing = self.client.get_collections().collections
         if COLLECTION_NAME not in [c.name for c in existing]:
-            client.create_collection(
+            self.client.create_collection(
                 collection_name=COLLECTION_NAME,
                 vectors_config=VectorParams(size=VECTOR_DIMENSION, distance=DISTANCE_METRIC),
             )
 
     def index_document(self, doc_id, vector, payload):
         point = PointStruct(id=doc_id, vector=vector, payload=payload)
-        client.upsert(
+        self.client.upsert(
             collection_name=COLLECTION_NAME,
             wait=True,
             points=[point],
         )
 
+    def index_documents(self, documents, batch_size: int = UPSERT_BATCH_SIZE, wait: bool = False) -> int:
+        count = 0
+        for batch, is_last in _batched(documents, batch_size):
+            points = [
+                PointStruct(id=doc_id, vector=vector, payload=payload)
+                for doc_id, vector, payload in batch
+            ]
+            self.client.upsert(
+                collection_name=COLLECTION_NAME,
+                wait=wait or is_last,
+                points=points,
+            )
+            count += len(points)
+        return count
+
+    def get_payloads(self, ids) -> list:
+        ids = list(ids)
+        if not ids:
+            return []
+        try:
+            records = self.client.retrieve(
+                collection_name=COLLECTION_NAME, ids=ids, with_payload=True, with_vectors=False
+            )
+        except UnexpectedResponse as e:
+            raise RuntimeError(f"Retrieve failed: {e}")
+        found = {str(record.id): record.payload for record in records}
+        return [found.get(str(doc_id)) for doc_id in ids]
+
     def query_vector(self, vector: list, top_k: int = 5, filters=None):
         try:
-            results = client.search(
+            results = self.client.search(
                 collection_name=COLLECTION_NAME,
                 query_vector=vector,
                 limit=top_k,
-                query_filter=filters,
+                query_filter=_to_qdrant_filter(filters),
             )
             return results
         except UnexpectedResponse as e:
             raise RuntimeError(f"Query failed: {e}")
 
+    def query_vectors(self, vectors, top_k: int = 5, filters=None) -> list:
+        query_filter = _to_qdrant_filter(filters)
+        requests = [
+            SearchRequest(vector=list(vector), limit=top_k, filter=query_filter, with_payload=True)
+            for vector in vectors
+        ]
+        if not requests:
+            return []
+        try:
+            return self.client.search_batch(collection_name=COLLECTION_NAME, requests=requests)
+        except UnexpectedResponse as e:
+            raise RuntimeError(f"Query failed: {e}")
+
+
+class ScoredResult:
+    """Search hit returned by the local stores, mirroring Qdrant's ``ScoredPoint``."""
+
+    __slots__ = ("id", "score", "payload")
+
+    def __init__(self, id, score: float, payload):
+        self.id = id
+        self.score = score
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        return f"ScoredResult(id={self.id!r}, score={self.score:.4f})"
+
 
 class InMemoryVectorStore(VectorStore):
-    """Simple in-memory fallback when qdrant_client is unavailable."""
+    """In-memory fallback when qdrant_client is unavailable.
+
+    Vectors are L2-normalized on insert and stored as rows of a growable
+    float32 matrix, so a cosine query is a single matrix-vector product
+    followed by an ``argpartition`` top-k.  Without numpy the store degrades
+    to a list scan with the same semantics.
 
-    def __init__(self):
-        self._data = []  # List of (id, vector, payload)
+    Scalar payload fields are kept in an inverted index (field -> value ->
+    rows) so ``{field: value(s)}`` filters only score the candidate rows.
+    """
+
+    def __init__(self, dimension: int | None = None, initial_capacity: int = 1024):
+        self.dimension = dimension
+        self._capacity = max(1, initial_capacity)
+        self._matrix = None  # (capacity, dimension) float32, or list of rows without numpy
+        self._ids: list = []
+        self._payloads: list = []
+        self._rows: dict = {}  # doc_id -> row index
+        self._postings: dict = {}  # field -> {value -> set of rows}
+
+    def __len__(self) -> int:
+        return len(self._ids)
 
     def init_collection(self):
         pass  # Nothing to initialize
 
-    def index_document(self, doc_id, vector, payload):
-        self._data.append((doc_id, vector, payload))
-
-    def _similarity(self, v1, v2):
+    def _normalize(self, vector):
+        """Return ``vector`` as a unit-length row (numpy array or list)."""
+        if np is not None:
+            arr = np.asarray(vector, dtype=np.float32).reshape(-1)
+            norm = float(np.linalg.norm(arr)) or 1.0
+            unit = arr / norm
+        else:
+            unit = [float(x) for x in vector]
+            norm = math.sqrt(sum(x * x for x in unit)) or 1.0
+            unit = [x / norm for x in unit]
+
+        if self.dimension is None:
+            self.dimension = len(unit)
+        elif len(unit) != self.dimension:
+            raise ValueError(
+                f"Vector dimension {len(unit)} does not match store dimension {self.dimension}"
+            )
+        return unit
+
+    def save(self, path: str, metadata: dict | None = None) -> None:
+        """Write a snapshot to the directory ``path``.
+
+        Vectors go to a raw float32 file (``count x dimension``, C order) and
+        ids/payloads to a JSON lines file.  ``meta.json`` is written last, so a
+        snapshot without it is incomplete and is ignored by :meth:`load`.
+        ``metadata`` is stored verbatim, e.g. to fingerprint the source corpus.
+        """
+        os.makedirs(path, exist_ok=True)
+        size = len(self._ids)
+        meta_path = os.path.join(path, SNAPSHOT_META)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)  # invalidate until the new snapshot is complete
+
+        def _write_vectors(f):
+            if size and np is not None:
+                for start in range(0, size, 65536):
+                    chunk = self._matrix[start : min(size, start + 65536)]
+                    f.write(np.ascontiguousarray(chunk, dtype=np.float32).tobytes())
+            elif size:
+                for row in self._matrix[:size]:
+                    f.write(array("f", row).tobytes())
+
+        def _write_points(f):
+            for doc_id, payload in zip(self._ids, self._payloads):
+                f.write(json.dumps([doc_id, payload]) + "\n")
+
+        _atomic_write(os.path.join(path, SNAPSHOT_VECTORS), _write_vectors, binary=True)
+        _atomic_write(os.path.join(path, SNAPSHOT_POINTS), _write_points)
+        self._save_extra(path)
+        meta = {
+            "format": SNAPSHOT_FORMAT,
+            "count": size,
+            "dimension": self.dimension,
+            "metadata": metadata or {},
+        }
+        _atomic_write(meta_path, lambda f: json.dump(meta, f))
+
+    def _save_extra(self, path: str) -> None:
+        """Hook for subclasses that persist additional index structures."""
+
+    @staticmethod
+    def read_snapshot_meta(path: str) -> dict | None:
+        """Return the ``meta.json`` content of a snapshot, or ``None``."""
         try:
-            import numpy as np
-        except ImportError:  # pragma: no cover - optional dependency
-            np = None
+            with open(os.path.join(path, SNAPSHOT_META), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("format") == SNAPSHOT_FORMAT else None
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, **kwargs):
+        """Create a store from a snapshot written by :meth:`save`.
+
+        With ``mmap=True`` the vector file is mapped read-only with
+        ``np.memmap``: startup does not copy the matrix, and processes loading
+        the same snapshot share its pages.  The first write copies the matrix
+        into process memory.
+        """
+        meta = cls.read_snapshot_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"No vector store snapshot at {path}")
+        store = cls(dimension=meta["dimension"], **kwargs)
+        store._restore(path, meta, mmap)
+        return store
+
+    def _restore(self, path: str, meta: dict, mmap: bool) -> None:
+        count, dim = meta["count"], meta["dimension"]
+        with open(os.path.join(path, SNAPSHOT_POINTS), "r", encoding="utf-8") as f:
+            for row, line in enumerate(f):
+                doc_id, payload = json.loads(line)
+                self._ids.append(doc_id)
+                self._payloads.append(payload)
+                self._rows[doc_id] = row
+                self._update_postings(row, payload)
+
+        vectors_path = os.path.join(path, SNAPSHOT_VECTORS)
+        if not count:
+            self._matrix = None
+        elif np is None:
+            data = array("f")
+            with open(vectors_path, "rb") as f:
+                data.frombytes(f.read())
+            self._matrix = [data[i * dim : (i + 1) * dim].tolist() for i in range(count)]
+        elif mmap:
+            self._matrix = np.memmap(vectors_path, dtype=np.float32, mode="r", shape=(count, dim))
+        else:
+            self._matrix = np.fromfile(vectors_path, dtype=np.float32).reshape(count, dim)
+        self._capacity = max(count, 1)
+
+    def _ensure_capacity(self, size: int) -> None:
+        if np is None:
+            if self._matrix is None:
+                self._matrix = []
+            return
+        if self._matrix is None:
+            while self._capacity < size:
+                self._capacity *= 2
+            self._matrix = np.zeros((self._capacity, self.dimension), dtype=np.float32)
+        elif size > self._matrix.shape[0]:
+            while self._capacity < size:
+                self._capacity *= 2
+            grown = np.zeros((self._capacity, self.dimension), dtype=np.float32)
+            grown[: len(self._ids)] = self._matrix[: len(self._ids)]
+            self._matrix = grown
+
+    def _write_row(self, row: int, unit) -> None:
+        if np is None:
+            if row == len(self._matrix):
+                self._matrix.append(unit)
+            else:
+                self._matrix[row] = unit
+        else:
+            if not self._matrix.flags.writeable:
+                # Copy-on-write for stores loaded from a read-only memmap
+                self._matrix = np.array(self._matrix)
+            self._matrix[row] = unit
+
+    def _normalize_many(self, vectors):
+        """Normalize a batch of vectors in one pass."""
+        if np is None:
+            return [self._normalize(v) for v in vectors]
+        try:
+            arr = np.asarray(vectors, dtype=np.float32)
+        except ValueError:
+            arr = None
+        if arr is None or arr.ndim != 2:
+            raise ValueError("Expected a batch of equal-length vectors")
+        if self.dimension is None:
+            self.dimension = arr.shape[1]
+        elif arr.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {arr.shape[1]} does not match store dimension {self.dimension}"
+            )
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return arr / norms
 
-        if np is not None:
-            v1 = np.array(v1)
-            v2 = np.array(v2)
-            denom = (np.linalg.norm(v1) * np.linalg.norm(v2)) or 1.0
-            return float(np.dot(v1, v2) / denom)
-        # Basic Python fallback (cosine similarity)
-        import math
-
-        dot = sum(a * b for a, b in zip(v1, v2))
-        norm1 = math.sqrt(sum(a * a for a in v1))
-        norm2 = math.sqrt(sum(b * b for b in v2))
-        denom = (norm1 * norm2) or 1.0
-        return float(dot / denom)
+    def index_document(self, doc_id, vector, payload):
+        """Insert or replace the point ``doc_id`` (upsert semantics, like Qdrant)."""
+        self._upsert(doc_id, self._normalize(vector), payload)
+
+    def index_documents(self, documents, batch_size: int = UPSERT_BATCH_SIZE, wait: bool = False) -> int:
+        count = 0
+        for batch, _ in _batched(documents, batch_size):
+            ids, vectors, payloads = zip(*batch)
+            units = self._normalize_many(vectors)
+            self._ensure_capacity(len(self._ids) + len(batch))
+            self._prepare_batch(units)
+            for doc_id, unit, payload in zip(ids, units, payloads):
+                self._upsert(doc_id, unit, payload)
+            count += len(batch)
+        return count
+
+    def _prepare_batch(self, units) -> None:
+        """Hook called with each normalized batch before its rows are written."""
+
+    def _upsert(self, doc_id, unit, payload) -> None:
+        row = self._rows.get(doc_id)
+        if row is None:
+            row = len(self._ids)
+            self._ensure_capacity(row + 1)
+            self._write_row(row, unit)
+            self._ids.append(doc_id)
+            self._payloads.append(payload)
+            self._rows[doc_id] = row
+        else:
+            self._write_row(row, unit)
+            self._update_postings(row, self._payloads[row], remove=True)
+            self._payloads[row] = payload
+        self._update_postings(row, payload)
+
+    def _update_postings(self, row: int, payload, remove: bool = False) -> None:
+        if not payload:
+            return
+        for field, value in payload.items():
+            if field in UNINDEXED_PAYLOAD_FIELDS:
+                continue
+            values = self._postings.setdefault(field, {})
+            for v in _indexable_values(value):
+                if remove:
+                    rows = values.get(v)
+                    if rows is not None:
+                        rows.discard(row)
+                        if not rows:
+                            del values[v]
+                else:
+                    values.setdefault(v, set()).add(row)
+
+    def _candidate_rows(self, filters):
+        """Return the sorted rows satisfying ``filters`` using the inverted index."""
+        candidates = None
+        # Most selective fields first so the intersection shrinks quickly
+        conditions = []
+        for field, value in filters.items():
+            if field in UNINDEXED_PAYLOAD_FIELDS:
+                conditions.append((float("inf"), field, value, None))
+                continue
+            postings = self._postings.get(field, {})
+            rows = set()
+            for v in _filter_values(value):
+                rows |= postings.get(v, set())
+            conditions.append((len(rows), field, value, rows))
+        conditions.sort(key=lambda c: c[0])
+
+        for _, field, value, rows in conditions:
+            if rows is None:
+                pool = candidates if candidates is not None else range(len(self._ids))
+                rows = {r for r in pool if payload_matches(self._payloads[r], {field: value})}
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def _search(self, query, top_k: int, rows=None):
+        """Return ``(rows, scores)`` of the ``top_k`` best rows, best first.
+
+        ``rows`` restricts scoring to a subset of row indexes.
+        """
+        if np is None:
+            candidates = range(len(self._ids)) if rows is None else rows
+            scored = (
+                (sum(a * b for a, b in zip(query, self._matrix[row])), row)
+                for row in candidates
+            )
+            best = heapq.nlargest(top_k, scored)
+            return [row for _, row in best], [score for score, _ in best]
+
+        if rows is None:
+            scores = self._matrix[: len(self._ids)] @ query
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            scores = self._matrix[rows] @ query
+        size = scores.shape[0]
+        if top_k < size:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+        else:
+            best = np.argsort(-scores, kind="stable")
+        selected = best if rows is None else rows[best]
+        return selected.tolist(), scores[best].tolist()
 
     def query_vector(self, vector, top_k: int = 5, filters=None):
-        scored = [
-            (self._similarity(vector, v), payload)
-            for _, v, payload in self._data
+        """Return the ``top_k`` nearest points, optionally restricted by ``filters``.
+
+        ``filters`` is a ``{field: value}`` dict; a list/tuple/set value
+        matches any of its members.
+        """
+        if not self._ids or top_k <= 0:
+            return []
+        rows = None
+        if filters:
+            rows = self._candidate_rows(filters)
+            if not rows:
+                return []
+        rows, scores = self._search(self._normalize(vector), top_k, rows)
+        return self._results(rows, scores)
+
+    def get_payloads(self, ids) -> list:
+        rows = [self._rows.get(doc_id) for doc_id in ids]
+        return [None if row is None else self._payloads[row] for row in rows]
+
+    def _results(self, rows, scores) -> list:
+        return [
+            ScoredResult(self._ids[row], float(score), self._payloads[row])
+            for row, score in zip(rows, scores)
         ]
-        scored.sort(key=lambda x: x[0], reverse=True)
-
-        class DummyResult:
-            def __init__(self, payload):
-                self.payload = payload
 
-        return [DummyResult(p) for _, p in scored[:top_k]]
+    def _search_many(self, queries, top_k: int, rows=None) -> list:
+        """Batch version of :meth:`_search` for a ``(m, dimension)`` query matrix.
+
+        Scores ``QUERY_BATCH_SIZE`` queries per matrix-matrix product and
+        returns one ``(rows, scores)`` pair per query.
+        """
+        if np is None:
+            return [self._search(query, top_k, rows) for query in queries]
+
+        if rows is None:
+            matrix = self._matrix[: len(self._ids)]
+        else:
+            rows = np.asarray(rows, dtype=np.int64)
+            matrix = self._matrix[rows]
+        size = matrix.shape[0]
+        k = min(top_k, size)
+        found = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            scores = queries[start : start + QUERY_BATCH_SIZE] @ matrix.T
+            if k < size:
+                best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                best = np.broadcast_to(np.arange(size), scores.shape)
+            best_scores = np.take_along_axis(scores, best, axis=1)
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best = np.take_along_axis(best, order, axis=1)
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            selected = best if rows is None else rows[best]
+            found.extend(zip(selected.tolist(), best_scores.tolist()))
+        return found
+
+    def query_vectors(self, vectors, top_k: int = 5, filters=None) -> list:
+        """Answer several queries with one matrix-matrix product per batch.
+
+        Filters are resolved once and shared by every query.
+        """
+        vectors = list(vectors)
+        if not vectors:
+            return []
+        if not self._ids or top_k <= 0:
+            return [[] for _ in vectors]
+        rows = None
+        if filters:
+            rows = self._candidate_rows(filters)
+            if not rows:
+                return [[] for _ in vectors]
+        queries = self._normalize_many(vectors)
+        return [self._results(r, s) for r, s in self._search_many(queries, top_k, rows)]
+
+
+def set_default_store(store: VectorStore | None) -> None:
+    """Replace the default store (``None`` recreates it lazily on next use)."""
+    global _default_store
+    _default_store = store
+
+
+def _create_default_store() -> VectorStore:
+    if VECTOR_STORE_BACKEND == "hnsw":
+        from vector_store.hnsw import HNSWVectorStore
+
+        return HNSWVectorStore()
+    if VECTOR_STORE_BACKEND == "int8":
+        from vector_store.quantized import QuantizedVectorStore
+
+        return QuantizedVectorStore()
+    if VECTOR_STORE_BACKEND == "memory" or not QdrantClient:
+        return InMemoryVectorStore()
+    return QdrantVectorStore()
+
+
+_default_store: VectorStore | None = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> VectorStore:
+    """Return the process-wide default store, creating it on first use."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = _create_default_store()
+    return _default_store
 
 
-# Instantiate a default store for convenience
-_default_store = QdrantVectorStore() if QdrantClient else InMemoryVectorStore()
-
 def init_collection():
-    _default_store.init_collection()
+    get_default_store().init_collection()
 
 def index_document(doc_id, vector, payload):
-    _default_store.index_document(doc_id, vector, payload)
+    get_default_store().index_document(doc_id, vector, payload)
+
+def index_documents(documents, batch_size: int = UPSERT_BATCH_SIZE, wait: bool = False) -> int:
+    return get_default_store().index_documents(documents, batch_size=batch_size, wait=wait)
 
 def query_vector(vector: list, top_k: int = 5, filters=None):
-    return _default_store.query_vector(vector, top_k=top_k, filters=filters)
+    return get_default_store().query_vector(vector, top_k=top_k, filters=filters)
+
+def query_vectors(vectors: list, top_k: int = 5, filters=None) -> list:
+    return get_default_store().query_vectors(vectors, top_k=top_k, filters=filters)
+
+def get_payloads(ids) -> list:
+    return get_default_store().get_payloads(ids)
+
+def save_snapshot(path: str, metadata: dict | None = None) -> bool:
+    """Snapshot the default store if it is a local store; returns ``True`` on success."""
+    store = get_default_store()
+    if not isinstance(store, InMemoryVectorStore):
+        return False
+    store.save(path, metadata=metadata)
+    return True
+
+def load_snapshot(path: str, expected_metadata: dict | None = None) -> bool:
+    """Replace a local default store with the snapshot at ``path``.
+
+    Nothing is loaded (and ``False`` returned) when the default store is not
+    local, no snapshot exists, or its metadata differs from ``expected_metadata``.
+    """
+    global _default_store
+    store = get_default_store()
+    if not isinstance(store, InMemoryVectorStore):
+        return False
+    meta = InMemoryVectorStore.read_snapshot_meta(path)
+    if meta is None:
+        return False
+    if expected_metadata is not None and meta.get("metadata") != expected_metadata:
+        return False
+    _default_store = type(store).load(path)
+    return True
@@ -0,0 +1,345 @@
+# vector_store/bm25.py
+"""BM25 keyword index kept next to the vector store.
+
+Dense MiniLM embeddings are weak at exact identifiers (claim numbers, CPT
+codes, member IDs).  This index scores documents with Okapi BM25 so hybrid
+retrieval can recover them.  Postings are stored per term as two compact
+``array('I')`` columns (row ids and term frequencies), and a query only reads
+the postings of its own terms.
+"""
+
+from __future__ import annotations
+
+from array import array
+from contextlib import contextmanager
+import json
+import math
+import os
+import re
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+from vector_store.base import ScoredResult, _atomic_write, np, payload_matches
+
+# Lower-cased alphanumeric runs, keeping joined identifiers such as "clm-1001"
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-./_][a-z0-9]+)*")
+_PART_RE = re.compile(r"[-./_]")
+
+SNAPSHOT_BM25 = "bm25.json"
+# Directory shared by ingestion (writes) and the API (reads); empty keeps the index in process
+BM25_INDEX_DIR = os.getenv("BM25_INDEX_DIR", os.getenv("VECTOR_SNAPSHOT_DIR", "vector_snapshot"))
+# Seconds between checks for a newer index written by another process
+BM25_RELOAD_INTERVAL = float(os.getenv("BM25_RELOAD_INTERVAL", "30"))
+# Documents ``index_texts(..., flush=False)`` queues before writing the index file
+BM25_SAVE_BATCH = int(os.getenv("BM25_SAVE_BATCH", "10000"))
+
+
+def tokenize(text: str) -> list:
+    """Split ``text`` into index terms.
+
+    Joined identifiers are indexed whole and by their parts, so both
+    "CLM-1001" and "1001" find a document mentioning "CLM-1001".
+    """
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        parts = _PART_RE.split(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 inverted index over document texts.
+
+    Re-adding an existing ``doc_id`` replaces the document; the old row is
+    tombstoned and skipped at query time.  Searches hold the same lock as
+    :meth:`add_documents`, since appending to a posting array while a query
+    has a buffer view of it would fail.
+
+    With ``keep_text=False`` the payloads' ``"text"`` is not kept (nor
+    saved), for documents whose text the vector store already holds; hits
+    then carry only the remaining payload fields.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, keep_text: bool = True):
+        self.k1 = k1
+        self.b = b
+        self.keep_text = keep_text
+        self._ids: list = []
+        self._payloads: list = []
+        self._rows: dict = {}  # doc_id -> live row
+        self._lengths = array("I")
+        self._postings: dict = {}  # term -> (array("I") rows, array("I") term frequencies)
+        self._deleted: set = set()
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, doc_id, text: str, payload=None) -> None:
+        self.add_documents([(doc_id, text, payload)])
+
+    def add_documents(self, documents) -> int:
+        """Index ``(doc_id, text, payload)`` tuples; returns how many were added."""
+        count = 0
+        with self._lock:
+            for doc_id, text, payload in documents:
+                old = self._rows.get(doc_id)
+                if old is not None:
+                    self._deleted.add(old)
+                    self._total_length -= self._lengths[old]
+
+                row = len(self._ids)
+                terms = tokenize(text or "")
+                freqs: dict = {}
+                for term in terms:
+                    freqs[term] = freqs.get(term, 0) + 1
+                for term, tf in freqs.items():
+                    postings = self._postings.get(term)
+                    if postings is None:
+                        postings = self._postings[term] = (array("I"), array("I"))
+                    postings[0].append(row)
+                    postings[1].append(tf)
+
+                if payload is None:
+                    payload = {"text": text}
+                if not self.keep_text:
+                    payload = {k: v for k, v in payload.items() if k != "text"}
+                self._ids.append(doc_id)
+                self._payloads.append(payload)
+                self._lengths.append(len(terms))
+                self._rows[doc_id] = row
+                self._total_length += len(terms)
+                count += 1
+        return count
+
+    def _term_scores(self, term: str, avg_length: float, live: int):
+        """Return ``(rows, scores)`` contributed by one query term."""
+        rows, tfs = self._postings[term]
+        df = len(rows)
+        idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+        k1, b = self.k1, self.b
+        if np is not None:
+            row_arr = np.frombuffer(rows, dtype=np.uint32)
+            tf_arr = np.frombuffer(tfs, dtype=np.uint32).astype(np.float64)
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32)[row_arr]
+            norm = k1 * (1.0 - b + b * lengths / avg_length)
+            return row_arr, idf * tf_arr * (k1 + 1.0) / (tf_arr + norm)
+        scores = [
+            idf * tf * (k1 + 1.0) / (tf + k1 * (1.0 - b + b * self._lengths[row] / avg_length))
+            for row, tf in zip(rows, tfs)
+        ]
+        return rows, scores
+
+    def search(self, query: str, top_k: int = 5, filters=None) -> list:
+        """Return the ``top_k`` best BM25 matches as :class:`ScoredResult` objects."""
+        with self._lock:
+            return self._search(query, top_k, filters)
+
+    def _search(self, query: str, top_k: int, filters) -> list:
+        terms = [t for t in dict.fromkeys(tokenize(query)) if t in self._postings]
+        live = len(self._rows)
+        if not terms or not live or top_k <= 0:
+            return []
+        avg_length = (self._total_length / live) or 1.0
+
+        scores: dict = {}
+        if np is not None:
+            parts = [self._term_scores(term, avg_length, live) for term in terms]
+            rows = np.concatenate([p[0] for p in parts])
+            contributions = np.concatenate([p[1] for p in parts])
+            unique_rows, inverse = np.unique(rows, return_inverse=True)
+            totals = np.bincount(inverse, weights=contributions)
+            scores = dict(zip(unique_rows.tolist(), totals.tolist()))
+        else:
+            for term in terms:
+                for row, score in zip(*self._term_scores(term, avg_length, live)):
+                    scores[row] = scores.get(row, 0.0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        results = []
+        for row, score in ranked:
+            if row in self._deleted:
+                continue
+            payload = self._payloads[row]
+            if filters and not payload_matches(payload, filters):
+                continue
+            results.append(ScoredResult(self._ids[row], float(score), payload))
+            if len(results) == top_k:
+                break
+        return results
+
+    def save(self, path: str) -> None:
+        """Write the index to ``<path>/bm25.json``."""
+        os.makedirs(path, exist_ok=True)
+        with self._lock:
+            data = self._to_dict()
+        _atomic_write(os.path.join(path, SNAPSHOT_BM25), lambda f: json.dump(data, f))
+
+    def _to_dict(self) -> dict:
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "keep_text": self.keep_text,
+            "ids": self._ids,
+            "payloads": self._payloads,
+            "lengths": self._lengths.tolist(),
+            "deleted": sorted(self._deleted),
+            "postings": {
+                term: [rows.tolist(), tfs.tolist()] for term, (rows, tfs) in self._postings.items()
+            },
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(os.path.join(path, SNAPSHOT_BM25), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data["k1"], b=data["b"], keep_text=data.get("keep_text", True))
+        index._ids = data["ids"]
+        index._payloads = data["payloads"]
+        index._lengths = array("I", data["lengths"])
+        index._deleted = set(data["deleted"])
+        index._postings = {
+            term: (array("I", rows), array("I", tfs)) for term, (rows, tfs) in data["postings"].items()
+        }
+        index._rows = {
+            doc_id: row for row, doc_id in enumerate(index._ids) if row not in index._deleted
+        }
+        index._total_length = sum(index._lengths[row] for row in index._rows.values())
+        return index
+
+
+_default_index: BM25Index | None = None
+_default_lock = threading.Lock()
+_loaded_mtime: float | None = None  # mtime of the file the default index came from
+_next_check = 0.0
+_pending: list = []  # documents added by this process but not written yet
+
+
+def _index_mtime(path: str) -> float | None:
+    try:
+        return os.path.getmtime(os.path.join(path, SNAPSHOT_BM25))
+    except OSError:
+        return None
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Serialise writers of ``path`` across processes where ``fcntl`` exists."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, SNAPSHOT_BM25 + ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _reload_if_newer(path: str) -> None:
+    """Replace the default index with ``path``'s file if it changed (lock held)."""
+    global _default_index, _loaded_mtime
+    mtime = _index_mtime(path)
+    if mtime is not None and mtime != _loaded_mtime:
+        _default_index = BM25Index.load(path)
+        _loaded_mtime = mtime
+        if _pending:
+            _default_index.add_documents(_pending)
+
+
+def _ensure_default() -> BM25Index:
+    """Return the default index, creating an empty one (lock held)."""
+    global _default_index
+    if _default_index is None:
+        # Ingested documents are always in the vector store too, which holds their text
+        _default_index = BM25Index(keep_text=False)
+    return _default_index
+
+
+def load_default_lexical_index(path: str | None = BM25_INDEX_DIR) -> BM25Index:
+    """Load the index persisted at ``path`` (if any) as the default index."""
+    with _default_lock:
+        if path:
+            _reload_if_newer(path)
+        return _ensure_default()
+
+
+def get_default_lexical_index() -> BM25Index:
+    """Return the process-wide BM25 index.
+
+    When :data:`BM25_INDEX_DIR` is set, an index persisted there by another
+    process (the ingestion worker or script) is picked up at most every
+    :data:`BM25_RELOAD_INTERVAL` seconds.
+    """
+    global _next_check
+    with _default_lock:
+        if BM25_INDEX_DIR and time.monotonic() >= _next_check:
+            _next_check = time.monotonic() + BM25_RELOAD_INTERVAL
+            _reload_if_newer(BM25_INDEX_DIR)
+        return _ensure_default()
+
+
+def corpus_version(path: str | None = BM25_INDEX_DIR) -> float | None:
+    """Modification time of the index persisted at ``path``.
+
+    Every write of the file changes it, so the value changes whenever
+    documents are persisted by any process sharing ``path``.
+    """
+    return _index_mtime(path) if path else None
+
+
+def set_default_lexical_index(index: BM25Index | None) -> None:
+    global _default_index, _loaded_mtime
+    with _default_lock:
+        _default_index = index
+        _loaded_mtime = None
+        _pending.clear()
+
+
+def index_texts(documents, path: str | None = BM25_INDEX_DIR, flush: bool = True) -> int:
+    """Add ``(doc_id, text, payload)`` tuples to the default BM25 index.
+
+    The documents are searchable in this process right away.  With ``path``
+    they are also persisted there by :func:`flush_lexical_index`: at the end
+    of the call, or with ``flush=False`` once :data:`BM25_SAVE_BATCH`
+    documents are queued, so streaming ingestion does not rewrite the whole
+    index for every small batch.  Call :func:`flush_lexical_index` when such
+    a run ends.
+    """
+    documents = list(documents)
+    with _default_lock:
+        count = _ensure_default().add_documents(documents)
+        if not path:
+            return count
+        _pending.extend(documents)
+        flush = flush or len(_pending) >= BM25_SAVE_BATCH
+    if flush:
+        flush_lexical_index(path)
+    return count
+
+
+def flush_lexical_index(path: str | None = BM25_INDEX_DIR) -> None:
+    """Write the documents queued by :func:`index_texts` to ``path``.
+
+    Under a file lock, the latest index on disk is loaded, extended with the
+    queued documents and written back, so concurrent ingestion processes do
+    not overwrite each other's documents.
+    """
+    global _loaded_mtime
+    if not path:
+        return
+    with _file_lock(path), _default_lock:
+        if not _pending:
+            return
+        _reload_if_newer(path)
+        _ensure_default().save(path)
+        _loaded_mtime = _index_mtime(path)
+        _pending.clear()
@@ -0,0 +1,187 @@
+# vector_store/hnsw.py
+"""Approximate nearest-neighbour store based on an HNSW graph.
+
+The graph follows Malkov & Yashunin's Hierarchical Navigable Small World
+construction: every point is inserted on a random number of layers and linked
+to its closest neighbours on each of them.  Queries descend greedily from the
+sparse top layer and run a best-first beam search of width ``ef_search`` on
+the bottom layer, so query cost grows roughly logarithmically with the corpus.
+Row storage, upserts and the payload filter index are shared with
+:class:`InMemoryVectorStore`.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import random
+
+from vector_store.base import InMemoryVectorStore, _atomic_write, np
+
+SNAPSHOT_GRAPH = "graph.json"
+
+
+class HNSWVectorStore(InMemoryVectorStore):
+    """Local vector store answering queries through an HNSW graph.
+
+    ``m`` is the number of links per node (``2 * m`` on the bottom layer),
+    ``ef_construction`` the beam width used while inserting and ``ef_search``
+    the beam width used while querying.  Larger values raise recall at the
+    cost of latency; ``ef_search`` can be changed at any time.
+
+    Filtered queries whose candidate set has at most ``exact_search_threshold``
+    rows are scored exactly; larger candidate sets are searched on the graph
+    with a widening beam until enough matching rows are found.
+    """
+
+    def __init__(
+        self,
+        dimension: int | None = None,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 50,
+        exact_search_threshold: int = 2048,
+        seed: int | None = None,
+        initial_capacity: int = 1024,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for HNSWVectorStore")
+        super().__init__(dimension=dimension, initial_capacity=initial_capacity)
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.exact_search_threshold = exact_search_threshold
+        self._level_mult = 1.0 / math.log(max(m, 2))
+        self._rng = random.Random(seed)
+        self._graph: list = []  # per layer: {row: [neighbour rows]}
+        self._entry_point: int | None = None
+
+    def _max_links(self, level: int) -> int:
+        return self.m * 2 if level == 0 else self.m
+
+    def _upsert(self, doc_id, unit, payload) -> None:
+        replaced = doc_id in self._rows
+        super()._upsert(doc_id, unit, payload)
+        row = self._rows[doc_id]
+        if replaced:
+            self._relink(row)
+        else:
+            self._insert(row)
+
+    def _search_layer(self, query, entry_points: list, ef: int, level: int) -> list:
+        """Beam search on one layer; returns ``(similarity, row)`` best first."""
+        layer = self._graph[level]
+        visited = set(entry_points)
+        sims = (self._matrix[entry_points] @ query).tolist()
+        candidates = [(-s, r) for s, r in zip(sims, entry_points)]
+        heapq.heapify(candidates)
+        results = [(s, r) for s, r in zip(sims, entry_points)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            neg_sim, row = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+            neighbours = [n for n in layer.get(row, ()) if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            for sim, n in zip((self._matrix[neighbours] @ query).tolist(), neighbours):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, n))
+                    heapq.heappush(results, (sim, n))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted(results, reverse=True)
+
+    def _descend(self, query, target_level: int) -> list:
+        """Greedy search from the entry point down to ``target_level``."""
+        entry = [self._entry_point]
+        for level in range(len(self._graph) - 1, target_level, -1):
+            entry = [self._search_layer(query, entry, 1, level)[0][1]]
+        return entry
+
+    def _prune(self, row: int, level: int) -> None:
+        links = self._graph[level][row]
+        limit = self._max_links(level)
+        if len(links) > limit:
+            sims = self._matrix[links] @ self._matrix[row]
+            keep = np.argsort(-sims, kind="stable")[:limit]
+            self._graph[level][row] = [links[i] for i in keep.tolist()]
+
+    def _connect(self, row: int, query, entry: list, top_level: int) -> None:
+        for level in range(top_level, -1, -1):
+            found = [(s, r) for s, r in self._search_layer(query, entry, self.ef_construction, level) if r != row]
+            neighbours = [r for _, r in found[: self._max_links(level)]]
+            self._graph[level][row] = neighbours
+            for n in neighbours:
+                links = self._graph[level].setdefault(n, [])
+                if row not in links:
+                    links.append(row)
+                    self._prune(n, level)
+            entry = [r for _, r in found] or entry
+
+    def _insert(self, row: int) -> None:
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        query = self._matrix[row]
+        if self._entry_point is None:
+            self._graph = [{row: []} for _ in range(level + 1)]
+            self._entry_point = row
+            return
+
+        top = len(self._graph) - 1
+        entry = self._descend(query, level)
+        self._connect(row, query, entry, min(level, top))
+        if level > top:
+            for _ in range(level - top):
+                self._graph.append({row: []})
+            self._entry_point = row
+
+    def _relink(self, row: int) -> None:
+        """Reconnect a point whose vector was replaced in place."""
+        top = max(level for level, layer in enumerate(self._graph) if row in layer)
+        query = self._matrix[row]
+        self._connect(row, query, self._descend(query, top), top)
+
+    def _search(self, query, top_k: int, rows=None):
+        if self._entry_point is None:
+            return [], []
+        if rows is not None and len(rows) <= self.exact_search_threshold:
+            return super()._search(query, top_k, rows)
+
+        allowed = None if rows is None else set(rows)
+        ef = max(self.ef_search, top_k)
+        entry = self._descend(query, 0)
+        while True:
+            found = self._search_layer(query, entry, ef, 0)
+            if allowed is not None:
+                found = [(s, r) for s, r in found if r in allowed]
+            if len(found) >= top_k or ef >= len(self._ids):
+                break
+            ef *= 2
+        found = found[:top_k]
+        return [r for _, r in found], [s for s, _ in found]
+
+    def _search_many(self, queries, top_k: int, rows=None) -> list:
+        return [self._search(query, top_k, rows) for query in queries]
+
+    def _save_extra(self, path: str) -> None:
+        graph = {
+            "m": self.m,
+            "entry_point": self._entry_point,
+            "layers": [list(layer.items()) for layer in self._graph],
+        }
+        _atomic_write(os.path.join(path, SNAPSHOT_GRAPH), lambda f: json.dump(graph, f))
+
+    def _restore(self, path: str, meta: dict, mmap: bool) -> None:
+        super()._restore(path, meta, mmap)
+        with open(os.path.join(path, SNAPSHOT_GRAPH), "r", encoding="utf-8") as f:
+            graph = json.load(f)
+        self.m = graph["m"]
+        self._level_mult = 1.0 / math.log(max(self.m, 2))
+        self._entry_point = graph["entry_point"]
+        self._graph = [dict((row, links) for row, links in layer) for layer in graph["layers"]]
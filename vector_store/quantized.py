@@ -0,0 +1,198 @@
+# vector_store/quantized.py
+"""Local vector store with int8 scalar quantization and exact rescoring.
+
+Each dimension is mapped onto 256 levels between a per-dimension ``low`` and
+``high`` bound, so the searchable matrix takes one byte per component instead
+of four.  The full-precision rows live in a file-backed ``np.memmap``: the OS
+keeps them in the page cache and can evict them, rather than holding them in
+process memory.  A query scans the int8 codes, keeps
+``top_k * rescore_multiplier`` candidates and rescores only those against the
+float32 rows.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import weakref
+
+from vector_store.base import QUERY_BATCH_SIZE, InMemoryVectorStore, np
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class QuantizedVectorStore(InMemoryVectorStore):
+    """:class:`InMemoryVectorStore` variant that searches int8 codes.
+
+    ``storage_path`` is the file holding full-precision rows for rescoring; a
+    temporary file, removed with the store, is used when it is omitted.
+    Quantization bounds widen automatically (with some headroom) when a new
+    vector falls outside them, which re-encodes the existing rows.
+    """
+
+    def __init__(
+        self,
+        dimension: int | None = None,
+        rescore_multiplier: int = 4,
+        storage_path: str | None = None,
+        initial_capacity: int = 1024,
+        scan_chunk_rows: int = 8192,
+    ):
+        if np is None:
+            raise RuntimeError("numpy is required for QuantizedVectorStore")
+        super().__init__(dimension=dimension, initial_capacity=initial_capacity)
+        self.rescore_multiplier = rescore_multiplier
+        self.scan_chunk_rows = scan_chunk_rows
+        self._storage_path = storage_path
+        self._codes = None
+        self._low = None
+        self._high = None
+        self._scale = None
+
+    def memory_usage(self) -> dict:
+        """Bytes used by the int8 codes versus an equivalent float32 matrix."""
+        size = len(self._ids)
+        dim = self.dimension or 0
+        return {"int8_codes": size * dim, "float32": size * dim * 4}
+
+    # -- storage ---------------------------------------------------------
+
+    def _open_storage(self, capacity: int) -> None:
+        """Map the full-precision file with room for ``capacity`` rows."""
+        if self._storage_path is None:
+            fd, self._storage_path = tempfile.mkstemp(prefix="vectors-", suffix=".f32")
+            os.close(fd)
+            weakref.finalize(self, _unlink_quietly, self._storage_path)
+        if isinstance(self._matrix, np.memmap) and self._matrix.flags.writeable:
+            self._matrix.flush()
+        with open(self._storage_path, "ab") as f:
+            if f.tell() < capacity * self.dimension * 4:
+                f.truncate(capacity * self.dimension * 4)
+        self._matrix = np.memmap(
+            self._storage_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension)
+        )
+
+    def _ensure_capacity(self, size: int) -> None:
+        matrix = self._matrix
+        if matrix is not None and matrix.flags.writeable and size <= matrix.shape[0]:
+            return
+        while self._capacity < size:
+            self._capacity *= 2
+        count = len(self._ids)
+        self._open_storage(self._capacity)
+        if matrix is not None and not matrix.flags.writeable:
+            # Rows of a read-only snapshot are copied into private storage
+            for start in range(0, count, self.scan_chunk_rows):
+                stop = min(count, start + self.scan_chunk_rows)
+                self._matrix[start:stop] = matrix[start:stop]
+        codes = np.zeros((self._capacity, self.dimension), dtype=np.int8)
+        if self._codes is not None:
+            codes[:count] = self._codes[:count]
+        self._codes = codes
+
+    def _write_row(self, row: int, unit) -> None:
+        if not self._matrix.flags.writeable:
+            self._ensure_capacity(self._capacity)
+        self._matrix[row] = unit
+        if self._expand_range(unit, unit):
+            self._requantize(max(row + 1, len(self._ids)))
+        else:
+            self._codes[row] = self._quantize(unit)
+
+    def _prepare_batch(self, units) -> None:
+        # Widen the bounds once per batch instead of once per outlying row
+        if self._expand_range(units.min(axis=0), units.max(axis=0)):
+            self._requantize(len(self._ids))
+
+    # -- quantization ----------------------------------------------------
+
+    def _expand_range(self, low, high) -> bool:
+        """Grow the quantization bounds to cover ``[low, high]``; ``True`` if changed."""
+        if self._low is not None and np.all(low >= self._low) and np.all(high <= self._high):
+            return False
+        if self._low is not None:
+            low = np.minimum(low, self._low)
+            high = np.maximum(high, self._high)
+        margin = 0.1 * (high - low) + 1e-3
+        self._low = (low - margin).astype(np.float32)
+        self._high = (high + margin).astype(np.float32)
+        self._scale = ((self._high - self._low) / 255.0).astype(np.float32)
+        return True
+
+    def _quantize(self, vectors):
+        levels = np.rint((vectors - self._low) / self._scale) - 128
+        return np.clip(levels, -128, 127).astype(np.int8)
+
+    def _requantize(self, count: int) -> None:
+        for start in range(0, count, self.scan_chunk_rows):
+            stop = min(count, start + self.scan_chunk_rows)
+            self._codes[start:stop] = self._quantize(self._matrix[start:stop])
+
+    def _approx_scores(self, queries, rows=None):
+        """Approximate scores of one query (1-D) or a ``(m, d)`` query matrix."""
+        # x ~= low + scale * (code + 128), so q.x ~= (q * scale).code + bias
+        weights = (queries * self._scale).astype(np.float32).T
+        bias = queries @ (self._low + 128 * self._scale)
+        if np.ndim(bias):
+            bias = bias[:, None]
+        if rows is not None:
+            return (self._codes[rows].astype(np.float32) @ weights).T + bias
+        count = len(self._ids)
+        scores = np.empty((count,) + weights.shape[1:], dtype=np.float32)
+        for start in range(0, count, self.scan_chunk_rows):
+            stop = min(count, start + self.scan_chunk_rows)
+            scores[start:stop] = self._codes[start:stop].astype(np.float32) @ weights
+        return scores.T + bias
+
+    # -- search ----------------------------------------------------------
+
+    def _rescore(self, approx, top_k: int, rows=None):
+        """Shortlist by approximate score, then rank the shortlist exactly."""
+        size = approx.shape[0]
+        shortlist = min(size, max(top_k, top_k * self.rescore_multiplier))
+        if shortlist < size:
+            best = np.argpartition(-approx, shortlist - 1)[:shortlist]
+        else:
+            best = np.arange(size)
+        return np.sort(best if rows is None else rows[best])
+
+    def _search(self, query, top_k: int, rows=None):
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+        candidates = self._rescore(self._approx_scores(query, rows), top_k, rows)
+        exact = self._matrix[candidates] @ query
+        order = np.argsort(-exact, kind="stable")[:top_k]
+        return candidates[order].tolist(), exact[order].tolist()
+
+    def _search_many(self, queries, top_k: int, rows=None) -> list:
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+        found = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            batch = queries[start : start + QUERY_BATCH_SIZE]
+            for query, approx in zip(batch, self._approx_scores(batch, rows)):
+                candidates = self._rescore(approx, top_k, rows)
+                exact = self._matrix[candidates] @ query
+                order = np.argsort(-exact, kind="stable")[:top_k]
+                found.append((candidates[order].tolist(), exact[order].tolist()))
+        return found
+
+    def _restore(self, path: str, meta: dict, mmap: bool) -> None:
+        # Always map the snapshot; it is copied to private storage on first write
+        super()._restore(path, meta, True)
+        count = len(self._ids)
+        if not count:
+            return
+        low = high = None
+        for start in range(0, count, self.scan_chunk_rows):
+            chunk = self._matrix[start : min(count, start + self.scan_chunk_rows)]
+            low = chunk.min(axis=0) if low is None else np.minimum(low, chunk.min(axis=0))
+            high = chunk.max(axis=0) if high is None else np.maximum(high, chunk.max(axis=0))
+        self._expand_range(low, high)
+        self._codes = np.zeros((self._capacity, self.dimension), dtype=np.int8)
+        self._requantize(count)